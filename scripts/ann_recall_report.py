@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Recall-vs-latency report for the pure-NumPy ANN indexes.
+
+For each store size this script builds an IVF-flat and an HNSW index over
+synthetic clustered embeddings (or random ones with --uniform), then sweeps
+nprobe / ef and reports recall@k against exact brute-force search together
+with mean and p95 query latency. Use it to pick settings per store size.
+
+Usage:
+    python scripts/ann_recall_report.py --sizes 1000 10000 --dim 384
+    python scripts/ann_recall_report.py --sizes 50000 --index ivf --nprobe 4 8 16 32
+    python scripts/ann_recall_report.py --json ann_report.json
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+# Import Lumina components
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from lumina_memory.ann_index import IVFFlatIndex, HNSWIndex
+from lumina_memory.topk import top_k_indices
+
+
+def make_dataset(n: int, dim: int, n_queries: int, uniform: bool, seed: int):
+    """Synthetic embeddings: Gaussian clusters (topic-like) or uniform noise"""
+    rng = np.random.default_rng(seed)
+    if uniform:
+        data = rng.normal(size=(n, dim))
+        queries = rng.normal(size=(n_queries, dim))
+    else:
+        n_clusters = max(8, int(np.sqrt(n)))
+        centers = rng.normal(size=(n_clusters, dim))
+        data = centers[rng.integers(0, n_clusters, n)] + 0.6 * rng.normal(size=(n, dim))
+        queries = centers[rng.integers(0, n_clusters, n_queries)] + 0.6 * rng.normal(size=(n_queries, dim))
+    return data.astype(np.float32), queries.astype(np.float32)
+
+
+def exact_neighbours(data: np.ndarray, queries: np.ndarray, k: int) -> List[set]:
+    """Ground truth top-k by cosine similarity"""
+    data = data / np.linalg.norm(data, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    scores = queries @ data.T
+    return [set(top_k_indices(row, k).tolist()) for row in scores]
+
+
+def time_exact(data: np.ndarray, queries: np.ndarray, k: int) -> List[float]:
+    """Latency of exact search (normalized matrix, one matvec + partial sort per query)"""
+    data = data / np.linalg.norm(data, axis=1, keepdims=True)
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        top_k_indices(data @ (query / np.linalg.norm(query)), k)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def evaluate(index, queries: np.ndarray, truth: List[set], k: int,
+             params: Dict[str, Any]) -> Dict[str, float]:
+    """Recall@k and latency for one parameter setting"""
+    recalls, latencies = [], []
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        results = index.search(query, k, **params)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found = {int(item_id) for item_id, _ in results}
+        recalls.append(len(found & expected) / k)
+    return {
+        "recall": statistics.mean(recalls),
+        "mean_ms": statistics.mean(latencies),
+        "p95_ms": float(np.percentile(latencies, 95)),
+    }
+
+
+def run_report(args) -> List[Dict[str, Any]]:
+    rows = []
+    for n in args.sizes:
+        data, queries = make_dataset(n, args.dim, args.queries, args.uniform, args.seed)
+        truth = exact_neighbours(data, queries, args.k)
+        ids = [str(i) for i in range(n)]
+
+        exact_ms = time_exact(data, queries, args.k)
+        print(f"\n n={n:,} dim={args.dim} k={args.k}")
+        print(f"   exact              recall=1.000  mean={statistics.mean(exact_ms):7.3f} ms"
+              f"  p95={np.percentile(exact_ms, 95):7.3f} ms")
+        rows.append({"size": n, "index": "exact", "param": None, "recall": 1.0,
+                     "mean_ms": statistics.mean(exact_ms),
+                     "p95_ms": float(np.percentile(exact_ms, 95)), "build_s": 0.0})
+
+        sweeps = []
+        if args.index in ("ivf", "both"):
+            sweeps.append(("ivf", lambda: IVFFlatIndex(args.dim, min_train_size=min(1024, n)),
+                           "nprobe", args.nprobe))
+        if args.index in ("hnsw", "both"):
+            sweeps.append(("hnsw", lambda: HNSWIndex(args.dim, M=args.M,
+                                                     ef_construction=args.ef_construction),
+                           "ef", args.ef))
+
+        for name, factory, param_name, values in sweeps:
+            index = factory()
+            start = time.perf_counter()
+            index.add(ids, data)
+            build_s = time.perf_counter() - start
+            for value in values:
+                result = evaluate(index, queries, truth, args.k, {param_name: value})
+                setting = f"{param_name}={value}"
+                print(f"   {name:<5} {setting:<12} recall={result['recall']:.3f}"
+                      f"  mean={result['mean_ms']:7.3f} ms  p95={result['p95_ms']:7.3f} ms"
+                      f"  (build {build_s:.1f}s)")
+                rows.append({"size": n, "index": name, "param": {param_name: value},
+                             "build_s": build_s, **result})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ANN recall vs latency report")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000],
+                        help="Store sizes to evaluate")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per size")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    parser.add_argument("--index", choices=["ivf", "hnsw", "both"], default="both")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128])
+    parser.add_argument("--M", type=int, default=16, help="HNSW links per node")
+    parser.add_argument("--ef-construction", type=int, default=100)
+    parser.add_argument("--uniform", action="store_true",
+                        help="Use unclustered random vectors (hardest case)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", type=str, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    print(" ANN recall vs latency report")
+    rows = run_report(args)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\n Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Startup time benchmark for the memory kernel.
+
+Runs each measurement in a fresh interpreter:
+- import time of a module (cumulative, from `python -X importtime`), with
+  the slowest modules by self time
+- construction of a UnifiedXPKernel with the default config, and its first
+  process_memory call (where lazily loaded models get built)
+
+It also checks that importing the module does not load heavy optional
+packages. The run fails (exit status 1) when a budget is exceeded or a heavy
+package is loaded, so it can gate CI; record the numbers with --json to
+track them over time.
+
+Usage:
+    python scripts/benchmark_startup.py
+    python scripts/benchmark_startup.py --repeats 5 --import-budget-ms 400
+    python scripts/benchmark_startup.py --module lumina_memory --json startup.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+SRC = str(Path(__file__).parent.parent / "src")
+
+# Budgets (milliseconds); lower them as startup gets faster
+IMPORT_BUDGET_MS = 500.0
+KERNEL_BUDGET_MS = 50.0
+
+# Packages that must only load on first use
+HEAVY_MODULES = [
+    "torch", "transformers", "sentence_transformers", "spacy", "textblob",
+    "vaderSentiment", "nrclex", "faiss",
+    "lumina_memory.enhanced_emotional_weighting",
+    "lumina_memory.consciousness_optimized_emotional_analysis",
+]
+
+_KERNEL_CODE = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+import logging
+logging.disable(logging.CRITICAL)
+from lumina_memory.xp_core_unified import UnifiedXPKernel
+start = time.perf_counter()
+kernel = UnifiedXPKernel()
+constructed = time.perf_counter()
+kernel.process_memory("The benchmark stores its first memory.")
+first_memory = time.perf_counter()
+print(json.dumps({{"construct_ms": (constructed - start) * 1e3,
+                  "first_memory_ms": (first_memory - constructed) * 1e3}}))
+"""
+
+
+def _python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", code],
+                          capture_output=True, text=True, check=True)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) rows of -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Header line
+        rows.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return rows
+
+
+def measure_import(module: str) -> Dict[str, Any]:
+    """Import time of a module in a fresh interpreter, and heavy packages it loaded"""
+    code = (f"import sys; sys.path.insert(0, {SRC!r}); import {module}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = _python(code, "-X", "importtime")
+    rows = parse_importtime(result.stderr)
+    cumulative = next((total for name, _, total in rows if name == module), None)
+    if cumulative is None:
+        raise RuntimeError(f"{module} not found in -X importtime output")
+    loaded = result.stdout.strip()
+    return {
+        "import_ms": cumulative / 1e3,
+        "slowest": sorted(((name, own / 1e3) for name, own, _ in rows),
+                          key=lambda row: row[1], reverse=True)[:10],
+        "heavy_loaded": loaded.split(",") if loaded else [],
+    }
+
+
+def measure_kernel() -> Dict[str, float]:
+    """Kernel construction and first ingest time in a fresh interpreter"""
+    return json.loads(_python(_KERNEL_CODE.format(src=SRC)).stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    _python(f"import sys; sys.path.insert(0, {SRC!r}); import {args.module}")  # Warm bytecode caches
+    imports = [measure_import(args.module) for _ in range(args.repeats)]
+    kernels = [measure_kernel() for _ in range(args.repeats)]
+    return {
+        "module": args.module,
+        "repeats": args.repeats,
+        "import_ms": statistics.median(run["import_ms"] for run in imports),
+        "construct_ms": statistics.median(run["construct_ms"] for run in kernels),
+        "first_memory_ms": statistics.median(run["first_memory_ms"] for run in kernels),
+        "slowest_imports": imports[-1]["slowest"],
+        "heavy_loaded": sorted({name for run in imports for name in run["heavy_loaded"]}),
+        "budgets": {"import_ms": args.import_budget_ms, "construct_ms": args.kernel_budget_ms},
+    }
+
+
+def check_budgets(results: Dict[str, Any]) -> List[str]:
+    """Budget violations (empty when within budget)"""
+    failures = []
+    for key, budget in results["budgets"].items():
+        if results[key] > budget:
+            failures.append(f"{key} {results[key]:.1f} ms exceeds budget {budget:.1f} ms")
+    if results["heavy_loaded"]:
+        failures.append(f"importing {results['module']} loaded {', '.join(results['heavy_loaded'])}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory kernel startup time")
+    parser.add_argument("--module", default="lumina_memory.xp_core_unified",
+                        help="Module whose import time is measured")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per measurement (median)")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--kernel-budget-ms", type=float, default=KERNEL_BUDGET_MS)
+    parser.add_argument("--json", type=str, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    print(" Startup benchmark")
+    results = run_benchmark(args)
+    print(f"   import {results['module']}: {results['import_ms']:.1f} ms "
+          f"(budget {args.import_budget_ms:.0f} ms)")
+    print(f"   UnifiedXPKernel(): {results['construct_ms']:.2f} ms "
+          f"(budget {args.kernel_budget_ms:.0f} ms)")
+    print(f"   first process_memory: {results['first_memory_ms']:.1f} ms")
+    print("   slowest imports (self time):")
+    for name, self_ms in results["slowest_imports"]:
+        print(f"     {self_ms:8.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n Results written to {args.json}")
+
+    failures = check_budgets(results)
+    for failure in failures:
+        print(f" FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
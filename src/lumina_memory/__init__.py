@@ -11,6 +11,7 @@ from .encryption import (
     derive_kek, generate_dek, create_envelope, open_envelope
 )
 from .hrr import reference_vector, bind_vectors, similarity
+from .lazy_imports import lazy_attributes, lazy_dir
 # from .events import Event, create_ingest_event, create_conflict_event  # TODO: events.py missing
 
 __version__ = "0.4.0"
@@ -22,3 +23,16 @@ __all__ = [
     "reference_vector", "bind_vectors", "similarity",
     # "Event", "create_ingest_event", "create_conflict_event"  # TODO: events.py missing
 ]
+
+# The memory kernel is imported on first access (lumina_memory.UnifiedXPKernel)
+_LAZY_EXPORTS = {
+    "UnifiedXPConfig": ".xp_core_unified",
+    "UnifiedXPKernel": ".xp_core_unified",
+    "XPEnvironment": ".xp_core_unified",
+    "XPUnit": ".xp_core_unified",
+}
+__getattr__ = lazy_attributes(globals(), _LAZY_EXPORTS)
+
+
+def __dir__():
+    return lazy_dir(globals(), _LAZY_EXPORTS)
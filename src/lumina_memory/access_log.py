@@ -0,0 +1,145 @@
+"""
+Access Log - Deferred, Batched Access Accounting for XP Units
+=============================================================
+
+``XPUnit.update_access`` bumps ``access_count``, refreshes ``last_access`` and
+adds an access-dependent importance boost. Doing that inside every retrieval
+turns a read into a write across the store. The access log lets retrieval
+stay side-effect free: accesses are appended to a log and applied later in a
+single pass, vectorized over the columnar unit store when one is in use.
+
+Applying n logged accesses to a unit gives the same result as n sequential
+``update_access`` calls. The per-access boost is min(0.1, 0.01 * count), so
+the cumulative boost after m accesses has the closed form
+
+    s(m) = 0.01 * m * (m + 1) / 2        for m <= 10
+    s(m) = 0.55 + 0.1 * (m - 10)         for m > 10
+
+and n accesses on top of c previous ones add s(c + n) - s(c), capped at the
+same 2.0 ceiling ``update_access`` uses.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+import threading
+from typing import Dict, Iterable, Mapping, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .math_foundation import get_current_timestamp
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .xp_core_unified import XPUnit
+
+
+ACCESS_BOOST_STEP = 0.01   # Boost per access count
+ACCESS_BOOST_CAP = 0.1     # Maximum boost from a single access
+ACCESS_IMPORTANCE_CAP = 2.0
+
+DEFAULT_FLUSH_SIZE = 256
+
+
+def cumulative_access_boost(access_count: np.ndarray) -> np.ndarray:
+    """Total importance boost from the first ``access_count`` accesses, s(m)"""
+    m = np.asarray(access_count, dtype=np.float64)
+    cap_at = ACCESS_BOOST_CAP / ACCESS_BOOST_STEP  # access count where the cap kicks in
+    below_cap = ACCESS_BOOST_STEP * m * (m + 1) / 2.0
+    above_cap = ACCESS_BOOST_STEP * cap_at * (cap_at + 1) / 2.0 + ACCESS_BOOST_CAP * (m - cap_at)
+    return np.where(m <= cap_at, below_cap, above_cap)
+
+
+def apply_accesses(importance: np.ndarray, access_count: np.ndarray,
+                   n_accesses: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Closed-form equivalent of calling ``update_access`` n times.
+
+    Returns:
+        (new_importance, new_access_count)
+    """
+    access_count = np.asarray(access_count)
+    new_count = access_count + np.asarray(n_accesses)
+    boost = cumulative_access_boost(new_count) - cumulative_access_boost(access_count)
+    new_importance = np.minimum(ACCESS_IMPORTANCE_CAP, np.asarray(importance) + boost)
+    return new_importance, new_count
+
+
+class AccessLog:
+    """
+    Thread-safe log of unit accesses awaiting application.
+
+    Retrieval records the content IDs it actually returned; ``flush`` applies
+    the accumulated counts in one pass.
+    """
+
+    def __init__(self, flush_size: int = DEFAULT_FLUSH_SIZE):
+        self.flush_size = flush_size
+        self._counts: Dict[str, int] = {}
+        self._last_access: Dict[str, float] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.total_flushed = 0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def record(self, content_ids: Iterable[str], timestamp: Optional[float] = None):
+        """Log one access for each content ID"""
+        if timestamp is None:
+            timestamp = get_current_timestamp()
+        with self._lock:
+            for content_id in content_ids:
+                self._counts[content_id] = self._counts.get(content_id, 0) + 1
+                self._last_access[content_id] = timestamp
+                self._pending += 1
+
+    def should_flush(self) -> bool:
+        """True once enough accesses are pending to warrant a flush"""
+        return self._pending >= self.flush_size
+
+    def drain(self) -> Dict[str, Tuple[int, float]]:
+        """Take all pending accesses: content_id -> (count, last_access)"""
+        with self._lock:
+            pending = {cid: (count, self._last_access[cid]) for cid, count in self._counts.items()}
+            self._counts.clear()
+            self._last_access.clear()
+            self._pending = 0
+        return pending
+
+    def discard(self, content_id: str):
+        """Drop pending accesses for a unit that no longer exists"""
+        with self._lock:
+            count = self._counts.pop(content_id, 0)
+            self._last_access.pop(content_id, None)
+            self._pending -= count
+
+    def flush(self, units: Mapping[str, 'XPUnit']) -> int:
+        """
+        Apply all pending accesses to the units.
+
+        Uses the column store's vectorized path when ``units`` provides one.
+
+        Returns:
+            Number of accesses applied
+        """
+        pending = self.drain()
+        pending = {cid: entry for cid, entry in pending.items() if cid in units}
+        if not pending:
+            return 0
+
+        content_ids = list(pending)
+        counts = np.array([pending[cid][0] for cid in content_ids], dtype=np.int64)
+        last_access = np.array([pending[cid][1] for cid in content_ids], dtype=np.float64)
+
+        if hasattr(units, 'apply_accesses'):
+            units.apply_accesses(content_ids, counts, last_access)
+        else:
+            for content_id, count, timestamp in zip(content_ids, counts, last_access):
+                units[content_id].record_accesses(int(count), float(timestamp))
+
+        applied = int(counts.sum())
+        self.total_flushed += applied
+        return applied
+
+
+__all__ = ['AccessLog', 'apply_accesses', 'cumulative_access_boost']
@@ -36,6 +36,7 @@ from .holographic_memory import (
 
 # Import base XPEnvironment
 from .xp_core_unified import XPEnvironment
+from .lexical_index import BM25Index, LexicalUnitMap
 
 from .constants import HRR_DIM, DEFAULT_DECAY_RATE
 
@@ -197,8 +198,9 @@ class AdvancedXPEnvironment(XPEnvironment):
         # Holographic memory system
         self.holographic_memory = HolographicAssociativeMemory(dimension, decay_rate)
         
-        # XPUnit storage
-        self.xpunits: Dict[str, AdvancedXPUnit] = {}
+        # XPUnit storage (content mirrored into a BM25 index for keyword recall)
+        self.xpunit_lexical_index = BM25Index()
+        self.xpunits: Dict[str, AdvancedXPUnit] = LexicalUnitMap(self.xpunit_lexical_index)
         
         # NEW: Store-level fields
         self.mood_state: AffectState = AffectState()  # Running average affect
@@ -0,0 +1,70 @@
+"""
+Analysis Context - Single-Pass Text Analysis Shared Across a Request
+====================================================================
+
+Ingesting or querying one message used to run several NLP passes over the
+same text: the kernel's emotional analyzer, the weighter's importance
+calculation (which re-ran the analyzer) and the environment's NLP parse for
+the unit emotion vector. ``AnalysisContext`` holds everything derived from
+one text:
+
+- ``tokens``: whitespace tokens
+- ``doc``: the environment's NLP document (spaCy ``Doc`` or ``SimpleDoc``)
+- ``emotion``: the kernel analyzer's ``EmotionalState``
+- ``emotional_importance``: the weighter's importance for the text
+- ``emotion_vector``: the environment's unit emotion vector
+
+Fields are filled in by whichever component first needs them and reused by
+the others. ``AnalysisMemo`` is a per-request memo (text -> context), so each
+text is analyzed exactly once per request even when it occurs several times
+in a batch. Memos are meant to be short-lived: create one per request and
+drop it afterwards.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .emotional_weighting import EmotionalState
+
+
+@dataclass
+class AnalysisContext:
+    """Analysis results for one text (fields are None until computed)"""
+    text: str
+    tokens: List[str] = field(default_factory=list)
+    doc: Any = None
+    emotion: Optional[EmotionalState] = None
+    emotional_importance: Optional[float] = None
+    emotion_vector: Optional[np.ndarray] = None
+
+    @classmethod
+    def create(cls, text: str) -> 'AnalysisContext':
+        return cls(text=text, tokens=text.split())
+
+
+class AnalysisMemo:
+    """Per-request memo of analysis contexts, keyed by exact text"""
+
+    def __init__(self):
+        self._contexts: Dict[str, AnalysisContext] = {}
+
+    def get(self, text: str) -> AnalysisContext:
+        """Context for text (created empty on first use)"""
+        context = self._contexts.get(text)
+        if context is None:
+            context = self._contexts[text] = AnalysisContext.create(text)
+        return context
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._contexts
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+
+__all__ = ['AnalysisContext', 'AnalysisMemo']
@@ -0,0 +1,583 @@
+"""
+Approximate Nearest Neighbour Indexes - Pure NumPy
+==================================================
+
+Dependency-free ANN indexes for XP unit vectors, for hosts where faiss is not
+available. Two variants:
+
+- ``IVFFlatIndex``: k-means coarse quantizer over inverted lists of raw
+  vectors; a query scans the ``nprobe`` closest lists exactly. Behaves as an
+  exact flat index until enough vectors exist to train the quantizer, and
+  retrains itself as the collection grows.
+- ``HNSWIndex``: hierarchical navigable small-world graph (Malkov & Yashunin)
+  with the neighbour-selection heuristic; ``ef`` trades recall for latency.
+
+Both support incremental ``add`` / ``remove`` and return ``(id, similarity)``
+pairs, best first, where similarity is cosine (``metric="cosine"``, vectors
+are normalized on insert) or raw inner product (``metric="ip"``).
+
+``search(..., allowed=ids)`` restricts results to a subset (e.g. the matches
+of a metadata filter) and still returns k results whenever at least k
+allowed vectors exist: IVF widens its probe until enough allowed rows are
+scanned, HNSW widens its candidate list and falls back to an exact scan of
+the allowed rows for very selective filters.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+import heapq
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constants import VECTOR_DTYPE, NORMALIZATION_EPSILON
+from .topk import top_k_indices
+
+
+SUPPORTED_METRICS = ("cosine", "ip")
+
+
+class _VectorRows:
+    """Growable float32 matrix with id <-> row mapping"""
+
+    def __init__(self, dim: int, normalize: bool, initial_capacity: int = 1024,
+                 reuse_rows: bool = True):
+        self.dim = dim
+        self.normalize = normalize
+        self.reuse_rows = reuse_rows
+        self.vectors = np.zeros((max(1, initial_capacity), dim), dtype=VECTOR_DTYPE)
+        self.live = np.zeros(max(1, initial_capacity), dtype=bool)
+        self.row_ids: List[Optional[str]] = []
+        self.rows: Dict[str, int] = {}
+        self.free_rows: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def n_rows(self) -> int:
+        return len(self.row_ids)
+
+    def prepare(self, vector: np.ndarray) -> np.ndarray:
+        """Cast (and normalize, for cosine) a vector the way stored rows are"""
+        vector = np.asarray(vector, dtype=VECTOR_DTYPE).reshape(-1)
+        if len(vector) != self.dim:
+            raise ValueError(f"Vector has dimension {len(vector)}, index expects {self.dim}")
+        if self.normalize:
+            norm = np.linalg.norm(vector)
+            if norm > NORMALIZATION_EPSILON:
+                vector = vector / norm
+        return vector
+
+    def add(self, item_id: str, vector: np.ndarray) -> int:
+        if self.reuse_rows and self.free_rows:
+            row = self.free_rows.pop()
+            self.row_ids[row] = item_id
+        else:
+            row = len(self.row_ids)
+            if row == len(self.vectors):
+                self._grow(2 * len(self.vectors))
+            self.row_ids.append(item_id)
+        self.vectors[row] = vector
+        self.live[row] = True
+        self.rows[item_id] = row
+        return row
+
+    def remove(self, item_id: str) -> int:
+        row = self.rows.pop(item_id)
+        self.live[row] = False
+        if self.reuse_rows:
+            self.row_ids[row] = None
+            self.free_rows.append(row)
+        return row
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.live[:self.n_rows])
+
+    def _grow(self, capacity: int):
+        vectors = np.zeros((capacity, self.dim), dtype=VECTOR_DTYPE)
+        vectors[:len(self.vectors)] = self.vectors
+        live = np.zeros(capacity, dtype=bool)
+        live[:len(self.live)] = self.live
+        self.vectors, self.live = vectors, live
+
+
+class ANNIndex:
+    """Common interface for the approximate nearest neighbour indexes"""
+
+    def __init__(self, dim: int, metric: str = "cosine"):
+        if metric not in SUPPORTED_METRICS:
+            raise ValueError(f"Unsupported metric '{metric}', expected one of {SUPPORTED_METRICS}")
+        self.dim = dim
+        self.metric = metric
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._store.rows
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        """Insert (or replace) several vectors"""
+        for item_id, vector in zip(ids, vectors):
+            self.add_item(item_id, vector)
+
+    def add_item(self, item_id: str, vector: np.ndarray):
+        raise NotImplementedError
+
+    def remove(self, ids: Iterable[str]) -> int:
+        """Delete vectors by id; unknown ids are ignored. Returns the number removed"""
+        removed = 0
+        for item_id in ids:
+            if item_id in self._store.rows:
+                self._remove_item(item_id)
+                removed += 1
+        return removed
+
+    def _remove_item(self, item_id: str):
+        raise NotImplementedError
+
+    def search(self, query: np.ndarray, k: int = 10, allowed: Optional[Iterable[str]] = None,
+               **params) -> List[Tuple[str, float]]:
+        raise NotImplementedError
+
+    def _allowed_mask(self, allowed: Iterable[str]) -> np.ndarray:
+        """Row mask of the allowed ids (unknown ids are ignored)"""
+        rows = self._store.rows
+        mask = np.zeros(self._store.n_rows, dtype=bool)
+        mask[[rows[item_id] for item_id in allowed if item_id in rows]] = True
+        return mask
+
+    def _exact_search(self, query: np.ndarray, rows: np.ndarray,
+                      k: int) -> List[Tuple[str, float]]:
+        """Exact top-k over the given rows (query already prepared)"""
+        scores = self._store.vectors[rows] @ query
+        row_ids = self._store.row_ids
+        return [(row_ids[rows[i]], float(scores[i])) for i in top_k_indices(scores, k)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {'type': type(self).__name__, 'size': len(self), 'dim': self.dim,
+                'metric': self.metric}
+
+
+# =============================================================================
+# IVF-FLAT
+# =============================================================================
+
+class IVFFlatIndex(ANNIndex):
+    """
+    Inverted-file index with a k-means coarse quantizer and exact list scans.
+
+    Args:
+        dim: Vector dimension
+        n_lists: Number of inverted lists (None = about 4 * sqrt(n) at train time)
+        nprobe: Default number of lists scanned per query
+        metric: "cosine" or "ip"
+        min_train_size: Vectors needed before the quantizer is trained; below
+            this the index answers exactly
+        retrain_growth: Retrain once the collection has grown by this factor
+            since the last training
+        train_iters: Lloyd iterations for k-means
+        seed: Random seed for k-means initialisation
+    """
+
+    def __init__(self, dim: int, n_lists: Optional[int] = None, nprobe: int = 8,
+                 metric: str = "cosine", min_train_size: int = 1024,
+                 retrain_growth: float = 4.0, train_iters: int = 20, seed: int = 42):
+        super().__init__(dim, metric)
+        self._store = _VectorRows(dim, normalize=metric == "cosine")
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.retrain_growth = retrain_growth
+        self.train_iters = train_iters
+        self._rng = np.random.default_rng(seed)
+
+        self.centroids: Optional[np.ndarray] = None
+        self._centroid_norms: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._list_arrays: List[Optional[np.ndarray]] = []
+        self._row_list = np.full(len(self._store.vectors), -1, dtype=np.int64)
+        self._trained_size = 0
+        self._stale_entries = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def add_item(self, item_id: str, vector: np.ndarray):
+        vector = self._store.prepare(vector)
+        if item_id in self._store.rows:
+            self._remove_item(item_id)
+        row = self._store.add(item_id, vector)
+        if len(self._row_list) < len(self._store.vectors):
+            grown = np.full(len(self._store.vectors), -1, dtype=np.int64)
+            grown[:len(self._row_list)] = self._row_list
+            self._row_list = grown
+
+        if self.is_trained:
+            self._assign(np.array([row]))
+            if len(self._store) >= self.retrain_growth * self._trained_size:
+                self.train()
+        elif len(self._store) >= self.min_train_size:
+            self.train()
+
+    def _remove_item(self, item_id: str):
+        row = self._store.remove(item_id)
+        if self._row_list[row] >= 0:
+            # Lazy deletion: list entries are filtered by the live mask and
+            # compacted once they make up a quarter of all entries
+            self._row_list[row] = -1
+            self._stale_entries += 1
+            if self._stale_entries > 0.25 * max(1, len(self._store)):
+                self._compact_lists()
+
+    def train(self):
+        """(Re)train the coarse quantizer on the current vectors and reassign them"""
+        rows = self._store.live_rows()
+        n = len(rows)
+        if n == 0:
+            return
+        n_lists = self.n_lists or int(4 * math.sqrt(n))
+        n_lists = max(1, min(n_lists, n))
+
+        # k-means on a sample (about 64 points per list is plenty)
+        sample_size = min(n, max(n_lists * 64, 1))
+        sample_rows = rows if sample_size == n else self._rng.choice(rows, sample_size, replace=False)
+        sample = self._store.vectors[sample_rows].astype(np.float64)
+        centroids = sample[self._rng.choice(len(sample), n_lists, replace=False)].copy()
+
+        for _ in range(self.train_iters):
+            assignment = self._nearest_centroids(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=n_lists)
+            empty = counts == 0
+            centroids[~empty] = sums[~empty] / counts[~empty, None]
+            if empty.any():
+                # Re-seed empty clusters with random sample points
+                centroids[empty] = sample[self._rng.choice(len(sample), int(empty.sum()))]
+
+        self.centroids = centroids.astype(VECTOR_DTYPE)
+        self._centroid_norms = np.einsum('ij,ij->i', self.centroids, self.centroids)
+        self._lists = [[] for _ in range(n_lists)]
+        self._list_arrays = [None] * n_lists
+        self._row_list[:] = -1
+        self._stale_entries = 0
+        self._assign(rows)
+        self._trained_size = n
+
+    @staticmethod
+    def _nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        # argmin ||x - c||^2 = argmin (||c||^2 - 2 x.c)
+        centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+        return np.argmin(centroid_norms[None, :] - 2.0 * vectors @ centroids.T, axis=1)
+
+    def _assign(self, rows: np.ndarray):
+        lists = self._nearest_centroids(self._store.vectors[rows], self.centroids)
+        for row, list_id in zip(rows.tolist(), lists.tolist()):
+            self._lists[list_id].append(row)
+            self._list_arrays[list_id] = None
+            self._row_list[row] = list_id
+
+    def _compact_lists(self):
+        live = self._store.live
+        for list_id, rows in enumerate(self._lists):
+            self._lists[list_id] = [row for row in rows
+                                    if live[row] and self._row_list[row] == list_id]
+            self._list_arrays[list_id] = None
+        self._stale_entries = 0
+
+    def _list_rows(self, list_id: int) -> np.ndarray:
+        array = self._list_arrays[list_id]
+        if array is None:
+            array = np.array(self._lists[list_id], dtype=np.int64)
+            self._list_arrays[list_id] = array
+        return array
+
+    def search(self, query: np.ndarray, k: int = 10, allowed: Optional[Iterable[str]] = None,
+               nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Approximate top-k search.
+
+        Args:
+            query: Query vector
+            k: Number of results
+            allowed: Restrict results to these ids (None = all)
+            nprobe: Lists to scan for this query (defaults to the index setting);
+                widened when too few allowed rows fall in the probed lists
+        """
+        if not len(self._store) or k <= 0:
+            return []
+        query = self._store.prepare(query)
+        mask = None if allowed is None else self._allowed_mask(allowed)
+
+        if not self.is_trained:
+            candidates = self._store.live_rows()
+            if mask is not None:
+                candidates = candidates[mask[candidates]]
+        else:
+            nprobe = min(nprobe or self.nprobe, len(self.centroids))
+            distances = self._centroid_norms - 2.0 * (self.centroids @ query)
+            while True:
+                candidates = self._probe(distances, nprobe)
+                if mask is None:
+                    break
+                candidates = candidates[mask[candidates]]
+                if len(candidates) >= k or nprobe == len(self.centroids):
+                    break
+                nprobe = min(2 * nprobe, len(self.centroids))
+
+        return self._exact_search(query, candidates, k)
+
+    def _probe(self, distances: np.ndarray, nprobe: int) -> np.ndarray:
+        """Live rows filed in the nprobe lists closest to the query"""
+        probe = top_k_indices(-distances, nprobe)
+        list_rows = [self._list_rows(list_id) for list_id in probe]
+        candidates = np.concatenate(list_rows)
+        if self._stale_entries:
+            # Drop deleted rows and rows reused since (now filed in another list)
+            list_ids = np.repeat(probe, [len(rows) for rows in list_rows])
+            candidates = candidates[self._store.live[candidates] &
+                                    (self._row_list[candidates] == list_ids)]
+        return candidates
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update({
+            'trained': self.is_trained,
+            'n_lists': len(self._lists),
+            'nprobe': self.nprobe,
+            'trained_size': self._trained_size,
+        })
+        return stats
+
+
+# =============================================================================
+# HNSW
+# =============================================================================
+
+class HNSWIndex(ANNIndex):
+    """
+    Hierarchical navigable small-world graph index.
+
+    Deleted vectors are tombstoned: they stay in the graph for navigation but
+    never appear in results. The graph is rebuilt from the live vectors once
+    tombstones exceed ``max_deleted_fraction`` of all nodes.
+
+    Args:
+        dim: Vector dimension
+        M: Neighbours per node on the upper layers (2 * M on layer 0)
+        ef_construction: Candidate list size while inserting
+        ef: Default candidate list size while searching
+        metric: "cosine" or "ip"
+        max_deleted_fraction: Tombstone fraction that triggers a rebuild
+        seed: Random seed for level assignment
+    """
+
+    def __init__(self, dim: int, M: int = 16, ef_construction: int = 100, ef: int = 50,
+                 metric: str = "cosine", max_deleted_fraction: float = 0.3, seed: int = 42):
+        super().__init__(dim, metric)
+        self.M = M
+        self.M0 = 2 * M
+        self.ef_construction = ef_construction
+        self.ef = ef
+        self.max_deleted_fraction = max_deleted_fraction
+        self._level_mult = 1.0 / math.log(max(M, 2))
+        self._seed = seed
+        self._reset()
+
+    def _reset(self):
+        self._store = _VectorRows(self.dim, normalize=self.metric == "cosine", reuse_rows=False)
+        self._rng = np.random.default_rng(self._seed)
+        self._links: List[List[List[int]]] = []  # row -> level -> neighbour rows
+        self._entry_point: Optional[int] = None
+        self._max_level = -1
+        self._deleted = 0
+
+    def add_item(self, item_id: str, vector: np.ndarray):
+        vector = self._store.prepare(vector)
+        if item_id in self._store.rows:
+            self._remove_item(item_id)
+        row = self._store.add(item_id, vector)
+        level = int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+        self._links.append([[] for _ in range(level + 1)])
+
+        if self._entry_point is None:
+            self._entry_point, self._max_level = row, level
+            return
+
+        entry_points = [self._entry_point]
+        for layer in range(self._max_level, level, -1):
+            entry_points = [self._search_layer(vector, entry_points, 1, layer)[0][1]]
+
+        for layer in range(min(level, self._max_level), -1, -1):
+            candidates = self._search_layer(vector, entry_points, self.ef_construction, layer)
+            neighbours = self._select_neighbours(candidates, self.M)
+            self._links[row][layer] = neighbours
+            max_links = self.M0 if layer == 0 else self.M
+            for neighbour in neighbours:
+                links = self._links[neighbour][layer]
+                links.append(row)
+                if len(links) > max_links:
+                    self._shrink(neighbour, layer, max_links)
+            entry_points = [r for _, r in candidates]
+
+        if level > self._max_level:
+            self._entry_point, self._max_level = row, level
+
+    def _remove_item(self, item_id: str):
+        self._store.remove(item_id)
+        self._deleted += 1
+        if self._deleted > self.max_deleted_fraction * self._store.n_rows:
+            self.rebuild()
+
+    def rebuild(self):
+        """Rebuild the graph from the live vectors (drops tombstones)"""
+        rows = self._store.live_rows()
+        ids = [self._store.row_ids[row] for row in rows]
+        vectors = self._store.vectors[rows].copy()
+        self._reset()
+        for item_id, vector in zip(ids, vectors):
+            self.add_item(item_id, vector)
+
+    def _distances(self, query: np.ndarray, rows: List[int]) -> np.ndarray:
+        # Negated similarity, so smaller is closer
+        return -(self._store.vectors[rows] @ query)
+
+    def _search_layer(self, query: np.ndarray, entry_points: List[int], ef: int,
+                      layer: int) -> List[Tuple[float, int]]:
+        """Greedy best-first search on one layer; returns (distance, row) ascending"""
+        visited = set(entry_points)
+        entry_distances = self._distances(query, entry_points).tolist()
+        candidates = list(zip(entry_distances, entry_points))
+        heapq.heapify(candidates)
+        results = [(-d, r) for d, r in candidates]  # max-heap on distance
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            distance, row = heapq.heappop(candidates)
+            if distance > -results[0][0] and len(results) >= ef:
+                break
+            neighbours = [n for n in self._links[row][layer] if n not in visited]
+            if not neighbours:
+                continue
+            visited.update(neighbours)
+            for neighbour_distance, neighbour in zip(self._distances(query, neighbours).tolist(),
+                                                     neighbours):
+                if len(results) < ef or neighbour_distance < -results[0][0]:
+                    heapq.heappush(candidates, (neighbour_distance, neighbour))
+                    heapq.heappush(results, (-neighbour_distance, neighbour))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+
+        return sorted((-d, r) for d, r in results)
+
+    def _select_neighbours(self, candidates: List[Tuple[float, int]], m: int) -> List[int]:
+        """
+        Neighbour-selection heuristic: keep a candidate only if it is closer to
+        the new node than to every neighbour kept so far (preserves long-range
+        links), then top up with the closest pruned candidates.
+        """
+        if len(candidates) <= m:
+            return [r for _, r in candidates]
+        selected: List[int] = []
+        pruned: List[int] = []
+        vectors = self._store.vectors
+        for distance, row in candidates:
+            if len(selected) >= m:
+                break
+            if selected:
+                closest_kept = -(vectors[selected] @ vectors[row]).max()
+                if closest_kept < distance:
+                    pruned.append(row)
+                    continue
+            selected.append(row)
+        for row in pruned:
+            if len(selected) >= m:
+                break
+            selected.append(row)
+        return selected
+
+    def _shrink(self, row: int, layer: int, max_links: int):
+        links = self._links[row][layer]
+        distances = self._distances(self._store.vectors[row], links)
+        keep = np.argsort(distances, kind='stable')[:max_links]
+        self._links[row][layer] = [links[i] for i in keep.tolist()]
+
+    def search(self, query: np.ndarray, k: int = 10, allowed: Optional[Iterable[str]] = None,
+               ef: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Approximate top-k search.
+
+        Args:
+            query: Query vector
+            k: Number of results
+            allowed: Restrict results to these ids (None = all)
+            ef: Candidate list size for this query (defaults to the index setting)
+        """
+        if not len(self._store) or k <= 0:
+            return []
+        query = self._store.prepare(query)
+        ef = max(ef or self.ef, k)
+
+        n_eligible = len(self._store)
+        mask = None
+        if allowed is not None:
+            mask = self._allowed_mask(allowed) & self._store.live[:self._store.n_rows]
+            n_eligible = int(mask.sum())
+            if n_eligible <= ef:
+                # Very selective filter: scanning the allowed rows is cheaper
+                return self._exact_search(query, np.flatnonzero(mask), k)
+
+        entry_points = [self._entry_point]
+        for layer in range(self._max_level, 0, -1):
+            entry_points = [self._search_layer(query, entry_points, 1, layer)[0][1]]
+        # Compensate for tombstones and disallowed rows that will be filtered out
+        ef = min(self._store.n_rows, int(ef * self._store.n_rows / max(1, n_eligible)))
+        candidates = self._search_layer(query, entry_points, ef, 0)
+
+        eligible = self._store.live if mask is None else mask
+        row_ids = self._store.row_ids
+        results = [(row_ids[row], -distance) for distance, row in candidates if eligible[row]]
+        if mask is not None and len(results) < min(k, n_eligible):
+            return self._exact_search(query, np.flatnonzero(mask), k)
+        return results[:k]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update({
+            'M': self.M,
+            'ef_construction': self.ef_construction,
+            'ef': self.ef,
+            'max_level': self._max_level,
+            'deleted': self._deleted,
+        })
+        return stats
+
+
+# =============================================================================
+# FACTORY
+# =============================================================================
+
+def create_ann_index(index_type: str, dim: int, **params) -> ANNIndex:
+    """
+    Create an ANN index by name.
+
+    Args:
+        index_type: "ivf" (IVFFlatIndex) or "hnsw" (HNSWIndex)
+        dim: Vector dimension
+        **params: Index-specific parameters
+    """
+    if index_type == "ivf":
+        return IVFFlatIndex(dim, **params)
+    if index_type == "hnsw":
+        return HNSWIndex(dim, **params)
+    raise ValueError(f"Unknown ANN index type '{index_type}', expected 'ivf' or 'hnsw'")
+
+
+__all__ = ['ANNIndex', 'IVFFlatIndex', 'HNSWIndex', 'create_ann_index']
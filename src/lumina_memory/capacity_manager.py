@@ -0,0 +1,377 @@
+"""
+Capacity Manager - Importance-Ordered Eviction for Bounded Memory
+=================================================================
+
+``UnifiedXPConfig.max_memory_capacity`` bounds the number of units an
+``XPEnvironment`` keeps. When the bound is exceeded the lowest-value units
+are evicted: lowest current (decayed) importance first, then least recently
+accessed, then content ID as a deterministic tie-break.
+
+Victims come from an indexed min-heap (``IndexedMinHeap``), so selecting and
+removing one unit is O(log n). Keeping every key exact on every write would
+put a heap update on each access, so keys follow two rules instead:
+
+- A key may be stale *low*. Accesses only ever raise importance and
+  ``last_access``; a popped unit is re-keyed against its current value and
+  pushed back if it has risen, so stale-low keys cost one extra pop.
+- Anything that can *lower* priorities (a decay sweep, a lazy decay clock
+  advance, consolidation, replacing the unit map) calls ``invalidate``. The
+  heap is then rebuilt (vectorized over a ``ColumnarUnitStore``) on the next
+  eviction, not on every maintenance pass.
+
+Policies (``capacity_policy``):
+
+- ``"hard"``: evict down to the capacity after every ingest
+- ``"soft"``: tolerate up to ``capacity * (1 + capacity_soft_margin)`` units
+  on ingest and evict down to the capacity during maintenance
+  (``evolve_temporal_state``) or once the soft ceiling is crossed
+- ``"none"``: no enforcement (the default, so eviction is opt-in)
+
+With ``capacity_spill_dir`` set, evicted units are written to a
+``UnitArchive`` on disk instead of being dropped and can be restored later.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+import heapq
+import json
+import os
+from pathlib import Path
+from typing import (Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union,
+                    TYPE_CHECKING)
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .xp_core_unified import XPUnit
+
+CAPACITY_POLICIES = ("hard", "soft", "none")
+
+# (importance, last_access, content_id): smallest is evicted first
+PriorityKey = Tuple[float, float, str]
+
+
+def priority_key(unit: 'XPUnit') -> PriorityKey:
+    """Eviction priority of a unit (smaller = evicted first)"""
+    return (float(unit.importance), float(unit.last_access), unit.content_id)
+
+
+class IndexedMinHeap:
+    """
+    Binary min-heap with a position map, so keys can be updated or removed
+    by item ID in O(log n).
+    """
+
+    def __init__(self):
+        self._heap: List[List[Any]] = []  # [key, item_id]
+        self._positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._positions
+
+    def key_of(self, item_id: str) -> Any:
+        return self._heap[self._positions[item_id]][0]
+
+    def push(self, item_id: str, key: Any):
+        """Insert an item, or move an existing one to a new key"""
+        position = self._positions.get(item_id)
+        if position is None:
+            self._heap.append([key, item_id])
+            self._positions[item_id] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+        old_key = self._heap[position][0]
+        self._heap[position][0] = key
+        if key < old_key:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def peek(self) -> Tuple[str, Any]:
+        key, item_id = self._heap[0]
+        return item_id, key
+
+    def pop(self) -> Tuple[str, Any]:
+        """Remove and return the (item_id, key) with the smallest key"""
+        item_id, key = self.peek()
+        self.remove(item_id)
+        return item_id, key
+
+    def remove(self, item_id: str) -> bool:
+        """Remove an item; returns False if it was not in the heap"""
+        position = self._positions.pop(item_id, None)
+        if position is None:
+            return False
+        last = self._heap.pop()
+        if position < len(self._heap):
+            self._heap[position] = last
+            self._positions[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self._positions[last[1]])
+        return True
+
+    def clear(self):
+        self._heap.clear()
+        self._positions.clear()
+
+    def heapify(self, items: Iterable[Tuple[str, Any]]):
+        """Replace the contents with (item_id, key) pairs in O(n)"""
+        self._heap = [[key, item_id] for item_id, key in items]
+        heapq.heapify(self._heap)
+        self._positions = {entry[1]: i for i, entry in enumerate(self._heap)}
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._positions[heap[i][1]] = i
+        self._positions[heap[j][1]] = j
+
+    def _sift_up(self, position: int):
+        heap = self._heap
+        while position > 0:
+            parent = (position - 1) // 2
+            if heap[position][0] < heap[parent][0]:
+                self._swap(position, parent)
+                position = parent
+            else:
+                break
+
+    def _sift_down(self, position: int):
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = position
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < size and heap[child][0] < heap[smallest][0]:
+                    smallest = child
+            if smallest == position:
+                return
+            self._swap(position, smallest)
+            position = smallest
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class UnitArchive:
+    """
+    Append-only on-disk archive of evicted units (``units.jsonl``).
+
+    Each line is ``XPUnit.to_dict()``; restoring a unit appends a tombstone
+    line, so the file can be replayed on reopen. An in-memory offset map
+    makes loads a single seek.
+
+    Args:
+        directory: Archive directory (created if missing)
+    """
+
+    FILE_NAME = "units.jsonl"
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / self.FILE_NAME
+        self._offsets: Dict[str, int] = {}
+        if self.path.exists():
+            self._replay()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, content_id: str) -> bool:
+        return content_id in self._offsets
+
+    def store(self, unit: 'XPUnit'):
+        """Archive a unit (a later copy of the same ID replaces the earlier one)"""
+        self._append(unit.content_id, unit.to_dict())
+
+    def load(self, content_id: str) -> Optional[Dict[str, Any]]:
+        """Archived unit data (XPUnit.from_dict input), or None"""
+        offset = self._offsets.get(content_id)
+        if offset is None:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def discard(self, content_id: str) -> bool:
+        """Forget an archived unit (after it has been restored)"""
+        if content_id not in self._offsets:
+            return False
+        self._append(content_id, None)
+        return True
+
+    def ids(self) -> List[str]:
+        return list(self._offsets)
+
+    def _append(self, content_id: str, data: Optional[Dict[str, Any]]):
+        record = data if data is not None else {'content_id': content_id, 'archived': False}
+        line = json.dumps(record, default=_json_default, ensure_ascii=False) + "\n"
+        with open(self.path, 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(line.encode('utf-8'))
+        if data is None:
+            self._offsets.pop(content_id, None)
+        else:
+            self._offsets[content_id] = offset
+
+    def _replay(self):
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # Truncated final write
+                    if record.get('archived') is False:
+                        self._offsets.pop(record['content_id'], None)
+                    else:
+                        self._offsets[record['content_id']] = offset
+                offset += len(line)
+
+
+class CapacityManager:
+    """
+    Chooses which units to evict when an environment exceeds its capacity.
+
+    The manager only orders and selects; the environment performs the
+    removal (see ``XPEnvironment.remove_units``).
+
+    Args:
+        max_units: Capacity (<= 0 disables enforcement)
+        policy: "hard", "soft" or "none"
+        soft_margin: Soft policy overshoot tolerated on ingest
+        archive: Spill evicted units here instead of deleting them
+    """
+
+    def __init__(self, max_units: int, policy: str = "hard", soft_margin: float = 0.1,
+                 archive: Optional[UnitArchive] = None):
+        if policy not in CAPACITY_POLICIES:
+            raise ValueError(f"Unknown capacity policy: {policy} (expected one of {CAPACITY_POLICIES})")
+        if soft_margin < 0:
+            raise ValueError("soft_margin must be non-negative")
+        self.max_units = max_units
+        self.policy = policy
+        self.soft_margin = soft_margin
+        self.archive = archive
+        self._heap = IndexedMinHeap()
+        self._dirty = True  # Heap is rebuilt from the units before the first eviction
+        self.total_evicted = 0
+        self.total_rebuilds = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.policy != "none" and self.max_units > 0
+
+    @property
+    def ceiling(self) -> int:
+        """Unit count at which ingest triggers eviction"""
+        if self.policy == "soft":
+            return int(self.max_units * (1.0 + self.soft_margin))
+        return self.max_units
+
+    def eviction_count(self, n_units: int, maintenance: bool = False) -> int:
+        """
+        Number of units to evict now.
+
+        Args:
+            n_units: Current number of units
+            maintenance: True for maintenance passes (the soft policy trims
+                down to the capacity there even below its ceiling)
+        """
+        if not self.enabled:
+            return 0
+        if n_units > self.ceiling or (maintenance and n_units > self.max_units):
+            return n_units - self.max_units
+        return 0
+
+    def track(self, unit: 'XPUnit'):
+        """Add or re-key a unit (call when its priority may have dropped)"""
+        if self.enabled and not self._dirty:
+            self._heap.push(unit.content_id, priority_key(unit))
+
+    def discard(self, content_id: str):
+        """Stop tracking a removed unit"""
+        self._heap.remove(content_id)
+
+    def invalidate(self):
+        """Priorities may have dropped across the board; rebuild before the next eviction"""
+        self._dirty = True
+        self._heap.clear()
+
+    def rebuild(self, units: Mapping[str, 'XPUnit']):
+        """Rebuild the heap from the current units (O(n))"""
+        if hasattr(units, 'current_importance'):
+            rows = units.live_rows()
+            importance = units.current_importance(rows).tolist()
+            last_access = units.last_access[rows].tolist()
+            ids = [units.id_at(row) for row in rows.tolist()]
+            items = zip(ids, zip(importance, last_access, ids))
+        else:
+            items = ((content_id, priority_key(unit)) for content_id, unit in units.items())
+        self._heap.heapify(items)
+        self._dirty = False
+        self.total_rebuilds += 1
+
+    def select_victims(self, units: Mapping[str, 'XPUnit'], n: int,
+                       protected: Iterable[str] = ()) -> List[str]:
+        """
+        Pop the n lowest-priority units.
+
+        Protected units (e.g. the ones just ingested) are only chosen once
+        every other unit has been. Victims leave the heap; the caller must
+        remove them from the unit map.
+        """
+        if n <= 0:
+            return []
+        if self._dirty:
+            self.rebuild(units)
+        protected = set(protected)
+        victims: List[str] = []
+        deferred: List[Tuple[str, PriorityKey]] = []
+        while len(victims) < n and self._heap:
+            content_id, key = self._heap.pop()
+            unit = units.get(content_id)
+            if unit is None:
+                continue
+            current = priority_key(unit)
+            if current > key:
+                # Stale-low key (accessed since it was keyed): retry at its real priority
+                self._heap.push(content_id, current)
+            elif content_id in protected:
+                deferred.append((content_id, current))
+            else:
+                victims.append(content_id)
+        deferred.sort(key=lambda item: item[1])
+        while len(victims) < n and deferred:
+            victims.append(deferred.pop(0)[0])
+        for content_id, key in deferred:
+            self._heap.push(content_id, key)
+        self.total_evicted += len(victims)
+        return victims
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            'policy': self.policy,
+            'max_units': self.max_units,
+            'ceiling': self.ceiling,
+            'total_evicted': self.total_evicted,
+            'heap_rebuilds': self.total_rebuilds,
+        }
+        if self.archive is not None:
+            stats['archived_units'] = len(self.archive)
+        return stats
+
+
+__all__ = ['CapacityManager', 'IndexedMinHeap', 'UnitArchive', 'priority_key',
+           'CAPACITY_POLICIES']
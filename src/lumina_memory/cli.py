@@ -123,7 +123,7 @@ def handle_demo_command(args):
             console.print(" Using mock components for demo")
         else:
             embedding_provider = SentenceTransformerEmbedding()
-            vector_store = FAISSVectorStore(dimension=384)
+            vector_store = FAISSVectorStore.from_config(config)
             console.print(" Using real components for demo")
         
         # Create memory system
@@ -0,0 +1,394 @@
+"""
+Columnar Unit Store - Matrix-Backed Storage for XP Units
+========================================================
+
+XPEnvironment historically kept its units in a plain ``Dict[str, XPUnit]`` and
+scored queries by walking that dict in Python. This module provides a drop-in
+replacement mapping that additionally keeps every unit's numeric state in
+contiguous columns:
+
+- ``semantic`` / ``hrr`` / ``emotion``: float32 matrices, one row per unit
+- ``timestamp`` / ``last_access`` / ``decay_rate`` / ``importance`` /
+  ``access_count`` / ``decay_reference`` / ``effective_decay_rate``:
+  parallel 1-D arrays
+- cached row norms for the semantic and emotion matrices
+- an id <-> row map with free-row reuse, so a unit keeps its row for life
+
+The XPUnit objects remain the public face of the data. Units write their own
+attribute changes through to the columns (see ``XPUnit.__setattr__``), so
+callers keep mutating ``unit.importance`` etc. exactly as before while scoring
+becomes one matrix-vector product plus vectorized decay/importance math.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .constants import VECTOR_DTYPE, TIME_DTYPE, DEFAULT_W_SEMANTIC, DEFAULT_W_EMOTION
+from .access_log import apply_accesses
+from .math_foundation import (
+    memory_similarity_matrix, apply_temporal_weighting, get_current_timestamp
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .xp_core_unified import XPUnit
+
+
+# Unit attributes mirrored into columns
+SCALAR_COLUMNS = ('timestamp', 'last_access', 'decay_rate', 'importance', 'access_count',
+                  'decay_reference', 'effective_decay_rate')
+VECTOR_COLUMNS = {'semantic_vector': 'semantic', 'hrr_shape': 'hrr', 'emotion_vector': 'emotion'}
+SYNCED_FIELDS = frozenset(SCALAR_COLUMNS) | frozenset(VECTOR_COLUMNS)
+
+DEFAULT_INITIAL_CAPACITY = 64
+
+
+class ColumnarUnitStore(MutableMapping):
+    """
+    Mapping of content_id -> XPUnit backed by contiguous numpy columns.
+
+    Behaves like the ``Dict[str, XPUnit]`` it replaces (iteration order is
+    insertion order, ``units[cid] = unit`` stores, ``del units[cid]`` removes),
+    and exposes the columns for vectorized scoring.
+    """
+
+    def __init__(self, units: Optional[Mapping[str, 'XPUnit']] = None,
+                 initial_capacity: int = DEFAULT_INITIAL_CAPACITY):
+        self._units: Dict[str, 'XPUnit'] = {}
+        self._rows: Dict[str, int] = {}          # content_id -> row
+        self._row_ids: List[Optional[str]] = []  # row -> content_id (None = free)
+        self._free_rows: List[int] = []
+        self._capacity = max(1, int(initial_capacity))
+        self._size = 0                           # high-water mark of used rows
+
+        # Vector columns are allocated on first insert, when dimensions are known
+        self.semantic: Optional[np.ndarray] = None
+        self.hrr: Optional[np.ndarray] = None
+        self.emotion: Optional[np.ndarray] = None
+        self.semantic_norm = np.zeros(self._capacity, dtype=VECTOR_DTYPE)
+        self.emotion_norm = np.zeros(self._capacity, dtype=VECTOR_DTYPE)
+        self.emotion_valid = np.zeros(self._capacity, dtype=bool)
+
+        # Scalar columns
+        self.timestamp = np.zeros(self._capacity, dtype=TIME_DTYPE)
+        self.last_access = np.zeros(self._capacity, dtype=TIME_DTYPE)
+        self.decay_rate = np.zeros(self._capacity, dtype=np.float64)
+        self.importance = np.zeros(self._capacity, dtype=np.float64)
+        self.access_count = np.zeros(self._capacity, dtype=np.int64)
+        self.decay_reference = np.zeros(self._capacity, dtype=np.float64)
+        self.effective_decay_rate = np.zeros(self._capacity, dtype=np.float64)
+        self.live = np.zeros(self._capacity, dtype=bool)
+
+        # Shared DecayClock when units decay lazily (see XPUnit.attach_decay_clock)
+        self.decay_clock = None
+        # Optional EmotionIndex kept in sync with emotion_vector writes
+        self.emotion_index = None
+
+        if units:
+            for content_id, unit in units.items():
+                self[content_id] = unit
+
+    # ------------------------------------------------------------------
+    # Mapping protocol
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, content_id: str) -> 'XPUnit':
+        return self._units[content_id]
+
+    def __setitem__(self, content_id: str, unit: 'XPUnit'):
+        if content_id in self._units:
+            old_unit = self._units[content_id]
+            if old_unit is not unit:
+                self._detach(old_unit)
+            row = self._rows[content_id]
+        else:
+            row = self._allocate_row()
+            self._rows[content_id] = row
+            self._row_ids[row] = content_id
+
+        self._units[content_id] = unit
+        self._write_row(row, unit)
+        self.live[row] = True
+        object.__setattr__(unit, '_column_store', self)
+
+    def __delitem__(self, content_id: str):
+        unit = self._units.pop(content_id)
+        row = self._rows.pop(content_id)
+        self._row_ids[row] = None
+        self.live[row] = False
+        self.emotion_valid[row] = False
+        self._free_rows.append(row)
+        self._detach(unit)
+        if self.emotion_index is not None:
+            self.emotion_index.remove(content_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._units)
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def __contains__(self, content_id) -> bool:
+        return content_id in self._units
+
+    def __repr__(self) -> str:
+        return f"ColumnarUnitStore({len(self)} units, capacity={self._capacity})"
+
+    def clear(self):
+        for unit in self._units.values():
+            self._detach(unit)
+        self._units.clear()
+        self._rows.clear()
+        self._row_ids = [None] * len(self._row_ids)
+        self._free_rows.clear()
+        self._size = 0
+        self.live[:] = False
+        self.emotion_valid[:] = False
+        if self.emotion_index is not None:
+            self.emotion_index.clear()
+
+    # ------------------------------------------------------------------
+    # Row bookkeeping
+    # ------------------------------------------------------------------
+
+    def row_of(self, content_id: str) -> int:
+        """Row index of a unit"""
+        return self._rows[content_id]
+
+    def rows_of(self, content_ids: Iterable[str]) -> np.ndarray:
+        """Sorted row indices of the given units (IDs not in the store are skipped)"""
+        rows = self._rows
+        return np.sort(np.array([rows[cid] for cid in content_ids if cid in rows], dtype=np.int64))
+
+    def id_at(self, row: int) -> Optional[str]:
+        """Content ID stored at a row (None for a free row)"""
+        return self._row_ids[row]
+
+    def unit_at(self, row: int) -> 'XPUnit':
+        """Unit stored at a row"""
+        return self._units[self._row_ids[row]]
+
+    @property
+    def n_rows(self) -> int:
+        """Number of rows in use, including free rows awaiting reuse"""
+        return self._size
+
+    def live_rows(self) -> np.ndarray:
+        """Indices of rows that currently hold a unit"""
+        if not self._free_rows:
+            return np.arange(self._size)
+        return np.flatnonzero(self.live[:self._size])
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._size == self._capacity:
+            self._grow(self._capacity * 2)
+        row = self._size
+        self._size += 1
+        self._row_ids.append(None)
+        return row
+
+    def _grow(self, new_capacity: int):
+        """Amortized doubling of every column"""
+        def grown(column: Optional[np.ndarray]) -> Optional[np.ndarray]:
+            if column is None:
+                return None
+            shape = (new_capacity,) + column.shape[1:]
+            new_column = np.zeros(shape, dtype=column.dtype)
+            new_column[:self._size] = column[:self._size]
+            return new_column
+
+        for name in ('semantic', 'hrr', 'emotion', 'semantic_norm', 'emotion_norm',
+                     'emotion_valid', 'live') + SCALAR_COLUMNS:
+            setattr(self, name, grown(getattr(self, name)))
+        self._capacity = new_capacity
+
+    def _ensure_matrix(self, name: str, vector: np.ndarray) -> np.ndarray:
+        matrix = getattr(self, name)
+        dim = len(vector)
+        if matrix is None:
+            matrix = np.zeros((self._capacity, dim), dtype=VECTOR_DTYPE)
+            setattr(self, name, matrix)
+        elif matrix.shape[1] != dim:
+            raise ValueError(
+                f"{name} vector has dimension {dim}, store expects {matrix.shape[1]}"
+            )
+        return matrix
+
+    def _write_row(self, row: int, unit: 'XPUnit'):
+        # Raw attribute values: importance is stored as of decay_reference
+        state = vars(unit)
+        for field_name in SYNCED_FIELDS:
+            self._write_field(row, field_name, state[field_name])
+
+    def _write_field(self, row: int, field_name: str, value):
+        if field_name in VECTOR_COLUMNS:
+            column = VECTOR_COLUMNS[field_name]
+            if column == 'emotion' and self.emotion_index is not None:
+                self.emotion_index.update(self._row_ids[row], value)
+            if value is None:
+                if column != 'emotion':
+                    raise ValueError(f"Unit {self._row_ids[row]} has no {field_name}")
+                self.emotion_valid[row] = False
+                self.emotion_norm[row] = 0.0
+                return
+            vector = np.asarray(value)
+            matrix = self._ensure_matrix(column, vector)
+            matrix[row] = vector
+            if column == 'semantic':
+                self.semantic_norm[row] = np.linalg.norm(vector)
+            elif column == 'emotion':
+                self.emotion_norm[row] = np.linalg.norm(vector)
+                self.emotion_valid[row] = True
+        else:
+            getattr(self, field_name)[row] = value
+
+    def _detach(self, unit: 'XPUnit'):
+        if unit.__dict__.get('_column_store') is self:
+            object.__setattr__(unit, '_column_store', None)
+
+    # ------------------------------------------------------------------
+    # Write-through from XPUnit
+    # ------------------------------------------------------------------
+
+    def sync_field(self, unit: 'XPUnit', field_name: str, value):
+        """Mirror a single attribute change of a stored unit into its column"""
+        row = self._rows.get(unit.content_id)
+        if row is None or self._units.get(unit.content_id) is not unit:
+            return
+        self._write_field(row, field_name, value)
+
+    def refresh(self, content_id: str):
+        """Re-read every column of a unit (after in-place edits of its arrays)"""
+        self._write_row(self._rows[content_id], self._units[content_id])
+
+    def apply_accesses(self, content_ids: List[str], counts: np.ndarray,
+                       last_access: np.ndarray):
+        """
+        Apply batched access counts (see AccessLog) to the columns and units.
+
+        Equivalent to ``counts[i]`` calls of ``update_access`` on each unit.
+        """
+        rows = np.array([self._rows[cid] for cid in content_ids], dtype=np.int64)
+        importance, access_count = apply_accesses(
+            self.current_importance(rows), self.access_count[rows], counts
+        )
+        self.importance[rows] = importance
+        self.access_count[rows] = access_count
+        self.last_access[rows] = last_access
+        if self.decay_clock is not None:
+            self.decay_reference[rows] = self.decay_clock.hours
+
+        # Columns are already up to date, so bypass the unit write-through
+        for cid, row, new_importance, new_count, timestamp in zip(
+                content_ids, rows.tolist(), importance.tolist(), access_count.tolist(),
+                last_access.tolist()):
+            unit_state = self._units[cid].__dict__
+            unit_state['importance'] = new_importance
+            unit_state['access_count'] = new_count
+            unit_state['last_access'] = timestamp
+            unit_state['decay_reference'] = float(self.decay_reference[row])
+
+    def current_importance(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Importance of the given rows at the present time.
+
+        With a decay clock attached (lazy decay) the stored importance is the
+        value at ``decay_reference`` and is decayed here in closed form;
+        otherwise the stored value is returned.
+        """
+        importance = self.importance[rows]
+        if self.decay_clock is None:
+            return importance
+        elapsed = np.maximum(self.decay_clock.hours - self.decay_reference[rows], 0.0)
+        return importance * np.exp(-self.effective_decay_rate[rows] * elapsed)
+
+    # ------------------------------------------------------------------
+    # Vectorized scoring
+    # ------------------------------------------------------------------
+
+    def similarities(self, query_semantic: np.ndarray,
+                     query_emotion: Optional[np.ndarray] = None,
+                     w_semantic: float = DEFAULT_W_SEMANTIC,
+                     w_emotion: float = DEFAULT_W_EMOTION,
+                     rows: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Similarity of one or more queries to every stored unit.
+
+        Args:
+            query_semantic: (d,) vector or (Q, d) matrix of query embeddings
+            query_emotion: matching emotion vector(s); a row of NaN (or None
+                for all queries) means "no emotion", which falls back to
+                semantic-only similarity just like ``memory_unit_score``
+            rows: Restrict scoring to these rows (default: all live rows)
+
+        Returns:
+            (rows, similarity) where similarity has shape (Q, len(rows))
+        """
+        query_semantic = np.atleast_2d(query_semantic)
+        if rows is None:
+            rows = self.live_rows() if self._units else np.empty(0, dtype=np.int64)
+        if not len(rows):
+            return rows, np.empty((len(query_semantic), 0), dtype=np.float64)
+
+        semantic = self.semantic[rows]
+        semantic_norm = self.semantic_norm[rows]
+        if query_emotion is None or self.emotion is None:
+            return rows, memory_similarity_matrix(
+                query_semantic, semantic, memory_semantic_norms=semantic_norm
+            )
+
+        query_emotion = np.atleast_2d(query_emotion)
+        query_has_emotion = ~np.isnan(query_emotion).any(axis=1)
+        row_has_emotion = self.emotion_valid[rows]
+
+        similarity = memory_similarity_matrix(
+            query_semantic, semantic,
+            np.where(query_has_emotion[:, None], query_emotion, 0.0), self.emotion[rows],
+            w_semantic, w_emotion,
+            memory_semantic_norms=semantic_norm,
+            memory_emotion_norms=self.emotion_norm[rows]
+        )
+        if not (query_has_emotion.all() and row_has_emotion.all()):
+            # Pairs without emotion on either side use semantic-only similarity
+            semantic_only = memory_similarity_matrix(
+                query_semantic, semantic, memory_semantic_norms=semantic_norm
+            )
+            both = query_has_emotion[:, None] & row_has_emotion[None, :]
+            similarity = np.where(both, similarity, semantic_only)
+        return rows, similarity
+
+    def weighted_scores(self, rows: np.ndarray, similarity: np.ndarray,
+                        current_time: Optional[float] = None) -> np.ndarray:
+        """Apply temporal decay and importance to similarities of the given rows"""
+        if current_time is None:
+            current_time = get_current_timestamp()
+        age_hours = (current_time - self.timestamp[rows]) / 3600.0
+        return apply_temporal_weighting(
+            similarity, age_hours, self.decay_rate[rows], self.current_importance(rows)
+        )
+
+    def score(self, query_semantic: np.ndarray,
+              query_emotion: Optional[np.ndarray] = None,
+              current_time: Optional[float] = None,
+              w_semantic: float = DEFAULT_W_SEMANTIC,
+              w_emotion: float = DEFAULT_W_EMOTION) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score a query against every stored unit.
+
+        Equivalent to ``unit.score_against(query_unit)`` for each unit, but
+        computed as one matrix-vector product over the columns.
+
+        Returns:
+            (rows, scores) for all live rows, in row order
+        """
+        rows, similarity = self.similarities(query_semantic, query_emotion,
+                                             w_semantic, w_emotion)
+        return rows, self.weighted_scores(rows, similarity[0], current_time)
+
+__all__ = ['ColumnarUnitStore', 'SYNCED_FIELDS']
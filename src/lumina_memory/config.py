@@ -5,7 +5,7 @@ import json
 import random
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import Optional
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,6 +24,19 @@ class LuminaConfig:
     stm_capacity: int = 1000
     ltm_capacity: int = 10000
     consolidation_threshold: float = 0.7
+    metadata_index_keys: Optional[List[str]] = None  # Metadata keys indexed for recall filters (None = all)
+    
+    # Vector index settings (FAISS, see vector_store.FAISSVectorStore)
+    faiss_index_type: str = "flat"  # flat, ivf_flat, ivf_pq, hnsw
+    faiss_nlist: int = 0  # IVF coarse clusters (0 = about 4 * sqrt(n) at training time)
+    faiss_train_threshold: int = 0  # Vectors before migrating off flat (0 = automatic)
+    faiss_pq_m: int = 16  # IVF-PQ sub-quantizers (must divide embedding_dim)
+    faiss_pq_nbits: int = 8  # Bits per IVF-PQ code
+    faiss_hnsw_m: int = 32  # HNSW links per node
+    faiss_ef_construction: int = 40  # HNSW build-time candidate list
+    faiss_nprobe: int = 8  # Default IVF lists probed per query
+    faiss_ef_search: int = 64  # Default HNSW search candidate list
+    vector_compaction_threshold: float = 0.2  # Deleted fraction that triggers index compaction
     
     # Model settings
     sentence_transformer_model: str = "all-MiniLM-L6-v2"
@@ -58,6 +71,9 @@ class LuminaConfig:
             "LUMINA_EMBEDDING_DIM": ("embedding_dim", int),
             "LUMINA_VECTOR_STORE": ("vector_store_type", str),
             "LUMINA_SIMILARITY_METRIC": ("similarity_metric", str),
+            "LUMINA_FAISS_INDEX": ("faiss_index_type", str),
+            "LUMINA_FAISS_NPROBE": ("faiss_nprobe", int),
+            "LUMINA_FAISS_EF_SEARCH": ("faiss_ef_search", int),
             "LUMINA_STM_CAPACITY": ("stm_capacity", int),
             "LUMINA_LTM_CAPACITY": ("ltm_capacity", int),
             "LUMINA_MODEL_NAME": ("sentence_transformer_model", str),
@@ -128,6 +144,15 @@ class LuminaConfig:
         if self.stm_capacity <= 0 or self.ltm_capacity <= 0:
             errors.append("memory capacities must be positive")
         
+        if self.faiss_index_type not in ["flat", "ivf_flat", "ivf_pq", "hnsw"]:
+            errors.append("faiss_index_type must be 'flat', 'ivf_flat', 'ivf_pq' or 'hnsw'")
+        
+        if self.faiss_index_type == "ivf_pq" and self.embedding_dim % self.faiss_pq_m:
+            errors.append("faiss_pq_m must divide embedding_dim")
+        
+        if not 0.0 <= self.vector_compaction_threshold < 1.0:
+            errors.append("vector_compaction_threshold must be in [0, 1)")
+        
         if errors:
             raise ValueError(f"Configuration validation failed: {'; '.join(errors)}")
         
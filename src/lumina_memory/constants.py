@@ -51,6 +51,7 @@ TAU = 2 * np.pi                 # Full circle constant: 6.283185 (circular convo
 # Numerical stability
 EPSILON = 1e-9                  # Numerical stability threshold
 NORMALIZATION_EPSILON = 1e-9    # Vector normalization threshold
+UNIT_NORM_TOLERANCE = 1e-4      # Allowed | |v| - 1 | for pre-normalized stored vectors
 
 # Coherence weights (from MemoryUnit.mathematical_coherence())
 COHERENCE_HRR_WEIGHT = 0.6      # HRR similarity weight
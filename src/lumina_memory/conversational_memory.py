@@ -25,6 +25,7 @@ License: MIT
 """
 
 import time
+import bisect
 import hashlib
 import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
@@ -121,7 +122,9 @@ class ConversationalMemoryManager:
     
     def __init__(self, config: UnifiedXPConfig):
         self.config = config
-        self.conversation_units: List[ConversationalMemoryUnit] = []
+        self.conversation_units: List[ConversationalMemoryUnit] = []  # Oldest first
+        self._unit_times: List[float] = []  # Parallel sorted timestamps for window queries
+        self._unit_times_source: Optional[List[ConversationalMemoryUnit]] = None  # List they describe
         self.session_start_time = time.time()
         self.turn_counter = 0
         self.crystallized_units: List[Dict[str, Any]] = []
@@ -185,7 +188,7 @@ class ConversationalMemoryManager:
                         speaker=speaker
                     )
                     
-                    self.conversation_units.append(unit)
+                    self._insert_unit(unit)
                     loaded_count += 1
                     context_summary.append(content[:30] + "...")
                     
@@ -233,7 +236,7 @@ class ConversationalMemoryManager:
             speaker=speaker
         )
         
-        self.conversation_units.append(unit)
+        self._insert_unit(unit)
         
         logger.debug(f"💭 Added conversational memory (turn {self.turn_counter})")
         logger.debug(f"   Content: {content[:50]}...")
@@ -249,6 +252,38 @@ class ConversationalMemoryManager:
         
         return unit
     
+    def _sorted_unit_times(self) -> List[float]:
+        """
+        Sorted timestamps parallel to conversation_units, re-derived when the
+        unit list was replaced (checked by identity) or resized from outside.
+        Timestamps edited in place are not detected; reassign the list after
+        editing them.
+        """
+        units = self.conversation_units
+        if self._unit_times_source is not units or len(self._unit_times) != len(units):
+            units.sort(key=lambda u: u.timestamp)
+            self._unit_times = [unit.timestamp for unit in units]
+            self._unit_times_source = units
+        return self._unit_times
+    
+    def _insert_unit(self, unit: ConversationalMemoryUnit):
+        """Insert in timestamp order (an append for live turns)"""
+        times = self._sorted_unit_times()
+        position = bisect.bisect_right(times, unit.timestamp)
+        times.insert(position, unit.timestamp)
+        self.conversation_units.insert(position, unit)
+    
+    def units_between(self, start: Optional[float] = None,
+                      end: Optional[float] = None) -> List[ConversationalMemoryUnit]:
+        """
+        Units with start <= timestamp <= end (either bound optional), oldest
+        first, e.g. units_between(self.session_start_time) for this session.
+        """
+        times = self._sorted_unit_times()
+        lo = 0 if start is None else bisect.bisect_left(times, start)
+        hi = len(times) if end is None else bisect.bisect_right(times, end)
+        return self.conversation_units[lo:hi]
+    
     def get_working_memory_context(self, max_units: int = 10, include_metadata: bool = False) -> str:
         """
         Get current working memory context for LLM prompt
@@ -266,7 +301,8 @@ class ConversationalMemoryManager:
             return "No previous conversational context."
         
         # Get most recent and most important units
-        recent_units = sorted(self.conversation_units, key=lambda u: u.timestamp, reverse=True)[:max_units//2]
+        self._sorted_unit_times()
+        recent_units = self.conversation_units[::-1][:max_units//2]
         important_units = sorted(self.conversation_units, key=lambda u: u.get_effective_importance(), reverse=True)[:max_units//2]
         
         # Combine and deduplicate by content
@@ -298,7 +334,8 @@ class ConversationalMemoryManager:
         
         if not important_units:
             # Fall back to recent units
-            important_units = sorted(self.conversation_units, key=lambda u: u.timestamp, reverse=True)[:3]
+            self._sorted_unit_times()
+            important_units = self.conversation_units[::-1][:3]
         
         summary_parts = []
         total_length = 0
@@ -399,19 +436,22 @@ class ConversationalMemoryManager:
         
         # Remove units that have decayed below threshold
         min_effective_importance = 0.1
-        self.conversation_units = [
+        self._sorted_unit_times()
+        kept = [
             unit for unit in self.conversation_units 
             if unit.get_effective_importance() > min_effective_importance
         ]
         
         # Limit total units (keep most recent and most important)
-        if len(self.conversation_units) > self.max_conversation_units:
-            # Sort by combination of recency and importance
-            self.conversation_units.sort(
+        if len(kept) > self.max_conversation_units:
+            # Rank by combination of recency and importance, then restore time order
+            kept = sorted(
+                kept,
                 key=lambda u: (u.timestamp * 0.7 + u.get_effective_importance() * 0.3), 
                 reverse=True
-            )
-            self.conversation_units = self.conversation_units[:self.max_conversation_units]
+            )[:self.max_conversation_units]
+            kept.sort(key=lambda u: u.timestamp)
+        self.conversation_units = kept
         
         cleaned_count = initial_count - len(self.conversation_units)
         self.last_cleanup = time.time()
@@ -480,6 +520,7 @@ class ConversationalMemoryManager:
                     speaker=unit_data.get("speaker", "user")
                 )
                 self.conversation_units.append(unit)
+            self._sorted_unit_times()
             
             logger.info(f"✅ Loaded conversational memory state: {len(self.conversation_units)} units")
             
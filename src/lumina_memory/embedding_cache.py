@@ -0,0 +1,263 @@
+"""
+Embedding Cache - Content-Addressed, Two-Tier Embedding Storage
+===============================================================
+
+Embedding the same text twice with the same model always yields the same
+vector, so every repeated ingest, re-ingested conversation log or repeated
+query string is wasted model time. ``EmbeddingCache`` stores embeddings keyed
+by (model name, hash of the normalized text):
+
+- an in-memory LRU tier bounded by ``max_entries``
+- an optional on-disk tier (append-only float32 files read through
+  ``np.memmap``) that survives restarts
+
+Caches are shared per disk directory through ``get_shared_embedding_cache``
+so XPEnvironment (and the environments built on it, such as the emotion
+engine) and the MemorySystem embedding providers reuse each other's work.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10000
+CACHE_DTYPE = np.float32
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys (Unicode NFC, collapsed whitespace)"""
+    return " ".join(unicodedata.normalize("NFC", str(text)).split())
+
+
+def embedding_cache_key(model_name: str, text: str) -> str:
+    """Cache key: hash of (model name, normalized text)"""
+    payload = f"{model_name}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class _DiskTier:
+    """
+    Append-only on-disk embedding store.
+
+    One ``vectors_<dim>.f32`` file per embedding dimension plus an
+    ``index.tsv`` of ``key<TAB>dim<TAB>row`` lines. Reads go through a
+    memory map that is re-opened when the file has grown.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.tsv"
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._rows: Dict[int, int] = {}
+        self._maps: Dict[int, np.memmap] = {}
+        self._load_index()
+
+    def _vectors_path(self, dim: int) -> Path:
+        return self.directory / f"vectors_{dim}.f32"
+
+    def _load_index(self):
+        if self.index_path.exists():
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 3:
+                        continue  # Torn write at the end of the file
+                    key, dim, row = parts[0], int(parts[1]), int(parts[2])
+                    self._index[key] = (dim, row)
+
+        # Row counts come from the vector files; index entries pointing past
+        # the end (vector write never completed) are dropped
+        for path in self.directory.glob("vectors_*.f32"):
+            dim = int(path.stem.split("_")[1])
+            row_bytes = dim * np.dtype(CACHE_DTYPE).itemsize
+            self._rows[dim] = path.stat().st_size // row_bytes
+            if path.stat().st_size != self._rows[dim] * row_bytes:
+                with open(path, "r+b") as f:  # Drop a torn trailing vector
+                    f.truncate(self._rows[dim] * row_bytes)
+        self._index = {key: (dim, row) for key, (dim, row) in self._index.items()
+                       if row < self._rows.get(dim, 0)}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+        dim, row = entry
+        vectors = self._maps.get(dim)
+        if vectors is None or row >= len(vectors):
+            vectors = np.memmap(self._vectors_path(dim), dtype=CACHE_DTYPE, mode="r",
+                                shape=(self._rows[dim], dim))
+            self._maps[dim] = vectors
+        return np.array(vectors[row])
+
+    def put(self, key: str, vector: np.ndarray):
+        if key in self._index:
+            return
+        vector = np.ascontiguousarray(vector, dtype=CACHE_DTYPE).reshape(-1)
+        dim = len(vector)
+        row = self._rows.get(dim, 0)
+        # Vector first, then the index line that points at it
+        with open(self._vectors_path(dim), "ab") as f:
+            f.write(vector.tobytes())
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(f"{key}\t{dim}\t{row}\n")
+        self._rows[dim] = row + 1
+        self._index[key] = (dim, row)
+
+
+class EmbeddingCache:
+    """
+    Two-tier (LRU memory + optional memory-mapped disk) embedding cache.
+
+    Args:
+        max_entries: Capacity of the in-memory LRU tier
+        disk_dir: Directory for the persistent tier (None = memory only)
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, disk_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._disk = _DiskTier(disk_dir) if disk_dir else None
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        """Cached embedding (read-only array) or None"""
+        return self._get_key(embedding_cache_key(model_name, text))
+
+    def put(self, model_name: str, text: str, vector: np.ndarray):
+        """Store an embedding in both tiers"""
+        self._put_key(embedding_cache_key(model_name, text), vector)
+
+    def encode(self, model_name: str, texts: Sequence[str],
+               encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Embeddings for ``texts``, computing only the misses.
+
+        All misses are passed to ``encode_fn`` in a single call (duplicates
+        within the batch are embedded once).
+
+        Returns:
+            (len(texts), dim) array in input order
+        """
+        keys = [embedding_cache_key(model_name, text) for text in texts]
+        vectors: List[Optional[np.ndarray]] = [self._get_key(key) for key in keys]
+
+        missing: Dict[str, List[int]] = {}
+        for i, (key, vector) in enumerate(zip(keys, vectors)):
+            if vector is None:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            first_positions = [positions[0] for positions in missing.values()]
+            computed = np.atleast_2d(np.asarray(encode_fn([texts[i] for i in first_positions])))
+            for (key, positions), vector in zip(missing.items(), computed):
+                stored = self._put_key(key, vector)
+                for i in positions:
+                    vectors[i] = stored
+
+        if not vectors:
+            return np.empty((0, 0), dtype=CACHE_DTYPE)
+        return np.stack(vectors)
+
+    def _get_key(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector
+            if self._disk is not None:
+                vector = self._disk.get(key)
+                if vector is not None:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return self._remember(key, vector)
+            self.misses += 1
+            return None
+
+    def _put_key(self, key: str, vector: np.ndarray) -> np.ndarray:
+        with self._lock:
+            if self._disk is not None:
+                self._disk.put(key, vector)
+            return self._remember(key, vector)
+
+    def _remember(self, key: str, vector: np.ndarray) -> np.ndarray:
+        vector = np.array(vector, dtype=CACHE_DTYPE).reshape(-1)
+        vector.flags.writeable = False
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+        return vector
+
+    def clear(self):
+        """Drop the in-memory tier and reset statistics (disk tier is kept)"""
+        with self._lock:
+            self._memory.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss statistics"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'max_entries': self.max_entries,
+            'disk_entries': len(self._disk) if self._disk is not None else 0,
+        }
+
+
+_shared_caches: Dict[Optional[str], EmbeddingCache] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_embedding_cache(max_entries: int = DEFAULT_MAX_ENTRIES,
+                               disk_dir: Optional[str] = None) -> EmbeddingCache:
+    """
+    Process-wide cache for a disk directory (None = memory-only cache).
+
+    The first call for a directory creates the cache; later calls return the
+    same instance so every component embedding with the same model shares it.
+    A later caller asking for a larger ``max_entries`` grows the shared
+    cache; it never shrinks under an earlier caller.
+    """
+    key = str(Path(disk_dir).resolve()) if disk_dir else None
+    with _shared_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(max_entries, disk_dir)
+            _shared_caches[key] = cache
+        elif max_entries > cache.max_entries:
+            logger.debug(f"Growing shared embedding cache from {cache.max_entries} "
+                         f"to {max_entries} entries")
+            cache.max_entries = max_entries
+        return cache
+
+
+__all__ = ['EmbeddingCache', 'get_shared_embedding_cache', 'embedding_cache_key', 'normalize_text']
@@ -2,11 +2,12 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import List, Optional, Union
 
 import numpy as np
 
 from .core import EmbeddingError
+from .embedding_cache import EmbeddingCache, get_shared_embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +34,18 @@ class EmbeddingProvider(ABC):
 class SentenceTransformerEmbedding(EmbeddingProvider):
     """Sentence Transformers embedding provider."""
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2", device: str = "cpu"):
-        """Initialize with model name and device."""
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", device: str = "cpu",
+                 cache: Optional[EmbeddingCache] = None, use_cache: bool = True):
+        """Initialize with model name and device.
+        
+        Embeddings go through ``cache`` (default: the process-wide shared
+        embedding cache) unless ``use_cache`` is False.
+        """
         self.model_name = model_name
         self.device = device
         self.model = None
         self._dimension = None
+        self.cache = (cache or get_shared_embedding_cache()) if use_cache else None
         
         self._load_model()
         logger.info(f"Initializing embedding provider: {model_name} on {device}")
@@ -80,7 +87,13 @@ class SentenceTransformerEmbedding(EmbeddingProvider):
                     logger.warning(f"Empty text at index {i}, using placeholder")
                     texts[i] = "[EMPTY]"
             
-            embeddings = self.model.encode(texts, convert_to_numpy=True)
+            if self.cache is not None:
+                embeddings = self.cache.encode(
+                    self.model_name, texts,
+                    lambda misses: self.model.encode(misses, convert_to_numpy=True)
+                )
+            else:
+                embeddings = self.model.encode(texts, convert_to_numpy=True)
             
             # Ensure 2D array
             if embeddings.ndim == 1:
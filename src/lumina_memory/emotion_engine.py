@@ -6,6 +6,7 @@ Transforms XPUnit recall into authentic lived experiences with mood, ethics, and
 
 import json
 import time
+import heapq
 import numpy as np
 import urllib.request as _ur
 from typing import Dict, Any, Optional, List, Tuple
@@ -13,6 +14,7 @@ from dataclasses import dataclass, field
 
 from .advanced_xpunit import AdvancedXPUnit, AffectState
 from .advanced_xp_environment import AdvancedXPEnvironment
+from .lexical_index import tokenize
 
 
 @dataclass
@@ -411,30 +413,30 @@ Respond authentically, reflecting your current emotional and consciousness state
         return {"ok": True, "mode": "external", "text": reply, "controls": controls}
     
     def search_memory_for_keywords(self, query_text: str, top_k: int = 5) -> List[Tuple[str, str, float]]:
-        """Search stored memories for relevant information based on keywords"""
-        query_words = set(query_text.lower().split())
+        """
+        Search stored memories for relevant information based on keywords.
+        
+        Candidates come from the XPUnit lexical index (no stored text is
+        re-tokenized). Results are sorted by the relevance they report, the
+        fraction of query keywords a memory contains; BM25 breaks ties.
+        """
+        query_words = set(tokenize(query_text))
         
         # Remove common words
         stop_words = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by", "what", "how", "when", "where", "why", "who", "did", "do", "does", "is", "are", "was", "were", "i", "you", "me", "my", "your", "tell", "told", "about", "that", "this"}
         query_words = query_words - stop_words
         
-        matches = []
-        for xpunit_id, xpunit in self.xpunits.items():
-            # Skip narrative XPUnits to avoid circular references
-            if "_narrative_" in xpunit_id:
-                continue
-                
-            content_words = set(xpunit.content.lower().split())
-            
-            # Calculate relevance score
-            common_words = query_words.intersection(content_words)
-            if common_words:
-                relevance = len(common_words) / len(query_words) if query_words else 0
-                matches.append((xpunit_id, xpunit.content, relevance))
-        
-        # Sort by relevance and return top matches
-        matches.sort(key=lambda x: x[2], reverse=True)
-        return matches[:top_k]
+        if not query_words:
+            return []
+        
+        index = self.xpunit_lexical_index
+        scores = index.scores(" ".join(sorted(query_words)))
+        # Skip narrative XPUnits to avoid circular references
+        candidates = ((len(index.matched_terms(xpunit_id, query_words)) / len(query_words), bm25, xpunit_id)
+                      for xpunit_id, bm25 in scores.items() if "_narrative_" not in xpunit_id)
+        ranked = heapq.nlargest(top_k, candidates, key=lambda item: item[:2])
+        return [(xpunit_id, self.xpunits[xpunit_id].content, relevance)
+                for relevance, _, xpunit_id in ranked]
 
     def extract_relevant_details(self, content: str, query: str) -> str:
         """Extract relevant details from stored content based on query"""
@@ -0,0 +1,169 @@
+"""
+Emotion Index - Fast Mood-Congruent Lookup over 6-D Emotional States
+====================================================================
+
+``EmotionIndex`` answers "top-k units whose emotional state is more similar
+than tau to this emotion" without building an EmotionalState per unit. It
+keeps a contiguous float32 matrix of L2-normalized emotional states, so a
+query is one (n, 6) matrix-vector product and a threshold prefilter; the
+survivors are rescored exactly (float64, row-independent einsum) and
+partially sorted. Similarities follow ``EmotionalState.similarity``:
+
+    dot(q, m) / (|q| * |m| + 1e-8)
+
+Emotion vectors are interpreted like ``XPUnit.get_emotional_state`` (first
+six components; shorter or missing vectors are the neutral state).
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .constants import VECTOR_DTYPE
+from .emotional_kernels import EMOTION_DIMS, as_emotion_vector, emotion_matrix
+from .emotional_weighting import EmotionalState
+from .topk import top_k_indices
+
+# EmotionalState.similarity denominator guard
+SIMILARITY_EPSILON = 1e-8
+# Slack for float32 rounding in the cosine prefilter
+PREFILTER_MARGIN = 1e-5
+DEFAULT_EMOTIONAL_SIMILARITY_THRESHOLD = 0.3
+
+
+class EmotionIndex:
+    """
+    Incrementally maintained index over emotional states, keyed by content ID.
+
+    Args:
+        initial_capacity: Initial number of rows (grows by doubling)
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        capacity = max(1, initial_capacity)
+        self._directions = np.zeros((capacity, EMOTION_DIMS), dtype=VECTOR_DTYPE)
+        self._states = np.zeros((capacity, EMOTION_DIMS), dtype=np.float64)
+        self._norms = np.zeros(capacity, dtype=np.float64)
+        self._live = np.zeros(capacity, dtype=bool)
+        self._row_ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    def update(self, item_id: str, emotion_vector: Optional[np.ndarray]):
+        """Insert or replace the emotional state of an item"""
+        state = emotion_matrix([emotion_vector])[0]
+        row = self._rows.get(item_id)
+        if row is None:
+            row = self._allocate_row()
+            self._rows[item_id] = row
+            self._row_ids[row] = item_id
+        norm = float(np.linalg.norm(state))
+        self._directions[row] = state / norm if norm > 0 else 0.0
+        self._states[row] = state
+        self._norms[row] = norm
+        self._live[row] = True
+
+    def remove(self, item_id: str) -> bool:
+        """Remove an item; returns False if it was not indexed"""
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return False
+        self._row_ids[row] = None
+        self._directions[row] = 0.0
+        self._states[row] = 0.0
+        self._norms[row] = 0.0
+        self._live[row] = False
+        self._free_rows.append(row)
+        return True
+
+    def clear(self):
+        self._rows.clear()
+        self._row_ids.clear()
+        self._free_rows.clear()
+        self._live[:] = False
+
+    def search(self, emotion: Union[EmotionalState, np.ndarray], k: Optional[int] = 10,
+               threshold: float = DEFAULT_EMOTIONAL_SIMILARITY_THRESHOLD) -> List[Tuple[str, float]]:
+        """
+        Items with emotional similarity > threshold, best first.
+
+        Args:
+            emotion: Query emotional state (EmotionalState or 6-vector)
+            k: Maximum number of results (None = all matches)
+            threshold: Strict lower bound on similarity
+
+        Returns:
+            List of (item_id, similarity)
+        """
+        n = len(self._row_ids)
+        if not self._rows or k == 0:
+            return []
+        query = as_emotion_vector(emotion)
+        query_norm = float(np.linalg.norm(query))
+        direction = (query / query_norm if query_norm > 0 else query).astype(VECTOR_DTYPE)
+
+        # Prefilter on float32 cosine: for positive cosines similarity <= cosine,
+        # so no match is lost (negative thresholds keep every live row)
+        if threshold < 0:
+            rows = np.flatnonzero(self._live[:n])
+            similarities = self._similarities(rows, query, query_norm)
+        else:
+            cosines = self._directions[:n] @ direction
+            candidates = self._live[:n] & (cosines > threshold - PREFILTER_MARGIN)
+            rows = np.flatnonzero(candidates)
+            similarities = None
+            if k is not None and len(rows) > k:
+                # Shortlist rows within rounding error of the k-th best cosine;
+                # valid unless the norm guard pulled the k-th similarity lower
+                scores = np.where(candidates, cosines, -np.inf)
+                kth_cosine = scores[np.argpartition(scores, n - k)[n - k]]
+                shortlist = np.flatnonzero(scores >= kth_cosine - PREFILTER_MARGIN)
+                shortlist_similarities = self._similarities(shortlist, query, query_norm)
+                if np.partition(shortlist_similarities, len(shortlist) - k)[len(shortlist) - k] \
+                        >= kth_cosine - PREFILTER_MARGIN / 2:
+                    rows, similarities = shortlist, shortlist_similarities
+            if similarities is None:
+                similarities = self._similarities(rows, query, query_norm)
+        keep = similarities > threshold
+        rows, similarities = rows[keep], similarities[keep]
+
+        best = top_k_indices(similarities, k)
+        return [(self._row_ids[row], float(similarity))
+                for row, similarity in zip(rows[best].tolist(), similarities[best].tolist())]
+
+    def _similarities(self, rows: np.ndarray, query: np.ndarray, query_norm: float) -> np.ndarray:
+        """Exact EmotionalState.similarity of the given rows (row-independent einsum)"""
+        dots = np.einsum('ij,j->i', self._states[rows], query)
+        return dots / (query_norm * self._norms[rows] + SIMILARITY_EPSILON)
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        row = len(self._row_ids)
+        if row == len(self._directions):
+            self._grow(2 * len(self._directions))
+        self._row_ids.append(None)
+        return row
+
+    def _grow(self, capacity: int):
+        def grown(column: np.ndarray) -> np.ndarray:
+            new_column = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            new_column[:len(column)] = column
+            return new_column
+
+        self._directions = grown(self._directions)
+        self._states = grown(self._states)
+        self._norms = grown(self._norms)
+        self._live = grown(self._live)
+
+
+__all__ = ['EmotionIndex', 'DEFAULT_EMOTIONAL_SIMILARITY_THRESHOLD']
@@ -0,0 +1,149 @@
+"""
+Emotional Kernels - Vectorized Emotional Weighting Formulas
+===========================================================
+
+Array versions of the XPUnit emotional formulas (retrieval boost, emotional
+similarity boost, importance boost and decay resistance). Each function takes
+an (n, 6) emotion matrix in EmotionalState order
+
+    [valence, arousal, dominance, joy, fear, curiosity]
+
+and returns one value per row, so re-ranking or decay over many units is a
+handful of numpy operations instead of one EmotionalState per unit. The
+XPUnit methods delegate to these functions with a single row.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from .emotional_weighting import EmotionalState
+
+EMOTION_DIMS = 6
+VALENCE, AROUSAL, DOMINANCE, JOY, FEAR, CURIOSITY = range(EMOTION_DIMS)
+
+# Emotion of units without a (full) emotion vector
+NEUTRAL_EMOTION = EmotionalState().to_vector()
+
+ArrayLike = Union[np.ndarray, Sequence[float], float]
+
+
+def emotion_matrix(emotion_vectors: Sequence[Optional[np.ndarray]]) -> np.ndarray:
+    """
+    (n, 6) float64 matrix of emotional states, one row per emotion vector.
+
+    Mirrors XPUnit.get_emotional_state: the first six components are used and
+    missing or shorter vectors map to the neutral EmotionalState.
+    """
+    matrix = np.tile(NEUTRAL_EMOTION, (len(emotion_vectors), 1))
+    for i, vector in enumerate(emotion_vectors):
+        if vector is not None and len(vector) >= EMOTION_DIMS:
+            matrix[i] = vector[:EMOTION_DIMS]
+    return matrix
+
+
+def as_emotion_vector(emotion: Union[EmotionalState, np.ndarray, None]) -> Optional[np.ndarray]:
+    """Query emotion as a float64 6-vector (None stays None)"""
+    if emotion is None:
+        return None
+    if isinstance(emotion, EmotionalState):
+        return emotion.to_vector()
+    return np.asarray(emotion, dtype=np.float64)[:EMOTION_DIMS]
+
+
+def _intensity(emotions: np.ndarray) -> np.ndarray:
+    return np.sqrt(np.einsum('ij,ij->i', emotions, emotions))
+
+
+def similarity_boosts(emotions: np.ndarray,
+                      query_emotion: Union[EmotionalState, np.ndarray]) -> np.ndarray:
+    """Boost from emotional similarity between a query and each memory (0 to 0.4)"""
+    emotions = np.atleast_2d(emotions)
+    query = as_emotion_vector(query_emotion)
+
+    # Valence and arousal similarity (same emotional direction / activation)
+    valence_boost = (1.0 - np.abs(query[VALENCE] - emotions[:, VALENCE])) * 0.2
+    arousal_boost = (1.0 - np.abs(query[AROUSAL] - emotions[:, AROUSAL])) * 0.1
+
+    # Specific emotion matching
+    fear_match = np.minimum(query[FEAR], emotions[:, FEAR]) * 0.3
+    curiosity_match = np.minimum(query[CURIOSITY], emotions[:, CURIOSITY]) * 0.2
+    joy_match = np.minimum(query[JOY], emotions[:, JOY]) * 0.15
+
+    total = valence_boost + arousal_boost + fear_match + curiosity_match + joy_match
+    return np.clip(total, 0.0, 0.4)
+
+
+def retrieval_boosts(emotions: np.ndarray, access_counts: ArrayLike = 0,
+                     query_emotion: Union[EmotionalState, np.ndarray, None] = None) -> np.ndarray:
+    """
+    Retrieval boost of each memory (0 to 1).
+
+    Strong emotions make memories easier to recall; emotional similarity to
+    the query and frequent access add further boosts.
+    """
+    emotions = np.atleast_2d(emotions)
+    access_counts = np.broadcast_to(np.asarray(access_counts, dtype=np.float64), len(emotions))
+
+    total = (_intensity(emotions) * 0.3                 # Base boost from intensity
+             + np.abs(emotions[:, VALENCE]) * 0.2       # Strong positive/negative
+             + emotions[:, FEAR] * 0.4                  # Fear memories very accessible
+             + emotions[:, CURIOSITY] * 0.25            # Curiosity maintains access
+             + emotions[:, AROUSAL] * 0.15)             # High arousal = memorable
+
+    if query_emotion is not None:
+        total = total + similarity_boosts(emotions, query_emotion)
+
+    # Access pattern boost (up to 0.3 for frequently accessed memories)
+    total = total + np.where(access_counts > 1, np.minimum(access_counts * 0.05, 0.3), 0.0)
+    return np.clip(total, 0.0, 1.0)
+
+
+def importance_boosts(emotions: np.ndarray, access_counts: ArrayLike = 0) -> np.ndarray:
+    """Importance boost from emotional content (0 to 1.5)"""
+    emotions = np.atleast_2d(emotions)
+    access_counts = np.broadcast_to(np.asarray(access_counts, dtype=np.float64), len(emotions))
+
+    total = (_intensity(emotions) * 0.4                 # Base boost from intensity
+             + np.abs(emotions[:, VALENCE]) * 0.3       # Distance from neutral
+             + emotions[:, FEAR] * 0.5                  # Fear memories critically important
+             + emotions[:, CURIOSITY] * 0.3             # Curiosity drives learning
+             + emotions[:, AROUSAL] * 0.2               # High arousal = significant
+             + emotions[:, JOY] * 0.25)                 # Positive peaks
+    # (EmotionalState has no sadness dimension, so its 0.25 term is always 0)
+
+    # Frequently accessed emotional memories are very important (up to 1.5x)
+    access_multiplier = np.where(access_counts > 2, 1.0 + np.minimum(access_counts, 10) * 0.05, 1.0)
+    return np.clip(total * access_multiplier, 0.0, 1.5)
+
+
+def decay_resistances(emotions: np.ndarray, age_hours: ArrayLike = 0.0) -> np.ndarray:
+    """
+    Decay resistance multiplier of each memory (1x to 3x).
+
+    Deviation from emotional neutral increases persistence; after one week
+    strongly fearful or joyful memories resist decay further.
+    """
+    emotions = np.atleast_2d(emotions)
+    age_hours = np.broadcast_to(np.asarray(age_hours, dtype=np.float64), len(emotions))
+
+    total = ((1.0 + _intensity(emotions) * 0.4)               # Strong emotions resist decay
+             * (1.0 + np.abs(emotions[:, VALENCE]) * 0.3)     # Valence deviation bonus
+             * (1.0 + emotions[:, FEAR] * 0.5)                # Fear memories very persistent
+             * (1.0 + emotions[:, CURIOSITY] * 0.3)           # Curiosity maintains access
+             * (1.0 + emotions[:, AROUSAL] * 0.2))            # High arousal = memorable
+
+    # Time-dependent effects: some emotions strengthen over time
+    old = age_hours > 168
+    total = np.where(old & (emotions[:, FEAR] > 0.7), total * 1.2,
+                     np.where(old & (emotions[:, JOY] > 0.8), total * 1.1, total))
+    return np.clip(total, 1.0, 3.0)
+
+
+__all__ = [
+    'emotion_matrix', 'as_emotion_vector', 'similarity_boosts', 'retrieval_boosts',
+    'importance_boosts', 'decay_resistances', 'NEUTRAL_EMOTION'
+]
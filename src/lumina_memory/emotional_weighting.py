@@ -22,6 +22,7 @@ from dataclasses import dataclass
 from enum import Enum
 import time
 import re
+import bisect
 
 logger = logging.getLogger(__name__)
 
@@ -308,22 +309,27 @@ class EmotionalMemoryWeighter:
     
     def __init__(self, analyzer: EmotionalAnalyzer = None):
         self.analyzer = analyzer or EmotionalAnalyzer()
-        self.emotional_history = []
+        self.emotional_history = []  # Kept in timestamp order
+        self._history_times: List[float] = []  # Parallel sorted timestamps for window queries
+        self._history_times_source: Optional[List[Dict[str, Any]]] = None  # List they describe
         self.current_emotional_state = EmotionalState()
         self.emotional_momentum = EmotionalState()  # Emotional inertia
     
-    def calculate_emotional_importance(self, content: str, metadata: Dict = None) -> float:
+    def calculate_emotional_importance(self, content: str, metadata: Dict = None,
+                                       emotion: Optional[EmotionalState] = None) -> float:
         """
         Calculate emotional importance multiplier for memory.
         
         Args:
             content: Memory content
             metadata: Additional metadata
+            emotion: Already analyzed emotion of content (skips re-analysis)
             
         Returns:
             Importance multiplier (0.1 to 3.0)
         """
-        emotion = self.analyzer.analyze_text(content)
+        if emotion is None:
+            emotion = self.analyzer.analyze_text(content)
         
         # Base importance from emotional intensity
         intensity = emotion.intensity()
@@ -430,8 +436,11 @@ class EmotionalMemoryWeighter:
         momentum_vector = new_vector - current_vector
         self.emotional_momentum = EmotionalState.from_vector(momentum_vector * 0.5)
         
-        # Add to history
-        self.emotional_history.append({
+        # Add to history (an append unless the timestamp is out of order)
+        times = self._sorted_history_times()
+        position = bisect.bisect_right(times, timestamp)
+        times.insert(position, timestamp)
+        self.emotional_history.insert(position, {
             'timestamp': timestamp,
             'emotion': new_emotion,
             'current_state': self.current_emotional_state,
@@ -441,6 +450,22 @@ class EmotionalMemoryWeighter:
         # Keep history manageable
         if len(self.emotional_history) > 1000:
             self.emotional_history = self.emotional_history[-800:]
+            self._history_times = self._history_times[-800:]
+            self._history_times_source = self.emotional_history
+    
+    def _sorted_history_times(self) -> List[float]:
+        """
+        Sorted timestamps parallel to emotional_history, re-derived when the
+        history list was replaced (checked by identity) or resized from
+        outside. Timestamps edited in place are not detected; reassign the
+        list after editing them.
+        """
+        history = self.emotional_history
+        if self._history_times_source is not history or len(self._history_times) != len(history):
+            history.sort(key=lambda entry: entry['timestamp'])
+            self._history_times = [entry['timestamp'] for entry in history]
+            self._history_times_source = history
+        return self._history_times
     
     def get_emotional_context(self, lookback_hours: float = 24.0) -> Dict[str, Any]:
         """
@@ -455,10 +480,9 @@ class EmotionalMemoryWeighter:
         current_time = time.time()
         cutoff_time = current_time - (lookback_hours * 3600)
         
-        recent_emotions = [
-            entry for entry in self.emotional_history
-            if entry['timestamp'] >= cutoff_time
-        ]
+        # Binary search for the window start instead of scanning the history
+        start = bisect.bisect_left(self._sorted_history_times(), cutoff_time)
+        recent_emotions = self.emotional_history[start:]
         
         if not recent_emotions:
             return {
@@ -397,18 +397,21 @@ class EnhancedEmotionalMemoryWeighter(EmotionalMemoryWeighter):
             'sadness': 1.1    # Sadness has moderate persistence
         }
     
-    def calculate_enhanced_emotional_importance(self, content: str, metadata: Dict = None) -> float:
+    def calculate_enhanced_emotional_importance(self, content: str, metadata: Dict = None,
+                                                emotion: Optional[EmotionalState] = None) -> float:
         """
         Calculate emotional importance with enhanced analysis
         
         Args:
             content: Memory content
             metadata: Additional metadata
+            emotion: Already analyzed emotion of content (skips re-analysis)
             
         Returns:
             Enhanced importance multiplier (0.1 to 4.0)
         """
-        emotion = self.analyzer.analyze_text(content)
+        if emotion is None:
+            emotion = self.analyzer.analyze_text(content)
         
         # Base importance from emotional intensity
         intensity = emotion.intensity()
@@ -374,11 +374,11 @@ class EnhancedXPEnvironment:
         self.total_queries += 1
         
         # Query holographic memory
-        capsule_matches = self.holographic_memory.compositional_query(query_bindings)
+        capsule_matches = self.holographic_memory.compositional_query(query_bindings, top_k=top_k)
         
         # Map back to XPUnits
         xpunit_matches = []
-        for capsule, similarity in capsule_matches[:top_k]:
+        for capsule, similarity in capsule_matches:
             # Find XPUnit with matching capsule
             for xpunit in self.xpunits.values():
                 if xpunit.memory_capsule is capsule:
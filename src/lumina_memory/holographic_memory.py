@@ -35,6 +35,7 @@ from .constants import (
     DEFAULT_DECAY_RATE, DEFAULT_IMPORTANCE,
     HIGH_SIMILARITY_THRESHOLD, MEDIUM_SIMILARITY_THRESHOLD
 )
+from .topk import top_k_stream
 
 # =============================================================================
 # CORE HRR OPERATIONS - FFT-BASED BINDING/UNBINDING
@@ -99,6 +100,14 @@ def cosine_similarity(x: np.ndarray, y: np.ndarray) -> float:
         
     return float(np.dot(x, y) / (norm_x * norm_y))
 
+def cosine_similarity_normalized(x: np.ndarray, y: np.ndarray) -> float:
+    """
+    Cosine similarity of vectors already passed through normalize_vector
+    
+    Unit (or zero) vectors make the cosine a single dot product.
+    """
+    return float(np.dot(x, y))
+
 # =============================================================================
 # ROLE AND SYMBOL SPACES
 # =============================================================================
@@ -191,14 +200,14 @@ class SymbolSpace:
         
     def find_nearest_symbol(self, query_vector: np.ndarray, top_k: int = 5) -> List[Tuple[str, float]]:
         """Find nearest symbols to query vector"""
-        similarities = []
-        
-        for name, symbol_vector in self.symbols.items():
-            sim = cosine_similarity(query_vector, symbol_vector)
-            similarities.append((name, sim))
-            
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:top_k]
+        # Symbols are stored normalized, so one normalized query makes every
+        # cosine a dot product
+        query_vector = normalize_vector(query_vector)
+        similarities = (
+            (name, cosine_similarity_normalized(query_vector, symbol_vector))
+            for name, symbol_vector in self.symbols.items()
+        )
+        return top_k_stream(similarities, top_k)
         
     def list_symbols(self) -> List[str]:
         """List all available symbol names"""
@@ -482,7 +491,8 @@ class HolographicAssociativeMemory:
         return self.symbol_space.find_nearest_symbol(query_vector, top_k)
         
     def compositional_query(self, query_bindings: Dict[str, str],
-                           current_time: Optional[float] = None) -> List[Tuple[MemoryCapsule, float]]:
+                           current_time: Optional[float] = None,
+                           top_k: Optional[int] = None) -> List[Tuple[MemoryCapsule, float]]:
         """
         Compositional query: bind multiple known roles and find matching capsules
         q = r_where ⊗ s_lab ⊕ r_when ⊗ s_yesterday
@@ -490,9 +500,10 @@ class HolographicAssociativeMemory:
         Args:
             query_bindings: Dict of role_name -> symbol_name
             current_time: Current timestamp
+            top_k: Number of matches to return (None = all capsules)
             
         Returns:
-            List of (capsule, similarity_score) tuples
+            List of (capsule, similarity_score) tuples, best first
         """
         # Build query vector
         query_accumulator = np.zeros(self.dimension, dtype=VECTOR_DTYPE)
@@ -508,14 +519,13 @@ class HolographicAssociativeMemory:
         query_vector = normalize_vector(query_accumulator)
         
         # Find matching capsules
-        matches = []
-        for capsule in self.capsules:
-            similarity = cosine_similarity(query_vector, capsule.vector)
-            matches.append((capsule, similarity))
-            
-        # Sort by similarity
-        matches.sort(key=lambda x: x[1], reverse=True)
-        return matches
+        matches = (
+            (capsule, cosine_similarity_normalized(query_vector, capsule.vector))
+            for capsule in self.capsules
+        )
+        
+        # Select best matches (bounded heap when top_k is given)
+        return top_k_stream(matches, top_k)
         
     def get_capacity_stats(self) -> Dict[str, Any]:
         """Get capacity and performance statistics"""
@@ -616,6 +626,7 @@ def run_capacity_test(dimensions: List[int] = [256, 512, 1024],
 __all__ = [
     # Core operations
     'circular_convolution', 'circular_correlation', 'normalize_vector', 'cosine_similarity',
+    'cosine_similarity_normalized',
     
     # Spaces
     'RoleSpace', 'SymbolSpace',
@@ -0,0 +1,79 @@
+"""
+Lazy Imports - Deferred Submodules and Background Warm-Up
+=========================================================
+
+Importing the kernel used to pull in every emotion analysis module, and
+constructing it loaded the optional NLP stacks (TextBlob, VADER, NRCLex,
+transformers, spaCy) three times over before the first memory was stored.
+Short-lived processes (the JSON-RPC engine, CLI tools, tests) paid for
+models they never used.
+
+- ``lazy_attributes`` builds a module-level ``__getattr__`` (PEP 562) that
+  imports the submodule defining a name on first access and caches the
+  value in the module, so later lookups are plain global reads.
+- ``start_warmup`` runs initializers on a daemon thread, for long-running
+  processes that want models loaded before the first request without
+  blocking startup. Initializers must be idempotent and thread-safe, since
+  the foreground may reach them first.
+
+``scripts/benchmark_startup.py`` measures import and kernel construction
+time against a budget.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+import importlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, MutableMapping
+
+logger = logging.getLogger(__name__)
+
+
+def lazy_attributes(module_globals: MutableMapping[str, Any],
+                    exports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Module ``__getattr__`` resolving names from (relative) submodules.
+
+    Args:
+        module_globals: ``globals()`` of the module defining ``__getattr__``
+        exports: Attribute name -> module that defines it (e.g. ".hrr")
+    """
+    module_name = module_globals['__name__']
+    package = module_globals.get('__package__')
+
+    def __getattr__(name: str) -> Any:
+        source = exports.get(name)
+        if source is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(source, package), name)
+        module_globals[name] = value
+        return value
+
+    return __getattr__
+
+
+def lazy_dir(module_globals: MutableMapping[str, Any], exports: Dict[str, str]) -> List[str]:
+    """``dir()`` of a module including its not-yet-imported lazy names"""
+    return sorted(set(module_globals) | set(exports))
+
+
+def start_warmup(initializers: Iterable[Callable[[], Any]],
+                 name: str = "lumina-warmup") -> threading.Thread:
+    """Call initializers in order on a daemon thread (failures are logged)"""
+    initializers = list(initializers)
+
+    def run():
+        for initializer in initializers:
+            try:
+                initializer()
+            except Exception as e:
+                logger.warning(f"Warm-up of {getattr(initializer, '__qualname__', initializer)} failed: {e}")
+
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return thread
+
+
+__all__ = ['lazy_attributes', 'lazy_dir', 'start_warmup']
@@ -0,0 +1,219 @@
+"""
+Lexical Index - Incremental BM25 Inverted Index and Rank Fusion
+===============================================================
+
+Keyword recall used to re-tokenize every stored memory on every query
+(``content.lower().split()`` per unit). ``BM25Index`` keeps an inverted
+index (term -> {doc_id: term frequency}) plus document lengths, updated
+incrementally as units are added and removed, so a keyword query only
+touches the postings of its own terms.
+
+Scoring is Okapi BM25 with the non-negative IDF
+``log(1 + (N - df + 0.5) / (df + 0.5))``.
+
+``reciprocal_rank_fusion`` combines several rankings (e.g. BM25 and
+semantic similarity) by ``sum(1 / (rrf_k + rank))``; it only needs ranks,
+so the two score scales never have to be calibrated against each other.
+
+``LexicalUnitMap`` is a dict of units that keeps a ``BM25Index`` in sync
+with every insert, overwrite and deletion, for unit maps that are written
+directly from many places (``AdvancedXPEnvironment.xpunits``).
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import (Any, Collection, Dict, Iterable, List, Mapping, Optional, Sequence,
+                    Set, Tuple)
+
+_TOKEN = re.compile(r"\w+")
+
+# Constant of reciprocal rank fusion (Cormack et al., 2009)
+DEFAULT_RRF_K = 60
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens (punctuation is not part of a term)"""
+    return _TOKEN.findall(str(text).lower())
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], rrf_k: int = DEFAULT_RRF_K,
+                           weights: Optional[Sequence[float]] = None) -> List[Tuple[str, float]]:
+    """
+    Fuse rankings (best first) into one (item_id, score) list, best first.
+
+    Ties keep the order in which items were first seen.
+    """
+    scores: Dict[str, float] = {}
+    for i, ranking in enumerate(rankings):
+        weight = 1.0 if weights is None else weights[i]
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """
+    Incremental BM25 inverted index.
+
+    Args:
+        k1: Term frequency saturation
+        b: Document length normalization
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._lengths
+
+    def add(self, doc_id: str, text: str):
+        """Index (or re-index) a document"""
+        if doc_id in self._lengths:
+            self.remove(doc_id)
+        terms = tokenize(text)
+        for term, count in Counter(terms).items():
+            self._postings.setdefault(term, {})[doc_id] = count
+        self._lengths[doc_id] = len(terms)
+        self._total_length += len(terms)
+
+    def remove(self, doc_id: str, text: Optional[str] = None) -> bool:
+        """
+        Drop a document; returns False if it was not indexed. Passing its
+        text limits the cleanup to that text's terms.
+        """
+        length = self._lengths.pop(doc_id, None)
+        if length is None:
+            return False
+        self._total_length -= length
+        terms = set(tokenize(text)) if text is not None else list(self._postings)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None and postings.pop(doc_id, None) is not None and not postings:
+                del self._postings[term]
+        return True
+
+    def clear(self):
+        self._postings.clear()
+        self._lengths.clear()
+        self._total_length = 0
+
+    def document_frequency(self, term: str) -> int:
+        return len(self._postings.get(term, ()))
+
+    def idf(self, term: str) -> float:
+        df = self.document_frequency(term)
+        return math.log(1.0 + (len(self._lengths) - df + 0.5) / (df + 0.5))
+
+    def scores(self, query: str, allowed: Optional[Collection[str]] = None) -> Dict[str, float]:
+        """BM25 score of every document containing a query term"""
+        if not self._lengths:
+            return {}
+        k1, b = self.k1, self.b
+        average_length = self._total_length / len(self._lengths) or 1.0
+        lengths = self._lengths
+        scores: Dict[str, float] = {}
+        for term in dict.fromkeys(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            if allowed is not None:
+                if len(allowed) < len(postings):
+                    postings = {doc_id: postings[doc_id] for doc_id in allowed if doc_id in postings}
+                else:
+                    postings = {doc_id: tf for doc_id, tf in postings.items() if doc_id in allowed}
+            for doc_id, tf in postings.items():
+                norm = k1 * (1.0 - b + b * lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+        return scores
+
+    def search(self, query: str, k: int = 10,
+               allowed: Optional[Collection[str]] = None) -> List[Tuple[str, float]]:
+        """Top k (doc_id, BM25 score) for a query, best first"""
+        if k <= 0:
+            return []
+        return heapq.nlargest(k, self.scores(query, allowed).items(), key=lambda item: item[1])
+
+    def matched_terms(self, doc_id: str, terms: Iterable[str]) -> Set[str]:
+        """The given terms that occur in a document"""
+        return {term for term in terms if doc_id in self._postings.get(term, ())}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'documents': len(self._lengths),
+            'terms': len(self._postings),
+            'avg_length': self._total_length / len(self._lengths) if self._lengths else 0.0,
+        }
+
+
+class LexicalUnitMap(dict):
+    """
+    ``content_id -> unit`` dict that mirrors unit content into a BM25Index.
+
+    Units are indexed by their ``content`` when stored; edit a unit's
+    content in place only by storing it again.
+    """
+
+    def __init__(self, index: BM25Index, units: Optional[Mapping[str, Any]] = None):
+        super().__init__()
+        self.index = index
+        if units:
+            self.update(units)
+
+    def __setitem__(self, content_id: str, unit: Any):
+        old = dict.get(self, content_id)
+        if old is not None:
+            self.index.remove(content_id, getattr(old, 'content', ''))
+        super().__setitem__(content_id, unit)
+        self.index.add(content_id, getattr(unit, 'content', ''))
+
+    def __delitem__(self, content_id: str):
+        unit = self[content_id]
+        super().__delitem__(content_id)
+        self.index.remove(content_id, getattr(unit, 'content', ''))
+
+    def pop(self, content_id: str, *default):
+        if content_id in self:
+            unit = self[content_id]
+            del self[content_id]
+            return unit
+        if default:
+            return default[0]
+        raise KeyError(content_id)
+
+    def popitem(self):
+        content_id, unit = super().popitem()
+        self.index.remove(content_id, getattr(unit, 'content', ''))
+        return content_id, unit
+
+    def setdefault(self, content_id: str, default: Any = None):
+        if content_id not in self:
+            self[content_id] = default
+        return self[content_id]
+
+    def update(self, *args, **kwargs):
+        for content_id, unit in dict(*args, **kwargs).items():
+            self[content_id] = unit
+
+    def clear(self):
+        super().clear()
+        self.index.clear()
+
+    def __reduce__(self):
+        return (self.__class__, (self.index, dict(self)))
+
+
+__all__ = ['BM25Index', 'LexicalUnitMap', 'reciprocal_rank_fusion', 'tokenize',
+           'DEFAULT_RRF_K']
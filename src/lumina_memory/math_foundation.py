@@ -19,7 +19,7 @@ from typing import Optional
 
 # Import canonical constants
 from .constants import (
-    EPSILON, NORMALIZATION_EPSILON, DEFAULT_W_SEMANTIC, DEFAULT_W_EMOTION,
+    EPSILON, NORMALIZATION_EPSILON, UNIT_NORM_TOLERANCE, DEFAULT_W_SEMANTIC, DEFAULT_W_EMOTION,
     COHERENCE_HRR_WEIGHT, COHERENCE_SEM_WEIGHT, HYBRID_SPACY_WEIGHT, 
     HYBRID_MATH_WEIGHT, CONFIDENCE_HYBRID, CONFIDENCE_MATH_ONLY,
     MIN_SCORE, MAX_SCORE, VECTOR_DTYPE
@@ -30,8 +30,13 @@ from .constants import (
 # =============================================================================
 
 def circular_convolution(a: np.ndarray, b: np.ndarray) -> np.ndarray:
-    """HRR binding operation - ACTUAL formula from notebook cell 2"""
-    return np.fft.irfft(np.fft.rfft(a) * np.fft.rfft(b), n=len(a))
+    """HRR binding operation - ACTUAL formula from notebook cell 2
+
+    Works on single vectors or row-wise on (n, d) matrices (one batched
+    rfft/irfft over the last axis).
+    """
+    n = a.shape[-1]
+    return np.fft.irfft(np.fft.rfft(a, axis=-1) * np.fft.rfft(b, axis=-1), n=n, axis=-1)
 
 def circular_correlation(a: np.ndarray, b: np.ndarray) -> np.ndarray:
     """HRR unbinding operation - ACTUAL formula from notebook cell 2"""
@@ -44,6 +49,34 @@ def normalize_vector(v: np.ndarray, epsilon: float = NORMALIZATION_EPSILON) -> n
         return np.zeros_like(v)
     return v / norm
 
+def normalize_rows(m: np.ndarray, epsilon: float = NORMALIZATION_EPSILON) -> np.ndarray:
+    """Row-wise normalize_vector for an (n, d) matrix
+
+    Row norms are computed with a per-row reduction so each row's result does
+    not depend on how many rows are normalized together.
+    """
+    m = np.atleast_2d(m)
+    norms = row_norms(m)
+    safe = np.where(norms < epsilon, 1.0, norms).astype(m.dtype)
+    return np.where((norms < epsilon)[:, None], 0.0, m / safe[:, None]).astype(m.dtype)
+
+def row_norms(m: np.ndarray) -> np.ndarray:
+    """Euclidean norm of every row of an (n, d) matrix"""
+    return np.sqrt(np.einsum('ij,ij->i', m, m))
+
+def check_unit_norm(v: np.ndarray, name: str = "vector",
+                    tolerance: float = UNIT_NORM_TOLERANCE):
+    """
+    Validate the pre-normalized vector invariant for a vector or (n, d) matrix
+
+    Every row must have unit norm (within tolerance) or be all zeros, which is
+    what normalize_vector returns for degenerate input. Raises ValueError.
+    """
+    norms = row_norms(np.atleast_2d(np.asarray(v, dtype=np.float64)))
+    bad = (np.abs(norms - 1.0) > tolerance) & (norms > 0.0)
+    if bad.any():
+        raise ValueError(f"{name} is not unit-normalized (norm={norms[bad][0]:.6f})")
+
 def bind_role_filler(role: np.ndarray, filler: np.ndarray) -> np.ndarray:
     """Bind role-filler pair - ACTUAL formula from notebook cell 2"""
     return normalize_vector(circular_convolution(role, filler))
@@ -96,6 +129,84 @@ def memory_unit_score(query_semantic: np.ndarray, memory_semantic: np.ndarray,
     
     return float(np.clip(final_score, MIN_SCORE, MAX_SCORE))
 
+def memory_unit_score_normalized(query_semantic: np.ndarray, memory_semantic: np.ndarray,
+                                 query_emotion: Optional[np.ndarray] = None,
+                                 memory_emotion: Optional[np.ndarray] = None,
+                                 age_hours: float = 0.0, decay_rate: float = 0.1,
+                                 importance: float = 1.0,
+                                 w_semantic: float = DEFAULT_W_SEMANTIC,
+                                 w_emotion: float = DEFAULT_W_EMOTION,
+                                 semantic_norm_product: float = 1.0,
+                                 emotion_norm_product: float = 1.0) -> float:
+    """
+    memory_unit_score for pre-normalized vectors (or cached norms)
+
+    With unit vectors each cosine is a plain dot product; otherwise pass the
+    product of the cached norms of each pair. Given the same norms the result
+    is identical to memory_unit_score.
+    """
+    semantic_sim = np.dot(query_semantic, memory_semantic) / semantic_norm_product
+
+    if query_emotion is not None and memory_emotion is not None:
+        emotion_sim = np.dot(query_emotion, memory_emotion) / emotion_norm_product
+        total_score = w_semantic * semantic_sim + w_emotion * emotion_sim
+    else:
+        total_score = semantic_sim
+
+    final_score = total_score * np.exp(-decay_rate * age_hours) * importance
+    return float(np.clip(final_score, MIN_SCORE, MAX_SCORE))
+
+def memory_similarity_matrix(query_semantic: np.ndarray, memory_semantic: np.ndarray,
+                             query_emotion: Optional[np.ndarray] = None,
+                             memory_emotion: Optional[np.ndarray] = None,
+                             w_semantic: float = DEFAULT_W_SEMANTIC,
+                             w_emotion: float = DEFAULT_W_EMOTION,
+                             memory_semantic_norms: Optional[np.ndarray] = None,
+                             memory_emotion_norms: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Similarity part of memory_unit_score for many queries against many memories
+
+    Queries are rows of a (Q, d) matrix, memories rows of an (n, d) matrix;
+    returns the (Q, n) matrix of w_semantic * semantic_sim + w_emotion * emotion_sim
+    (or semantic_sim alone when no emotion matrices are given), computed with
+    one matrix-matrix product per modality. Row norms can be passed in when
+    the caller already keeps them cached. Zero-norm rows produce NaN, exactly
+    like the scalar formula.
+    """
+    query_semantic = np.atleast_2d(query_semantic)
+    if memory_semantic_norms is None:
+        memory_semantic_norms = np.linalg.norm(memory_semantic, axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Semantic similarity (cosine)
+        semantic_sim = (query_semantic @ memory_semantic.T) / (
+            np.linalg.norm(query_semantic, axis=1)[:, None] * memory_semantic_norms[None, :]
+        )
+
+        if query_emotion is None or memory_emotion is None:
+            return semantic_sim
+
+        query_emotion = np.atleast_2d(query_emotion)
+        if memory_emotion_norms is None:
+            memory_emotion_norms = np.linalg.norm(memory_emotion, axis=1)
+        emotion_sim = (query_emotion @ memory_emotion.T) / (
+            np.linalg.norm(query_emotion, axis=1)[:, None] * memory_emotion_norms[None, :]
+        )
+        return w_semantic * semantic_sim + w_emotion * emotion_sim
+
+def apply_temporal_weighting(similarity: np.ndarray, age_hours: np.ndarray = 0.0,
+                             decay_rate: np.ndarray = 0.1,
+                             importance: np.ndarray = 1.0) -> np.ndarray:
+    """
+    Temporal decay and importance part of memory_unit_score, vectorized
+
+    final_score = clip(similarity * exp(-decay_rate * age_hours) * importance)
+    """
+    with np.errstate(invalid='ignore'):
+        decay_factor = np.exp(-np.asarray(decay_rate) * np.asarray(age_hours))
+        final_score = similarity * decay_factor * importance
+    return np.clip(final_score, MIN_SCORE, MAX_SCORE)
+
 def mathematical_coherence(hrr1: np.ndarray, hrr2: np.ndarray,
                           sem1: np.ndarray, sem2: np.ndarray) -> float:
     """
@@ -116,6 +227,34 @@ def mathematical_coherence(hrr1: np.ndarray, hrr2: np.ndarray,
     coherence = COHERENCE_HRR_WEIGHT * hrr_similarity + COHERENCE_SEM_WEIGHT * semantic_similarity
     return float(np.clip(coherence, MIN_SCORE, MAX_SCORE))
 
+def mathematical_coherence_normalized(hrr1: np.ndarray, hrr2: np.ndarray,
+                                      sem1: np.ndarray, sem2: np.ndarray,
+                                      hrr_norm_product: float = 1.0,
+                                      sem_norm_product: float = 1.0) -> float:
+    """
+    mathematical_coherence for pre-normalized vectors (or cached norms)
+
+    Each cosine is a dot product divided by the given norm product (1.0 for
+    unit vectors).
+    """
+    hrr_similarity = np.dot(hrr1, hrr2) / hrr_norm_product
+    semantic_similarity = np.dot(sem1, sem2) / sem_norm_product
+    coherence = COHERENCE_HRR_WEIGHT * hrr_similarity + COHERENCE_SEM_WEIGHT * semantic_similarity
+    return float(np.clip(coherence, MIN_SCORE, MAX_SCORE))
+
+def coherence_embedding(hrr: np.ndarray, sem: np.ndarray) -> np.ndarray:
+    """
+    Rows [sqrt(w_hrr) * hrr / |hrr|, sqrt(w_sem) * sem / |sem|]
+
+    The inner product of two such rows equals the unclipped
+    mathematical_coherence of the units, so coherence neighbours can be found
+    with a single matrix product (or an inner-product ANN index).
+    """
+    return np.concatenate([
+        np.sqrt(COHERENCE_HRR_WEIGHT) * normalize_rows(hrr),
+        np.sqrt(COHERENCE_SEM_WEIGHT) * normalize_rows(sem)
+    ], axis=1).astype(VECTOR_DTYPE)
+
 # =============================================================================
 # LEXICAL ATTRIBUTION - ACTUAL FORMULAS FROM NOTEBOOK CELL 2
 # =============================================================================
@@ -176,6 +315,10 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     """Cosine similarity between two vectors."""
     return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
 
+def cosine_similarity_normalized(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity between two unit-normalized vectors (a dot product)."""
+    return float(np.dot(a, b))
+
 # =============================================================================
 # EXPORT THE ACTUAL WORKING FORMULAS
 # =============================================================================
@@ -183,14 +326,18 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
 __all__ = [
     # HRR operations - from notebook cell 2
     'circular_convolution', 'circular_correlation', 'normalize_vector',
+    'normalize_rows', 'row_norms', 'check_unit_norm',
     'bind_role_filler', 'unbind_role_filler',
     
     # Memory scoring - from MemoryUnit class in cell 2
-    'memory_unit_score', 'mathematical_coherence',
+    'memory_unit_score', 'memory_similarity_matrix',
+    'memory_unit_score_normalized',
+    'apply_temporal_weighting', 'mathematical_coherence',
+    'mathematical_coherence_normalized', 'coherence_embedding',
     
     # Lexical attribution - from notebook cell 2
     'instant_salience', 'hybrid_lexical_attribution',
     
     # Utilities
-    'get_current_timestamp', 'cosine_similarity'
+    'get_current_timestamp', 'cosine_similarity', 'cosine_similarity_normalized'
 ]
@@ -4,13 +4,14 @@ import logging
 import time
 from collections import deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 import numpy as np
 
 from .config import LuminaConfig
 from .core import MemoryEntry, QueryResult, QueryType, MemoryError
 from .embeddings import EmbeddingProvider
+from .metadata_index import MetadataIndex, matches_filters
 from .vector_store import VectorStore
 from .utils import normalize_similarity
 
@@ -35,6 +36,13 @@ class MemorySystem:
         self.stm: deque = deque(maxlen=self.config.stm_capacity)
         self.ltm: Dict[str, MemoryEntry] = {}
         
+        # ID -> entry for everything held in STM or LTM, and the IDs in STM
+        self._entries: Dict[str, MemoryEntry] = {}
+        self._stm_ids: Set[str] = set()
+        
+        # Inverted index over the metadata of entries held in STM or LTM
+        self.metadata_index = MetadataIndex(self.config.metadata_index_keys)
+        
         # Statistics
         self.stats = {
             "total_memories": 0,
@@ -70,8 +78,17 @@ class MemorySystem:
                 timestamp=datetime.now(),
             )
             
-            # Add to short-term memory
+            # Add to short-term memory (a full deque drops its oldest entry)
+            if len(self.stm) == self.stm.maxlen:
+                dropped = self.stm[0]
+                self._stm_ids.discard(dropped.id)
+                if dropped.id not in self.ltm:
+                    self.metadata_index.remove(dropped.id)
+                    self._entries.pop(dropped.id, None)
             self.stm.append(entry)
+            self._stm_ids.add(entry.id)
+            self._entries[entry.id] = entry
+            self.metadata_index.add(entry.id, entry.metadata)
             
             # Add to vector store
             self.vector_store.add([entry])
@@ -93,6 +110,7 @@ class MemorySystem:
         k: int = 5,
         filters: Optional[Dict[str, Any]] = None,
         query_type: QueryType = QueryType.SEMANTIC,
+        search_params: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Recall relevant memories.
@@ -100,8 +118,13 @@ class MemorySystem:
         Args:
             query: Query string
             k: Number of results to return
-            filters: Optional metadata filters
+            filters: Optional metadata filters (equality, {"$in": [...]}
+                membership or {"$gte": ..., "$lt": ...} ranges); only
+                matching memories are searched
             query_type: Type of query to perform
+            search_params: Per-query vector index knobs, e.g. {"nprobe": 16}
+                (IVF) or {"ef_search": 128} (HNSW): higher is slower but
+                recalls more
             
         Returns:
             List of memory results with content, similarity, and metadata
@@ -112,8 +135,17 @@ class MemorySystem:
             # Generate query embedding
             query_embedding = self.embedding_provider.embed_single(query)
             
-            # Search vector store
-            search_results = self.vector_store.search(query_embedding, k=k * 2)
+            # Search vector store (filters are pushed down as an allowed-ID set)
+            search_params = search_params or {}
+            if filters:
+                allowed_ids = self.metadata_index.match(filters)
+                search_results = (self.vector_store.search(query_embedding, k=k,
+                                                           allowed_ids=allowed_ids,
+                                                           **search_params)
+                                  if allowed_ids else [])
+            else:
+                search_results = self.vector_store.search(query_embedding, k=k * 2,
+                                                          **search_params)
             
             # Get full memory entries and apply filters
             results = []
@@ -179,6 +211,7 @@ class MemorySystem:
             for entry in list(self.stm):
                 if entry.importance_score >= self.config.consolidation_threshold:
                     self.ltm[entry.id] = entry
+                    self._entries[entry.id] = entry
                     consolidated += 1
             
             logger.info(f"Consolidated {consolidated} memories to LTM")
@@ -198,24 +231,42 @@ class MemorySystem:
         Returns:
             Number of memories forgotten
         """
+        return self.forget_many(entry_ids)
+    
+    def forget_many(self, entry_ids: Iterable[str]) -> int:
+        """
+        Forget a set of memories in one pass: a single vector store call
+        and at most one rebuild of STM.
+        
+        Args:
+            entry_ids: Memory IDs to forget
+            
+        Returns:
+            Number of memories forgotten (held in STM or LTM)
+        """
         try:
-            forgotten = 0
+            ids = set(entry_ids)
+            if not ids:
+                return 0
             
             # Remove from vector store
-            self.vector_store.remove(entry_ids)
+            self.vector_store.remove(list(ids))
             
-            # Remove from STM and LTM
-            for entry_id in entry_ids:
-                # Remove from STM
+            # Remove from STM
+            if not self._stm_ids.isdisjoint(ids):
                 self.stm = deque(
-                    (entry for entry in self.stm if entry.id != entry_id),
+                    (entry for entry in self.stm if entry.id not in ids),
                     maxlen=self.stm.maxlen
                 )
-                
-                # Remove from LTM
-                if entry_id in self.ltm:
-                    del self.ltm[entry_id]
+                self._stm_ids -= ids
+            
+            # Remove from LTM and the indexes
+            forgotten = 0
+            for entry_id in ids:
+                self.ltm.pop(entry_id, None)
+                if self._entries.pop(entry_id, None) is not None:
                     forgotten += 1
+                self.metadata_index.remove(entry_id)
             
             # Update statistics
             self.stats["total_memories"] -= forgotten
@@ -239,20 +290,13 @@ class MemorySystem:
         return current_stats
     
     def _find_entry(self, entry_id: str) -> Optional[MemoryEntry]:
-        """Find memory entry by ID."""
-        # Check STM first
-        for entry in self.stm:
-            if entry.id == entry_id:
-                return entry
-        
-        # Check LTM
-        return self.ltm.get(entry_id)
+        """Find memory entry by ID (STM or LTM)."""
+        entry = self._entries.get(entry_id)
+        if entry is None:
+            # Entries written to LTM directly are not indexed
+            entry = self.ltm.get(entry_id)
+        return entry
     
     def _matches_filters(self, entry: MemoryEntry, filters: Dict[str, Any]) -> bool:
         """Check if entry matches metadata filters."""
-        for key, value in filters.items():
-            if key not in entry.metadata:
-                return False
-            if entry.metadata[key] != value:
-                return False
-        return True
+        return matches_filters(entry.metadata, filters)
@@ -0,0 +1,265 @@
+"""
+Metadata Index - Inverted Index for Filtered Retrieval
+======================================================
+
+Filtering retrieval results on metadata (thread, speaker, session, ...) after
+the vector search wastes the search on non-matching items and returns fewer
+than k results whenever the matches rank low. ``MetadataIndex`` answers a
+filter up front with the set of matching item IDs, which the scorers and
+ANN indexes then restrict themselves to, so a filtered query costs time
+proportional to the matching subset.
+
+Filters are dicts of ``key -> condition``; all conditions must hold:
+
+- ``value``: equality (``metadata[key] == value``)
+- ``{"$eq": value}``: equality
+- ``{"$in": [v1, v2, ...]}``: set membership
+- ``{"$gt" | "$gte" | "$lt" | "$lte": number, ...}``: numeric range (bounds
+  may be combined; only real, non-boolean values match)
+
+Items without the key never match. Hashable values get posting sets, numeric
+values a sorted list for range scans. Conditions the index cannot answer
+(keys outside the selected ones, unhashable values) are checked with
+``matches_filters`` on the candidates left by the indexed conditions.
+
+The index snapshots each item's metadata when it is added; re-add an item
+after editing its metadata in place.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+import bisect
+import math
+import numbers
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import numpy as np
+
+RANGE_OPERATORS = ('$gt', '$gte', '$lt', '$lte')
+FILTER_OPERATORS = ('$eq', '$in') + RANGE_OPERATORS
+
+
+def _is_operator(condition: Any) -> bool:
+    return (isinstance(condition, dict) and bool(condition)
+            and all(isinstance(op, str) and op.startswith('$') for op in condition))
+
+
+def _is_number(value: Any) -> bool:
+    return (isinstance(value, numbers.Real) and not isinstance(value, (bool, np.bool_))
+            and not math.isnan(value))
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _check_operators(condition: Dict[str, Any]):
+    unknown = set(condition) - set(FILTER_OPERATORS)
+    if unknown:
+        raise ValueError(f"Unknown filter operator(s) {sorted(unknown)}, "
+                         f"expected {FILTER_OPERATORS}")
+    for op in RANGE_OPERATORS:
+        if op in condition and not _is_number(condition[op]):
+            raise ValueError(f"Range operator {op} needs a number, got {condition[op]!r}")
+
+
+def _in_range(value: Any, condition: Dict[str, Any]) -> bool:
+    if not _is_number(value):
+        return False
+    return (('$gt' not in condition or value > condition['$gt']) and
+            ('$gte' not in condition or value >= condition['$gte']) and
+            ('$lt' not in condition or value < condition['$lt']) and
+            ('$lte' not in condition or value <= condition['$lte']))
+
+
+def range_bounds(values: List[float], condition: Mapping[str, Any]) -> Tuple[int, int]:
+    """
+    Slice [lo, hi) of a sorted value list satisfying the range operators of
+    a condition (binary searches; other operators are ignored).
+    """
+    lo, hi = 0, len(values)
+    if '$gt' in condition:
+        lo = max(lo, bisect.bisect_right(values, condition['$gt']))
+    if '$gte' in condition:
+        lo = max(lo, bisect.bisect_left(values, condition['$gte']))
+    if '$lt' in condition:
+        hi = min(hi, bisect.bisect_left(values, condition['$lt']))
+    if '$lte' in condition:
+        hi = min(hi, bisect.bisect_right(values, condition['$lte']))
+    return lo, hi
+
+
+def matches_condition(metadata: Mapping[str, Any], key: str, condition: Any) -> bool:
+    """True if metadata satisfies one filter condition"""
+    if _is_operator(condition):
+        _check_operators(condition)
+    if key not in metadata:
+        return False
+    value = metadata[key]
+    if not _is_operator(condition):
+        return value == condition
+    if '$eq' in condition and not value == condition['$eq']:
+        return False
+    if '$in' in condition and not any(value == option for option in condition['$in']):
+        return False
+    if any(op in condition for op in RANGE_OPERATORS) and not _in_range(value, condition):
+        return False
+    return True
+
+
+def matches_filters(metadata: Mapping[str, Any], filters: Mapping[str, Any]) -> bool:
+    """True if metadata satisfies every filter condition"""
+    return all(matches_condition(metadata, key, condition) for key, condition in filters.items())
+
+
+class MetadataIndex:
+    """
+    Inverted index over item metadata.
+
+    Args:
+        keys: Metadata keys to index (None = every key). Filters on other
+            keys still work, by checking the candidates directly.
+    """
+
+    def __init__(self, keys: Optional[Iterable[str]] = None):
+        self.keys = None if keys is None else frozenset(keys)
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[Any, Set[str]]] = defaultdict(dict)
+        # key -> (sorted values, item IDs in the same order)
+        self._numeric: Dict[str, Tuple[List[float], List[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._metadata
+
+    def _indexed(self, key: str) -> bool:
+        return self.keys is None or key in self.keys
+
+    def add(self, item_id: str, metadata: Optional[Mapping[str, Any]]):
+        """Index (or re-index) an item's metadata"""
+        if item_id in self._metadata:
+            self.remove(item_id)
+        metadata = dict(metadata or {})
+        self._metadata[item_id] = metadata
+        for key, value in metadata.items():
+            if not self._indexed(key):
+                continue
+            if _is_hashable(value):
+                self._postings[key].setdefault(value, set()).add(item_id)
+            if _is_number(value):
+                values, ids = self._numeric.setdefault(key, ([], []))
+                position = bisect.bisect_right(values, value)
+                values.insert(position, value)
+                ids.insert(position, item_id)
+
+    def remove(self, item_id: str) -> bool:
+        """Drop an item; returns False if it was not indexed"""
+        metadata = self._metadata.pop(item_id, None)
+        if metadata is None:
+            return False
+        for key, value in metadata.items():
+            if not self._indexed(key):
+                continue
+            if _is_hashable(value):
+                postings = self._postings[key]
+                items = postings.get(value)
+                if items is not None:
+                    items.discard(item_id)
+                    if not items:
+                        del postings[value]
+            if _is_number(value):
+                values, ids = self._numeric[key]
+                position = bisect.bisect_left(values, value)
+                while ids[position] != item_id:
+                    position += 1
+                del values[position]
+                del ids[position]
+        return True
+
+    def clear(self):
+        self._metadata.clear()
+        self._postings.clear()
+        self._numeric.clear()
+
+    def match(self, filters: Mapping[str, Any]) -> Set[str]:
+        """IDs of the items satisfying every filter condition"""
+        candidate_sets: List[Set[str]] = []
+        residual: Dict[str, Any] = {}
+        for key, condition in filters.items():
+            candidates = self._lookup(key, condition)
+            if candidates is None:
+                residual[key] = condition
+            else:
+                candidate_sets.append(candidates)
+
+        if candidate_sets:
+            candidate_sets.sort(key=len)
+            result = set(candidate_sets[0])
+            for candidates in candidate_sets[1:]:
+                if not result:
+                    break
+                result &= candidates
+        else:
+            result = set(self._metadata)
+        if residual:
+            metadata = self._metadata
+            result = {item_id for item_id in result
+                      if matches_filters(metadata[item_id], residual)}
+        return result
+
+    def _lookup(self, key: str, condition: Any) -> Optional[Set[str]]:
+        """Items satisfying one condition, or None if the index cannot answer it"""
+        if not self._indexed(key):
+            return None
+        if not _is_operator(condition):
+            return self._equal(key, condition)
+        _check_operators(condition)
+        result: Optional[Set[str]] = None
+        if '$eq' in condition:
+            result = self._equal(key, condition['$eq'])
+            if result is None:
+                return None
+        if '$in' in condition:
+            options = list(condition['$in'])
+            if not all(_is_hashable(option) for option in options):
+                return None
+            postings = self._postings.get(key, {})
+            members = set()
+            for option in options:
+                members |= postings.get(option, set())
+            result = members if result is None else result & members
+        if any(op in condition for op in RANGE_OPERATORS):
+            in_range = self._range(key, condition)
+            result = in_range if result is None else result & in_range
+        return result
+
+    def _equal(self, key: str, value: Any) -> Optional[Set[str]]:
+        if not _is_hashable(value):
+            return None
+        return self._postings.get(key, {}).get(value, set())
+
+    def _range(self, key: str, condition: Dict[str, Any]) -> Set[str]:
+        if key not in self._numeric:
+            return set()
+        values, ids = self._numeric[key]
+        lo, hi = range_bounds(values, condition)
+        return set(ids[lo:hi]) if lo < hi else set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'items': len(self._metadata),
+            'indexed_keys': len(self._postings) if self.keys is None else len(self.keys),
+            'numeric_keys': len(self._numeric),
+        }
+
+
+__all__ = ['MetadataIndex', 'matches_filters', 'matches_condition', 'range_bounds',
+           'FILTER_OPERATORS', 'RANGE_OPERATORS']
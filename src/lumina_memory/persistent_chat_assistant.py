@@ -154,14 +154,10 @@ class PersistentChatAssistant:
     def _generate_session_context(self) -> str:
         """Generate context summary from previous sessions and memories"""
         try:
-            # Get recent memories
-            recent_memories = []
+            # Get memories from last 7 days (time index range query)
             current_time = get_current_timestamp()
-            
-            for unit in self.persistent_env.units.values():
-                # Get memories from last 7 days
-                if current_time - unit.timestamp < 7 * 24 * 3600:
-                    recent_memories.append(unit)
+            recent_ids = self.persistent_env.time_index.select({'$gt': current_time - 7 * 24 * 3600})
+            recent_memories = [self.persistent_env.units[content_id] for content_id in recent_ids]
             
             # Sort by recency and importance
             recent_memories.sort(key=lambda x: x.last_access, reverse=True)
@@ -0,0 +1,116 @@
+"""
+Query Cache - Generation-Stamped LRU Cache of Retrieval Results
+===============================================================
+
+Recall queries repeat heavily (GUI refreshes, session context summaries,
+retries after LLM timeouts), and each repeat re-embeds the query,
+re-analyzes its emotion and rescans the store. ``QueryResultCache`` keeps
+recent results keyed by (normalized query, k, threshold, filters, mode).
+
+Entries are stamped with the store *generation*, a counter
+``XPEnvironment`` increments whenever stored units change in a way that
+affects ranking: ingest, consolidation, decay (evolve / materialize),
+removal and eviction. A lookup under a newer generation is a miss, so
+results never outlive the units they were computed from.
+
+Access statistics updated by retrievals themselves do not advance the
+generation (that would make repeats uncacheable), and lazy decay keeps
+lowering importance between evolves; set ``ttl_seconds`` to bound how old
+a cached ranking can get when those drifts matter.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .embedding_cache import normalize_text
+
+DEFAULT_QUERY_CACHE_SIZE = 256
+
+
+def query_cache_key(query: str, k: int, threshold: float,
+                    filters: Optional[Dict[str, Any]] = None, mode: str = "semantic") -> Tuple:
+    """Cache key for a retrieval (queries are compared in normalized form)"""
+    frozen_filters = json.dumps(filters, sort_keys=True, default=repr) if filters else None
+    return (normalize_text(query), int(k), float(threshold), frozen_filters, mode)
+
+
+class QueryResultCache:
+    """
+    LRU cache of retrieval results validated by a store generation.
+
+    Args:
+        max_entries: Cached queries kept (least recently used are dropped)
+        ttl_seconds: Maximum age of an entry (None = until invalidated)
+        clock: Time source for the TTL
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_QUERY_CACHE_SIZE,
+                 ttl_seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0  # Misses on entries from an older generation
+        self.expired = 0  # Misses on entries older than the TTL
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, generation: int) -> Optional[Any]:
+        """Cached value for key under the current generation, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_generation, created, value = entry
+                if entry_generation != generation:
+                    self.stale += 1
+                elif self.ttl_seconds is not None and self._clock() - created > self.ttl_seconds:
+                    self.expired += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, generation: int, value: Any):
+        with self._lock:
+            self._entries[key] = (generation, self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'expired': self.expired,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+__all__ = ['QueryResultCache', 'query_cache_key', 'DEFAULT_QUERY_CACHE_SIZE']
@@ -0,0 +1,124 @@
+"""
+Time Index - Sorted Timestamps for Age-Window and Recency Queries
+=================================================================
+
+"Memories from the last N hours" or "between session start and now" used to
+be a linear scan comparing every unit's timestamp. ``TimeIndex`` keeps the
+timestamps in a sorted array (with the item IDs in the same order), so a
+time-range query is two binary searches plus the size of the answer.
+
+Items almost always arrive in time order, so an insert is usually an append;
+out-of-order timestamps (restored or imported units) fall back to a
+``bisect`` insert.
+
+``XPEnvironment`` keeps one over its units and exposes it as the reserved
+``"$timestamp"`` retrieval filter, which combines with metadata filters and
+semantic search::
+
+    env.retrieve_similar("deadline", filters={"$timestamp": {"$gte": session_start}})
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+import bisect
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from .metadata_index import RANGE_OPERATORS, range_bounds
+
+# Reserved filter key selecting on unit timestamps instead of metadata
+TIMESTAMP_FILTER = '$timestamp'
+
+
+class TimeIndex:
+    """
+    Sorted index of item timestamps.
+    """
+
+    def __init__(self):
+        self._times: List[float] = []
+        self._ids: List[str] = []
+        self._by_id: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._by_id
+
+    def add(self, item_id: str, timestamp: float):
+        """Index (or re-index) an item's timestamp"""
+        if item_id in self._by_id:
+            self.remove(item_id)
+        timestamp = float(timestamp)
+        self._by_id[item_id] = timestamp
+        if not self._times or timestamp >= self._times[-1]:
+            self._times.append(timestamp)
+            self._ids.append(item_id)
+        else:
+            position = bisect.bisect_right(self._times, timestamp)
+            self._times.insert(position, timestamp)
+            self._ids.insert(position, item_id)
+
+    def remove(self, item_id: str) -> bool:
+        """Drop an item; returns False if it was not indexed"""
+        timestamp = self._by_id.pop(item_id, None)
+        if timestamp is None:
+            return False
+        position = bisect.bisect_left(self._times, timestamp)
+        while self._ids[position] != item_id:
+            position += 1
+        del self._times[position]
+        del self._ids[position]
+        return True
+
+    def clear(self):
+        self._times.clear()
+        self._ids.clear()
+        self._by_id.clear()
+
+    def between(self, start: Optional[float] = None, end: Optional[float] = None) -> List[str]:
+        """IDs with start <= timestamp <= end (either bound optional), oldest first"""
+        condition = {}
+        if start is not None:
+            condition['$gte'] = start
+        if end is not None:
+            condition['$lte'] = end
+        lo, hi = range_bounds(self._times, condition)
+        return self._ids[lo:hi]
+
+    def count_between(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        lo = 0 if start is None else bisect.bisect_left(self._times, start)
+        hi = len(self._times) if end is None else bisect.bisect_right(self._times, end)
+        return max(0, hi - lo)
+
+    def select(self, condition: Mapping[str, Any]) -> Set[str]:
+        """IDs whose timestamp satisfies a range condition ({"$gte": t0, "$lt": t1})"""
+        if not isinstance(condition, Mapping) or not condition:
+            raise ValueError(f"{TIMESTAMP_FILTER} filter must be a range condition, "
+                             f"e.g. {{'$gte': start}}")
+        unknown = set(condition) - set(RANGE_OPERATORS)
+        if unknown:
+            raise ValueError(f"Unsupported {TIMESTAMP_FILTER} operator(s) {sorted(unknown)}, "
+                             f"expected {RANGE_OPERATORS}")
+        lo, hi = range_bounds(self._times, condition)
+        return set(self._ids[lo:hi]) if lo < hi else set()
+
+    def latest(self, n: int) -> List[str]:
+        """The n most recent IDs, newest first"""
+        if n <= 0:
+            return []
+        return self._ids[:-n - 1:-1]
+
+    def timestamp_of(self, item_id: str) -> Optional[float]:
+        return self._by_id.get(item_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'items': len(self._ids),
+            'oldest': self._times[0] if self._times else None,
+            'newest': self._times[-1] if self._times else None,
+        }
+
+
+__all__ = ['TimeIndex', 'TIMESTAMP_FILTER']
@@ -0,0 +1,90 @@
+"""
+Top-k Selection - Shared Partial-Sort Utilities
+===============================================
+
+Retrieval paths only ever need the k best candidates, so building a full
+list of (item, score) tuples and sorting it is wasted work. Two helpers:
+
+- ``top_k_indices``: O(n) selection over a score array via ``np.argpartition``,
+  followed by an O(k log k) sort of the selected block
+- ``top_k_stream``: bounded heap for scores produced one at a time
+
+Both return results in exactly the order a stable descending sort would
+(ties keep their original order), so swapping them in for ``list.sort`` does
+not change any ranking. NaN scores rank last.
+
+Author: Lumina Memory Team
+License: MIT
+"""
+
+import heapq
+from typing import Any, Callable, Iterable, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+T = TypeVar('T')
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int]) -> np.ndarray:
+    """
+    Indices of the k largest scores, best first.
+
+    Args:
+        scores: 1-D array of scores
+        k: Number of indices to return (None = all, fully sorted)
+
+    Returns:
+        Index array of length min(k, len(scores)), ordered by descending score
+        with ties broken by ascending index
+    """
+    scores = np.asarray(scores)
+    n = len(scores)
+    if k is not None and k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    nan_mask = np.isnan(scores)
+    if nan_mask.any():
+        scores = np.where(nan_mask, -np.inf, scores)
+
+    if k is None or k >= n:
+        order = np.argsort(-scores, kind='stable')
+    else:
+        # O(n) partition finds the k-th best score; everything strictly better
+        # is in, and ties at the boundary are filled in index order
+        kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        better = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)[:k - len(better)]
+        selected = np.concatenate([better, ties])
+        order = selected[np.lexsort((selected, -scores[selected]))]
+
+    return order
+
+
+def top_k(items: List[T], scores: np.ndarray, k: Optional[int]) -> List[Tuple[T, float]]:
+    """(item, score) pairs for the k best scores, best first"""
+    return [(items[i], float(scores[i])) for i in top_k_indices(scores, k)]
+
+
+def top_k_stream(pairs: Iterable[Tuple[T, float]], k: Optional[int],
+                 key: Callable[[Tuple[T, float]], Any] = None) -> List[Tuple[T, float]]:
+    """
+    k best (item, score) pairs from a stream, best first.
+
+    Keeps a bounded heap of size k, so memory is O(k) and time O(n log k).
+    Equivalent to ``sorted(pairs, key=..., reverse=True)[:k]``.
+    """
+    if key is None:
+        key = _pair_score
+    if k is None:
+        return sorted(pairs, key=key, reverse=True)
+    if k <= 0:
+        return []
+    return heapq.nlargest(k, pairs, key=key)
+
+
+def _pair_score(pair: Tuple[Any, float]) -> float:
+    score = pair[1]
+    return float('-inf') if score != score else score  # NaN ranks last
+
+
+__all__ = ['top_k_indices', 'top_k', 'top_k_stream']
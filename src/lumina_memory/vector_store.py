@@ -1,17 +1,79 @@
 ﻿"""Vector storage implementations for Lumina Memory System."""
 
+import json
 import logging
+import os
 import threading
 from abc import ABC, abstractmethod
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Collection, Dict, List, Optional, Set, Tuple, Union
 
 import numpy as np
 
+from .config import LuminaConfig
 from .core import MemoryEntry, StorageError
+from .topk import top_k_indices
 
 logger = logging.getLogger(__name__)
 
+# FAISS index families (LuminaConfig.faiss_index_type)
+FAISS_INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+# Vectors before a trained index with automatic nlist replaces the flat one
+DEFAULT_TRAIN_THRESHOLD = 10000
+
+# On-disk snapshot layout: a directory of files named in each store's save(),
+# described by a JSON manifest written last
+SNAPSHOT_FORMAT = "lumina-vector-store"
+SNAPSHOT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+def _write_snapshot_file(directory: Path, name: str, write: Callable[[str], None]) -> None:
+    """Write one snapshot file through a temporary name, then rename it into place"""
+    tmp = directory / f".{name}.tmp"
+    write(str(tmp))
+    os.replace(tmp, directory / name)
+
+
+def _save_array(directory: Path, name: str, array: np.ndarray) -> None:
+    def write(tmp: str):
+        with open(tmp, "wb") as f:
+            np.save(f, array, allow_pickle=False)
+    _write_snapshot_file(directory, name, write)
+
+
+def _load_array(directory: Path, name: str, mmap: bool = False) -> np.ndarray:
+    return np.load(directory / name, mmap_mode="r" if mmap else None, allow_pickle=False)
+
+
+def _write_manifest(directory: Path, store: str, **fields) -> None:
+    manifest = {"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION, "store": store,
+                "saved_at": datetime.now().isoformat(), **fields}
+
+    def write(tmp: str):
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2)
+    _write_snapshot_file(directory, MANIFEST_FILE, write)
+
+
+def _read_manifest(directory: Path, store: str) -> Dict[str, Any]:
+    """Manifest of a snapshot, checked against the loading store and supported versions"""
+    try:
+        with open(directory / MANIFEST_FILE) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise StorageError(f"Cannot read vector store snapshot at {directory}: {e}")
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise StorageError(f"{directory} is not a vector store snapshot")
+    if manifest.get("store") != store:
+        raise StorageError(f"Snapshot at {directory} was saved by {manifest.get('store')}, not {store}")
+    if manifest.get("version", 0) > SNAPSHOT_VERSION:
+        raise StorageError(f"Snapshot version {manifest['version']} is newer than supported "
+                           f"({SNAPSHOT_VERSION})")
+    return manifest
+
 
 class VectorStore(ABC):
     """Abstract base class for vector storage."""
@@ -22,8 +84,15 @@ class VectorStore(ABC):
         pass
     
     @abstractmethod 
-    def search(self, query_embedding: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
-        """Search for similar entries."""
+    def search(self, query_embedding: np.ndarray, k: int = 10,
+               allowed_ids: Optional[Collection[str]] = None,
+               **search_params) -> List[Tuple[str, float]]:
+        """
+        Search for similar entries (restricted to allowed_ids when given).
+        
+        search_params are index-specific knobs (e.g. nprobe, ef_search);
+        stores without them ignore them.
+        """
         pass
     
     @abstractmethod
@@ -44,40 +113,173 @@ class VectorStore(ABC):
 
 
 class FAISSVectorStore(VectorStore):
-    """FAISS-based vector store implementation."""
+    """
+    FAISS-based vector store implementation.
     
-    def __init__(self, dimension: int, metric: str = "cosine"):
-        """Initialize FAISS vector store."""
+    Vectors live in an index keyed by int64 index ids. Removed (and
+    re-added) entries become tombstones: they are excluded from search
+    immediately and physically deleted in one batch once they make up more
+    than compaction_threshold of the index, so heavy forget traffic neither
+    grows the index nor pays an O(n) shift per call.
+    
+    index_type selects the index family: "flat" (exact), "ivf_flat",
+    "ivf_pq" (inverted lists over a k-means coarse quantizer, with raw or
+    product-quantized vectors) or "hnsw" (graph). Trained families start on
+    a flat index and migrate automatically once train_threshold live
+    vectors exist; nprobe / ef_search trade recall for latency and can be
+    overridden per search call.
+    """
+    
+    def __init__(self, dimension: int, metric: str = "cosine",
+                 compaction_threshold: float = 0.2, index_type: str = "flat",
+                 nlist: int = 0, train_threshold: int = 0, pq_m: int = 16, pq_nbits: int = 8,
+                 hnsw_m: int = 32, ef_construction: int = 40, nprobe: int = 8,
+                 ef_search: int = 64):
+        """
+        Initialize FAISS vector store.
+        
+        Args:
+            dimension: Embedding dimension
+            metric: "cosine", "euclidean" or "inner_product"
+            compaction_threshold: Dead fraction at which tombstones are deleted
+            index_type: "flat", "ivf_flat", "ivf_pq" or "hnsw"
+            nlist: IVF coarse clusters (0 = about 4 * sqrt(n) at training time)
+            train_threshold: Live vectors before migrating off the flat index
+                (0 = 39 * nlist for IVF, 10000 with automatic nlist; HNSW
+                starts directly)
+            pq_m: IVF-PQ sub-quantizers (must divide the dimension)
+            pq_nbits: Bits per IVF-PQ sub-quantizer code
+            hnsw_m: HNSW links per node
+            ef_construction: HNSW build-time candidate list size
+            nprobe: Default IVF lists probed per query
+            ef_search: Default HNSW search candidate list size
+        """
+        if not 0.0 <= compaction_threshold < 1.0:
+            raise ValueError("compaction_threshold must be in [0, 1)")
+        if index_type not in FAISS_INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {index_type} (expected one of {FAISS_INDEX_TYPES})")
+        if index_type == "ivf_pq" and dimension % pq_m:
+            raise ValueError(f"pq_m ({pq_m}) must divide the dimension ({dimension})")
         self.dimension = dimension
         self.metric = metric
+        self.compaction_threshold = compaction_threshold
+        self.index_type = index_type
+        self.nlist = nlist
+        self.train_threshold = train_threshold
+        self.pq_m = pq_m
+        self.pq_nbits = pq_nbits
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.nprobe = nprobe
+        self.ef_search = ef_search
         self.index = None
+        self.active_index_type = "flat"  # Family currently built (flat until trained)
         self.entry_map: Dict[int, str] = {}  # index_id -> entry_id
         self.reverse_map: Dict[str, int] = {}  # entry_id -> index_id
         self.next_id = 0
+        self._tombstones: Set[int] = set()  # Index ids removed but still stored in the index
+        self._tombstone_selector = None  # Cached selector excluding tombstones from search
+        self.compactions = 0
+        self.migrations = 0
+        self._mmapped = False  # Index pages map a snapshot read-only (copied on first write)
         self._lock = threading.Lock()
         
         self._create_index()
-        logger.info(f"FAISS store initialized: dim={dimension}, metric={metric}")
+        logger.info(f"FAISS store initialized: dim={dimension}, metric={metric}, index={index_type}")
+    
+    @classmethod
+    def from_config(cls, config: LuminaConfig) -> "FAISSVectorStore":
+        """Store with the index settings of a LuminaConfig."""
+        return cls(
+            dimension=config.embedding_dim,
+            metric=config.similarity_metric,
+            compaction_threshold=config.vector_compaction_threshold,
+            index_type=config.faiss_index_type,
+            nlist=config.faiss_nlist,
+            train_threshold=config.faiss_train_threshold,
+            pq_m=config.faiss_pq_m,
+            pq_nbits=config.faiss_pq_nbits,
+            hnsw_m=config.faiss_hnsw_m,
+            ef_construction=config.faiss_ef_construction,
+            nprobe=config.faiss_nprobe,
+            ef_search=config.faiss_ef_search,
+        )
+    
+    @property
+    def migration_threshold(self) -> Optional[int]:
+        """Live vectors at which the flat index is replaced (None = stays flat)."""
+        if self.index_type == "flat":
+            return None
+        if self.train_threshold > 0:
+            return self.train_threshold
+        if self.index_type == "hnsw":
+            return 0
+        return 39 * self.nlist if self.nlist else DEFAULT_TRAIN_THRESHOLD
+    
+    def _faiss_metric(self):
+        import faiss
+        return faiss.METRIC_L2 if self.metric == "euclidean" else faiss.METRIC_INNER_PRODUCT
     
     def _create_index(self):
-        """Create FAISS index based on metric."""
+        """Create the initial (empty) FAISS index."""
+        if self.metric not in ("cosine", "euclidean", "inner_product"):
+            raise StorageError(f"Failed to create FAISS index: Unsupported metric: {self.metric}")
+        kind = "hnsw" if self.migration_threshold == 0 else "flat"
+        self.index = self._build_index(kind)
+        self.active_index_type = kind
+        self._mmapped = False
+    
+    def _build_index(self, kind: str, training: Optional[np.ndarray] = None):
+        """Empty index of a family (IVF families are trained on the given vectors)."""
         try:
             import faiss
             
-            if self.metric == "cosine":
-                self.index = faiss.IndexFlatIP(self.dimension)
-            elif self.metric == "euclidean": 
-                self.index = faiss.IndexFlatL2(self.dimension)
-            elif self.metric == "inner_product":
-                self.index = faiss.IndexFlatIP(self.dimension)
+            metric = self._faiss_metric()
+            if kind == "flat":
+                return faiss.IndexIDMap2(faiss.IndexFlat(self.dimension, metric))
+            if kind == "hnsw":
+                hnsw = faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, metric)
+                hnsw.hnsw.efConstruction = self.ef_construction
+                hnsw.hnsw.efSearch = self.ef_search
+                return faiss.IndexIDMap2(hnsw)
+            # IVF lists store the index ids themselves and support remove_ids natively
+            nlist = self.nlist or max(1, min(int(4 * np.sqrt(len(training))), len(training) // 39))
+            quantizer = faiss.IndexFlat(self.dimension, metric)
+            if kind == "ivf_flat":
+                index = faiss.IndexIVFFlat(quantizer, self.dimension, nlist, metric)
             else:
-                raise ValueError(f"Unsupported metric: {self.metric}")
+                index = faiss.IndexIVFPQ(quantizer, self.dimension, nlist, self.pq_m,
+                                         self.pq_nbits, metric)
+            index.train(training)
+            index.nprobe = self.nprobe
+            return index
                 
         except ImportError as e:
             raise StorageError(f"FAISS not available: {e}")
         except Exception as e:
             raise StorageError(f"Failed to create FAISS index: {e}")
     
+    def _rebuild_locked(self, kind: str):
+        """Rebuild the index as the given family from the live vectors (drops tombstones)."""
+        index_ids = np.fromiter(self.entry_map, dtype="int64", count=len(self.entry_map))
+        vectors = self.index.reconstruct_batch(index_ids) if len(index_ids) else None
+        index = self._build_index(kind, vectors)
+        if vectors is not None:
+            index.add_with_ids(vectors, index_ids)
+        self.index = index
+        self.active_index_type = kind
+        self._mmapped = False
+        self._tombstones.clear()
+        self._tombstone_selector = None
+    
+    def _maybe_migrate_locked(self):
+        threshold = self.migration_threshold
+        if (threshold is not None and self.active_index_type == "flat"
+                and len(self.entry_map) >= threshold):
+            self._rebuild_locked(self.index_type)
+            self.migrations += 1
+            logger.info(f"Migrated FAISS store to {self.index_type} at {len(self.entry_map)} vectors")
+    
     def _normalize_embeddings(self, embeddings: np.ndarray) -> np.ndarray:
         """Normalize embeddings for cosine similarity."""
         if self.metric == "cosine":
@@ -87,7 +289,7 @@ class FAISSVectorStore(VectorStore):
         return embeddings
     
     def add(self, entries: List[MemoryEntry]) -> None:
-        """Add memory entries to the store."""
+        """Add memory entries to the store (re-adding an ID replaces its vector)."""
         if not entries:
             return
             
@@ -107,35 +309,62 @@ class FAISSVectorStore(VectorStore):
         
         with self._lock:
             try:
-                self.index.add(embeddings)
+                self._ensure_writable_locked()
+                index_ids = np.arange(self.next_id, self.next_id + len(entries), dtype="int64")
+                self.index.add_with_ids(embeddings, index_ids)
                 
-                for i, entry_id in enumerate(entry_ids):
-                    index_id = self.next_id + i
+                for index_id, entry_id in zip(index_ids.tolist(), entry_ids):
+                    self._discard_locked(entry_id)
                     self.entry_map[index_id] = entry_id
                     self.reverse_map[entry_id] = index_id
                 
                 self.next_id += len(entries)
+                self._maybe_compact_locked()
+                self._maybe_migrate_locked()
                 logger.info(f"Added {len(entries)} entries to FAISS store")
                 
             except Exception as e:
                 raise StorageError(f"Failed to add entries to FAISS: {e}")
     
-    def search(self, query_embedding: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
-        """Search for similar entries."""
+    def search(self, query_embedding: np.ndarray, k: int = 10,
+               allowed_ids: Optional[Collection[str]] = None,
+               nprobe: Optional[int] = None, ef_search: Optional[int] = None,
+               **search_params) -> List[Tuple[str, float]]:
+        """
+        Search for similar entries (restricted to allowed_ids when given).
+        
+        nprobe (IVF) and ef_search (HNSW) override the store defaults for
+        this call; they are ignored while the store is still flat.
+        """
         if query_embedding.shape[0] != self.dimension:
             raise StorageError("Query embedding dimension mismatch")
             
-        if self.index.ntotal == 0:
+        if not self.entry_map or k <= 0:
             return []
         
         query = query_embedding.reshape(1, -1).astype("float32")
         query = self._normalize_embeddings(query)
         
-        k = min(k, self.index.ntotal)
-        
         try:
             with self._lock:
-                scores, indices = self.index.search(query, k)
+                import faiss
+                k = min(k, len(self.entry_map))
+                selector = None
+                if allowed_ids is not None:
+                    # Push the filter into FAISS with an ID selector (live ids only)
+                    index_ids = np.array([self.reverse_map[entry_id] for entry_id in allowed_ids
+                                          if entry_id in self.reverse_map], dtype="int64")
+                    if not len(index_ids):
+                        return []
+                    k = min(k, len(index_ids))
+                    selector = faiss.IDSelectorBatch(index_ids)
+                elif self._tombstones:
+                    selector = self._live_selector_locked()
+                params = self._search_parameters(k, selector, nprobe, ef_search)
+                if params is None:
+                    scores, indices = self.index.search(query, k)
+                else:
+                    scores, indices = self.index.search(query, k, params=params)
                 
                 results = []
                 for score, idx in zip(scores[0], indices[0]):
@@ -143,7 +372,7 @@ class FAISSVectorStore(VectorStore):
                         entry_id = self.entry_map[idx]
                         similarity = float(score)
                         if self.metric == "euclidean":
-                            similarity = 1.0 / (1.0 + score)
+                            similarity = 1.0 / (1.0 + similarity)  # score is the squared L2 distance
                         results.append((entry_id, similarity))
                 
                 return results
@@ -151,14 +380,69 @@ class FAISSVectorStore(VectorStore):
         except Exception as e:
             raise StorageError(f"FAISS search failed: {e}")
     
+    def _search_parameters(self, k: int, selector, nprobe: Optional[int],
+                           ef_search: Optional[int]):
+        """Per-query FAISS search parameters for the active index family (None = defaults)."""
+        import faiss
+        options = {} if selector is None else {'sel': selector}
+        if self.active_index_type in ("ivf_flat", "ivf_pq"):
+            return faiss.SearchParametersIVF(nprobe=nprobe or self.nprobe, **options)
+        if self.active_index_type == "hnsw":
+            return faiss.SearchParametersHNSW(efSearch=max(ef_search or self.ef_search, k), **options)
+        return faiss.SearchParameters(**options) if options else None
+    
+    def _live_selector_locked(self):
+        """Selector excluding tombstoned index ids (rebuilt when tombstones change)"""
+        if self._tombstone_selector is None:
+            import faiss
+            dead = faiss.IDSelectorBatch(np.fromiter(self._tombstones, dtype="int64",
+                                                     count=len(self._tombstones)))
+            # Keep the wrapped selector referenced; IDSelectorNot does not own it
+            self._tombstone_selector = (faiss.IDSelectorNot(dead), dead)
+        return self._tombstone_selector[0]
+    
+    def _discard_locked(self, entry_id: str) -> bool:
+        """Unmap an entry and tombstone its vector"""
+        index_id = self.reverse_map.pop(entry_id, None)
+        if index_id is None:
+            return False
+        del self.entry_map[index_id]
+        self._tombstones.add(index_id)
+        self._tombstone_selector = None
+        return True
+    
+    def _maybe_compact_locked(self):
+        if self._tombstones and self.dead_fraction > self.compaction_threshold:
+            self._compact_locked()
+    
+    def _compact_locked(self):
+        """Physically delete tombstoned vectors from the index"""
+        import faiss
+        if self.active_index_type == "hnsw":
+            # HNSW graphs do not support removal: rebuild from the live vectors
+            removed = len(self._tombstones)
+            self._rebuild_locked("hnsw")
+        else:
+            self._ensure_writable_locked()
+            dead = np.fromiter(self._tombstones, dtype="int64", count=len(self._tombstones))
+            removed = self.index.remove_ids(faiss.IDSelectorBatch(dead))
+            self._tombstones.clear()
+            self._tombstone_selector = None
+        self.compactions += 1
+        logger.debug(f"Compacted FAISS store: removed {removed} vectors")
+    
+    def compact(self) -> None:
+        """Delete all tombstoned vectors now."""
+        with self._lock:
+            if self._tombstones:
+                self._compact_locked()
+    
     def remove(self, entry_ids: List[str]) -> None:
         """Remove entries by ID."""
         with self._lock:
             for entry_id in entry_ids:
-                if entry_id in self.reverse_map:
-                    index_id = self.reverse_map[entry_id]
-                    del self.entry_map[index_id]
-                    del self.reverse_map[entry_id]
+                self._discard_locked(entry_id)
+            self._maybe_compact_locked()
     
     def clear(self) -> None:
         """Clear all entries.""" 
@@ -166,67 +450,387 @@ class FAISSVectorStore(VectorStore):
             self._create_index()
             self.entry_map.clear()
             self.reverse_map.clear()
+            self._tombstones.clear()
+            self._tombstone_selector = None
             self.next_id = 0
     
     @property
     def size(self) -> int:
         """Get number of entries."""
         return len(self.entry_map)
+    
+    @property
+    def dead_fraction(self) -> float:
+        """Fraction of stored vectors that are tombstones."""
+        total = self.index.ntotal
+        return len(self._tombstones) / total if total else 0.0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Live/dead vector counts and compaction activity."""
+        return {
+            "size": self.size,
+            "stored_vectors": self.index.ntotal,
+            "tombstones": len(self._tombstones),
+            "dead_fraction": self.dead_fraction,
+            "compaction_threshold": self.compaction_threshold,
+            "compactions": self.compactions,
+            "index_type": self.index_type,
+            "active_index_type": self.active_index_type,
+            "migration_threshold": self.migration_threshold,
+            "migrations": self.migrations,
+            "nprobe": self.nprobe,
+            "ef_search": self.ef_search,
+            "memory_mapped": self._mmapped,
+        }
+    
+    def _ensure_writable_locked(self):
+        """Copy a memory-mapped index into private memory before modifying it"""
+        if self._mmapped:
+            import faiss
+            self.index = faiss.deserialize_index(faiss.serialize_index(self.index))
+            self._mmapped = False
+    
+    def _settings(self) -> Dict[str, Any]:
+        """Constructor arguments reproducing this store's configuration"""
+        return {
+            "dimension": self.dimension, "metric": self.metric,
+            "compaction_threshold": self.compaction_threshold, "index_type": self.index_type,
+            "nlist": self.nlist, "train_threshold": self.train_threshold,
+            "pq_m": self.pq_m, "pq_nbits": self.pq_nbits, "hnsw_m": self.hnsw_m,
+            "ef_construction": self.ef_construction, "nprobe": self.nprobe,
+            "ef_search": self.ef_search,
+        }
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write a snapshot directory: the FAISS index (index.faiss), the id
+        maps (index_ids.npy / entry_ids.npy), tombstones and a versioned
+        manifest. Tombstoned vectors are saved as they are; compact() first
+        to drop them from the snapshot.
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            try:
+                import faiss
+                index_ids = np.fromiter(self.entry_map, dtype="int64", count=len(self.entry_map))
+                entry_ids = np.array([self.entry_map[index_id] for index_id in index_ids.tolist()],
+                                     dtype=str)
+                tombstones = np.fromiter(self._tombstones, dtype="int64", count=len(self._tombstones))
+                _write_snapshot_file(directory, "index.faiss",
+                                     lambda tmp: faiss.write_index(self.index, tmp))
+                _save_array(directory, "index_ids.npy", index_ids)
+                _save_array(directory, "entry_ids.npy", entry_ids)
+                _save_array(directory, "tombstones.npy", tombstones)
+                _write_manifest(directory, type(self).__name__, settings=self._settings(),
+                                active_index_type=self.active_index_type, next_id=self.next_id,
+                                size=self.size)
+            except StorageError:
+                raise
+            except Exception as e:
+                raise StorageError(f"Failed to save FAISS store: {e}")
+        logger.info(f"Saved FAISS store ({self.size} entries) to {directory}")
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "FAISSVectorStore":
+        """
+        Open a snapshot written by save().
+        
+        With mmap, flat and HNSW indexes are memory-mapped instead of read:
+        opening is fast regardless of size and processes opening the same
+        snapshot share its pages. The mapping is read-only; the first add,
+        remove-triggered compaction or migration copies the index into
+        private memory. IVF indexes are always read into memory.
+        """
+        directory = Path(path)
+        manifest = _read_manifest(directory, cls.__name__)
+        store = cls(**manifest["settings"])
+        try:
+            import faiss
+            mapped = mmap and manifest["active_index_type"] in ("flat", "hnsw")
+            flags = faiss.IO_FLAG_MMAP_IFC if mapped else 0
+            store.index = faiss.read_index(str(directory / "index.faiss"), flags)
+            index_ids = _load_array(directory, "index_ids.npy").tolist()
+            entry_ids = _load_array(directory, "entry_ids.npy").tolist()
+            tombstones = _load_array(directory, "tombstones.npy").tolist()
+        except Exception as e:
+            raise StorageError(f"Failed to load FAISS store from {directory}: {e}")
+        store.active_index_type = manifest["active_index_type"]
+        store._mmapped = mapped
+        store.entry_map = dict(zip(index_ids, entry_ids))
+        store.reverse_map = dict(zip(entry_ids, index_ids))
+        store._tombstones = set(tombstones)
+        store.next_id = manifest["next_id"]
+        logger.info(f"Loaded FAISS store ({store.size} entries) from {directory}"
+                    f"{' (memory-mapped)' if mapped else ''}")
+        return store
 
 
 class InMemoryVectorStore(VectorStore):
-    """Simple in-memory vector store for testing."""
+    """
+    In-memory vector store (the fallback when FAISS is not installed).
+    
+    Embeddings live in one preallocated float32 matrix that grows by
+    doubling, with cached row norms; rows of removed entries are reused.
+    A search is a single matrix-vector product plus a partial sort, with
+    the same scores as FAISSVectorStore: cosine, inner product, or
+    1 / (1 + squared L2 distance) for "euclidean".
+    """
     
-    def __init__(self, metric: str = "cosine"):
-        """Initialize in-memory store."""
+    def __init__(self, metric: str = "cosine", dimension: Optional[int] = None,
+                 initial_capacity: int = 1024):
+        """
+        Initialize in-memory store.
+        
+        Args:
+            metric: "cosine", "euclidean" or "inner_product"
+            dimension: Embedding dimension (None = taken from the first embedding)
+            initial_capacity: Initial matrix rows (grows by doubling)
+        """
+        if metric not in ("cosine", "euclidean", "inner_product"):
+            raise ValueError(f"Unsupported metric: {metric}")
         self.metric = metric
+        self.dimension = dimension
         self.entries: Dict[str, MemoryEntry] = {}
+        capacity = max(1, initial_capacity)
+        self._vectors: Optional[np.ndarray] = None  # Allocated once the dimension is known
+        self._norms = np.zeros(capacity, dtype=np.float32)  # Cached row norms
+        self._live = np.zeros(capacity, dtype=bool)
+        self._row_ids: List[Optional[str]] = []  # Row -> entry ID (None = free)
+        self._rows: Dict[str, int] = {}  # Entry ID -> row
+        self._free_rows: List[int] = []
+        self._mmapped = False  # Matrix maps a snapshot read-only (copied on first write)
         self._lock = threading.Lock()
+        if dimension is not None:
+            self._vectors = np.zeros((capacity, dimension), dtype=np.float32)
     
     def add(self, entries: List[MemoryEntry]) -> None:
-        """Add memory entries to the store."""
+        """Add memory entries to the store (re-adding an ID replaces it)."""
+        if not entries:
+            return
+        embedded = [entry for entry in entries if entry.embedding is not None]
         with self._lock:
+            if embedded:
+                dimension = self.dimension or np.shape(embedded[0].embedding)[0]
+                for entry in embedded:
+                    if np.shape(entry.embedding) != (dimension,):
+                        raise StorageError(f"Entry {entry.id} embedding dimension mismatch")
+                vectors = np.array([entry.embedding for entry in embedded], dtype=np.float32)
+                if self._vectors is None:
+                    self.dimension = dimension
+                    self._vectors = np.zeros((len(self._live), dimension), dtype=np.float32)
+                self._ensure_writable_locked()
             for entry in entries:
                 self.entries[entry.id] = entry
+                if entry.embedding is None:
+                    self._release_row_locked(entry.id)
+            if embedded:
+                rows = [self._row_for_locked(entry.id) for entry in embedded]
+                self._vectors[rows] = vectors
+                self._norms[rows] = np.linalg.norm(vectors, axis=1)
+                self._live[rows] = True
     
-    def search(self, query_embedding: np.ndarray, k: int = 10) -> List[Tuple[str, float]]:
-        """Search for similar entries."""
-        if not self.entries:
+    def search(self, query_embedding: np.ndarray, k: int = 10,
+               allowed_ids: Optional[Collection[str]] = None,
+               **search_params) -> List[Tuple[str, float]]:
+        """Search for similar entries (restricted to allowed_ids when given)."""
+        if not self._rows or k <= 0:
             return []
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.dimension:
+            raise StorageError("Query embedding dimension mismatch")
         
-        similarities = []
         with self._lock:
-            for entry_id, entry in self.entries.items():
-                if entry.embedding is not None:
-                    similarity = self._calculate_similarity(query_embedding, entry.embedding)
-                    similarities.append((entry_id, similarity))
-        
-        # Sort by similarity (descending) and return top k
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:k]
+            if allowed_ids is None:
+                n = len(self._row_ids)
+                rows = None
+                scores = self._scores(self._vectors[:n], self._norms[:n], query)
+                scores[~self._live[:n]] = -np.inf
+                k = min(k, len(self._rows))
+            else:
+                rows = np.array(sorted({self._rows[entry_id] for entry_id in allowed_ids
+                                        if entry_id in self._rows}), dtype=np.intp)
+                if not len(rows):
+                    return []
+                scores = self._scores(self._vectors[rows], self._norms[rows], query)
+            best = top_k_indices(scores, k)
+            selected = best if rows is None else rows[best]
+            return [(self._row_ids[row], score)
+                    for row, score in zip(selected.tolist(), scores[best].tolist())]
     
-    def _calculate_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Calculate similarity between two vectors."""
+    def _scores(self, vectors: np.ndarray, norms: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Similarity of each row to the query (one matvec; norms are cached)"""
+        dots = vectors @ query
         if self.metric == "cosine":
-            return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
-        elif self.metric == "euclidean":
-            distance = np.linalg.norm(a - b)
-            return 1.0 / (1.0 + distance)
-        else:
-            return float(np.dot(a, b))  # inner product
+            # Zero vectors score 0, as FAISS normalizes them with a norm of 1
+            query_norm = float(np.linalg.norm(query)) or 1.0
+            return dots / (np.where(norms > 0, norms, 1.0) * query_norm)
+        if self.metric == "euclidean":
+            distances = np.maximum(norms * norms - 2.0 * dots + float(query @ query), 0.0)
+            return 1.0 / (1.0 + distances)
+        return dots  # inner product
+    
+    def _row_for_locked(self, entry_id: str) -> int:
+        row = self._rows.get(entry_id)
+        if row is None:
+            if self._free_rows:
+                row = self._free_rows.pop()
+            else:
+                row = len(self._row_ids)
+                if row == len(self._live):
+                    self._grow_locked(2 * len(self._live))
+                self._row_ids.append(None)
+            self._rows[entry_id] = row
+            self._row_ids[row] = entry_id
+        return row
+    
+    def _release_row_locked(self, entry_id: str) -> None:
+        row = self._rows.pop(entry_id, None)
+        if row is not None:
+            self._row_ids[row] = None
+            self._norms[row] = 0.0
+            self._live[row] = False
+            self._free_rows.append(row)
+    
+    def _grow_locked(self, capacity: int) -> None:
+        def grown(column: np.ndarray) -> np.ndarray:
+            new_column = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            new_column[:len(column)] = column
+            return new_column
+        
+        self._vectors = grown(self._vectors)
+        self._norms = grown(self._norms)
+        self._live = grown(self._live)
+        self._mmapped = False
+    
+    def _ensure_writable_locked(self) -> None:
+        """Copy a memory-mapped matrix into private memory before modifying it"""
+        if self._mmapped:
+            self._vectors = np.array(self._vectors)
+            self._mmapped = False
     
     def remove(self, entry_ids: List[str]) -> None:
         """Remove entries by ID."""
         with self._lock:
             for entry_id in entry_ids:
                 self.entries.pop(entry_id, None)
+                self._release_row_locked(entry_id)
     
     def clear(self) -> None:
         """Clear all entries."""
         with self._lock:
             self.entries.clear()
+            self._rows.clear()
+            self._row_ids.clear()
+            self._free_rows.clear()
+            self._live[:] = False
+            self._norms[:] = 0.0
+            if self._mmapped:
+                self._vectors = np.zeros((len(self._live), self.dimension), dtype=np.float32)
+                self._mmapped = False
     
     @property
     def size(self) -> int:
         """Get number of entries."""
         return len(self.entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Matrix occupancy."""
+        return {
+            "size": self.size,
+            "vectors": len(self._rows),
+            "capacity": len(self._live),
+            "free_rows": len(self._free_rows),
+            "dimension": self.dimension,
+            "memory_mapped": self._mmapped,
+        }
+    
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write a snapshot directory: embeddings as one float32 matrix
+        (embeddings.npy) with their norms (norms.npy), the entries without
+        their embeddings (entries.json; metadata values must be
+        JSON-serializable or are stored as strings) and a versioned
+        manifest.
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            embedded = [entry_id for entry_id in self.entries if entry_id in self._rows]
+            positions = {entry_id: position for position, entry_id in enumerate(embedded)}
+            rows = np.array([self._rows[entry_id] for entry_id in embedded], dtype=np.intp)
+            dimension = self.dimension or 0
+            matrix = (self._vectors[rows] if len(rows)
+                      else np.zeros((0, dimension), dtype=np.float32))
+            norms = self._norms[rows]
+            records = [{
+                "id": entry.id,
+                "content": entry.content,
+                "metadata": entry.metadata,
+                "timestamp": entry.timestamp.isoformat(),
+                "access_count": entry.access_count,
+                "importance_score": entry.importance_score,
+                "row": positions.get(entry.id, -1),
+            } for entry in self.entries.values()]
+            
+            def write_entries(tmp: str):
+                with open(tmp, "w") as f:
+                    json.dump(records, f, default=str)
+            
+            try:
+                _save_array(directory, "embeddings.npy", matrix)
+                _save_array(directory, "norms.npy", norms)
+                _write_snapshot_file(directory, "entries.json", write_entries)
+                _write_manifest(directory, type(self).__name__, settings={"metric": self.metric},
+                                dimension=dimension, size=len(records))
+            except Exception as e:
+                raise StorageError(f"Failed to save in-memory store: {e}")
+        logger.info(f"Saved in-memory store ({len(records)} entries) to {directory}")
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> "InMemoryVectorStore":
+        """
+        Open a snapshot written by save().
+        
+        With mmap, the embedding matrix is memory-mapped read-only and
+        searched in place (entry embeddings are views into it); the first
+        add copies it into private memory.
+        """
+        directory = Path(path)
+        manifest = _read_manifest(directory, cls.__name__)
+        try:
+            matrix = _load_array(directory, "embeddings.npy", mmap=mmap)
+            if (directory / "norms.npy").exists():
+                norms = np.array(_load_array(directory, "norms.npy"), dtype=np.float32)
+            else:
+                norms = np.linalg.norm(matrix, axis=1).astype(np.float32)
+            with open(directory / "entries.json") as f:
+                records = json.load(f)
+        except Exception as e:
+            raise StorageError(f"Failed to load in-memory store from {directory}: {e}")
+        store = cls(**manifest["settings"], initial_capacity=max(1, len(matrix)))
+        row_ids: List[Optional[str]] = [None] * len(matrix)
+        for record in records:
+            row = record["row"]
+            store.entries[record["id"]] = MemoryEntry(
+                id=record["id"],
+                content=record["content"],
+                embedding=matrix[row] if row >= 0 else None,
+                metadata=record["metadata"],
+                timestamp=datetime.fromisoformat(record["timestamp"]),
+                access_count=record["access_count"],
+                importance_score=record["importance_score"],
+            )
+            if row >= 0:
+                row_ids[row] = record["id"]
+        if len(matrix):
+            store.dimension = matrix.shape[1]
+            store._vectors = matrix
+            store._norms = norms
+            store._live = np.ones(len(matrix), dtype=bool)
+            store._row_ids = row_ids
+            store._rows = {entry_id: row for row, entry_id in enumerate(row_ids)}
+            store._mmapped = mmap
+        logger.info(f"Loaded in-memory store ({store.size} entries) from {directory}"
+                    f"{' (memory-mapped)' if mmap and len(matrix) else ''}")
+        return store
@@ -30,6 +30,8 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from .topk import top_k_stream
+
 
 @dataclass 
 class XPCommit:
@@ -78,6 +80,11 @@ class XPStoreEntry:
     content_hash: str  # Cryptographic hash of content for integrity
     access_count: int = 0
     metadata: Dict[str, Any] = field(default_factory=dict)
+    embedding_norm: float = field(default=-1.0, compare=False)  # Cached |embedding| (-1 = unknown)
+    
+    def __post_init__(self):
+        if self.embedding_norm < 0:
+            self.embedding_norm = np.linalg.norm(self.embedding)
     
     def update_access(self):
         """Update access statistics while preserving cryptographic integrity"""
@@ -218,19 +225,19 @@ class VersionedXPStore:
             valid_entries = {eid: entry for eid, entry in self.entries.items() 
                            if entry.commit_id in branch_commits}
             
-        similarities = []
-        for entry_id, entry in valid_entries.items():
-            # Verify cryptographic integrity before computing similarity
-            if self._verify_entry_integrity(entry):
-                # Simple cosine similarity
-                sim = np.dot(query_embedding, entry.embedding) / (
-                    np.linalg.norm(query_embedding) * np.linalg.norm(entry.embedding)
-                )
-                similarities.append((entry_id, float(sim)))
+        # Cosine similarity from the cached entry norms (one dot product each;
+        # an entry whose embedding changed fails the integrity check anyway)
+        query_norm = np.linalg.norm(query_embedding)
+        
+        def verified_similarities():
+            for entry_id, entry in valid_entries.items():
+                # Verify cryptographic integrity before computing similarity
+                if self._verify_entry_integrity(entry):
+                    sim = np.dot(query_embedding, entry.embedding) / (query_norm * entry.embedding_norm)
+                    yield entry_id, float(sim)
             
-        # Return top k
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        return similarities[:k]
+        # Return top k (bounded heap, no full sort)
+        return top_k_stream(verified_similarities(), k)
         
     def _get_branch_commits(self, branch: str) -> set:
         """Get all commit IDs in a branch's history"""
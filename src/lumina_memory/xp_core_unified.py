@@ -32,19 +32,37 @@ import numpy as np
 import time
 import hashlib
 import json
-from typing import Dict, List, Optional, Any, Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Set, Tuple, Union
 from dataclasses import dataclass, field
 from datetime import datetime
 import logging
+import threading
 
 # Import our mathematical foundation and existing components
 from .math_foundation import (
-    circular_convolution, circular_correlation, normalize_vector,
-    bind_role_filler, unbind_role_filler, memory_unit_score,
-    mathematical_coherence, instant_salience, hybrid_lexical_attribution,
+    circular_convolution, circular_correlation, normalize_vector, normalize_rows,
+    check_unit_norm, bind_role_filler, unbind_role_filler, memory_unit_score_normalized,
+    mathematical_coherence_normalized, coherence_embedding,
+    instant_salience, hybrid_lexical_attribution,
     get_current_timestamp, cosine_similarity
 )
 from .versioned_xp_store import VersionedXPStore, XPStoreEntry
+from .columnar_store import ColumnarUnitStore, SYNCED_FIELDS
+from .topk import top_k_indices, top_k_stream
+from .access_log import AccessLog, apply_accesses
+from .ann_index import ANNIndex, _VectorRows, create_ann_index
+from .embedding_cache import EmbeddingCache, get_shared_embedding_cache
+from .emotional_kernels import (
+    emotion_matrix, retrieval_boosts, similarity_boosts, importance_boosts, decay_resistances
+)
+from .emotion_index import EmotionIndex, DEFAULT_EMOTIONAL_SIMILARITY_THRESHOLD
+from .analysis_context import AnalysisContext, AnalysisMemo
+from .capacity_manager import CapacityManager, UnitArchive
+from .metadata_index import MetadataIndex
+from .time_index import TimeIndex, TIMESTAMP_FILTER
+from .near_duplicate import MinHashLSH
+from .lexical_index import BM25Index, reciprocal_rank_fusion
+from .query_cache import QueryResultCache, query_cache_key
 from .constants import (
     EPSILON, DEFAULT_W_SEMANTIC, DEFAULT_W_EMOTION,
     COHERENCE_HRR_WEIGHT, COHERENCE_SEM_WEIGHT,
@@ -54,14 +72,23 @@ from .emotional_weighting import (
     EmotionalState, EmotionalAnalyzer, EmotionalMemoryWeighter,
     ConsciousnessEmotionalIntegrator
 )
-from .enhanced_emotional_weighting import (
-    EnhancedEmotionalAnalyzer, EnhancedEmotionalMemoryWeighter,
-    EnhancedConsciousnessEmotionalIntegrator
-)
-from .consciousness_optimized_emotional_analysis import (
-    ConsciousnessOptimizedEmotionalAnalyzer, RobustMultiLibraryAnalyzer,
-    Enhanced6WClassification
-)
+from .lazy_imports import lazy_attributes, lazy_dir, start_warmup
+
+# Multi-library emotion analysis is imported on first use (see lazy_imports.py);
+# the names stay importable from this module
+_LAZY_EXPORTS = {
+    'EnhancedEmotionalAnalyzer': '.enhanced_emotional_weighting',
+    'EnhancedEmotionalMemoryWeighter': '.enhanced_emotional_weighting',
+    'EnhancedConsciousnessEmotionalIntegrator': '.enhanced_emotional_weighting',
+    'ConsciousnessOptimizedEmotionalAnalyzer': '.consciousness_optimized_emotional_analysis',
+    'RobustMultiLibraryAnalyzer': '.consciousness_optimized_emotional_analysis',
+    'Enhanced6WClassification': '.consciousness_optimized_emotional_analysis',
+}
+__getattr__ = lazy_attributes(globals(), _LAZY_EXPORTS)
+
+
+def __dir__():
+    return lazy_dir(globals(), _LAZY_EXPORTS)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -95,10 +122,17 @@ class UnifiedXPConfig:
     # Spatial topology
     k_neighbors: int = 10
     topology_update_threshold: float = 0.1
+    max_topology_degree: int = 32  # Edge cap per unit (0 = unbounded)
     spatial_decay_factor: float = 0.95
     
     # System limits
     max_memory_capacity: int = 10000
+    # Eviction is opt-in: "hard" (evict on ingest), "soft" (evict at maintenance) or
+    # "none". max_memory_capacity was never enforced before eviction existed, so the
+    # default keeps units; pick "hard"/"soft" (ideally with capacity_spill_dir) to bound memory.
+    capacity_policy: str = "none"
+    capacity_soft_margin: float = 0.1  # Soft policy: overshoot tolerated before ingest evicts
+    capacity_spill_dir: Optional[str] = None  # Archive evicted units here instead of deleting them
     max_commit_history: int = 1000
     batch_size: int = 32
     
@@ -111,10 +145,40 @@ class UnifiedXPConfig:
     deterministic_seed: int = 42
     parallel_processing: bool = False
     cache_embeddings: bool = True
+    embedding_cache_size: int = 10000  # In-memory LRU entries
+    embedding_cache_dir: Optional[str] = None  # Persistent memory-mapped tier (None = memory only)
+    use_columnar_store: bool = True  # Matrix-backed unit storage for vectorized scoring
+    validate_vector_norms: bool = False  # Check stored semantic/HRR vectors are unit-normalized
+    metadata_index_keys: Optional[Tuple[str, ...]] = None  # Metadata keys indexed for filters (None = all)
+    near_duplicate_gate: bool = False  # Merge near-duplicate ingests before embedding (see near_duplicate.py)
+    near_duplicate_threshold: float = 0.85  # Estimated Jaccard similarity of character shingles
+    near_duplicate_num_perm: int = 64  # MinHash signature length
+    
+    # Lexical (BM25) and hybrid retrieval (see lexical_index.py)
+    enable_lexical_index: bool = True  # Incremental BM25 index over unit content
+    retrieval_mode: str = "semantic"  # Kernel default: "semantic" or "hybrid" (BM25 + semantic, RRF)
+    hybrid_candidate_factor: int = 4  # Hybrid: candidates per requested result from each ranking
+    rrf_k: int = 60  # Reciprocal rank fusion constant
+    query_cache_size: int = 0  # Kernel retrieval result LRU entries (0 = disabled, see query_cache.py)
+    query_cache_ttl: Optional[float] = None  # Seconds a cached result stays valid (None = until the store changes)
+    
+    # Approximate nearest neighbour retrieval (pure NumPy, see ann_index.py)
+    ann_index: str = "none"  # "none", "ivf", "hnsw"
+    ann_min_units: int = 2048  # Exact search below this many units
+    ann_candidate_factor: int = 4  # ANN candidates per requested result, rescored exactly
+    ann_nprobe: int = 8  # IVF lists scanned per query
+    ann_ef_search: int = 64  # HNSW candidate list size per query
+    # "eager" (every match above the threshold, immediately) keeps the original retrieval
+    # semantics; opt into "deferred" to update only the returned top-k through a batched log
+    access_tracking: str = "eager"
+    decay_mode: str = "eager"  # "eager" (per-unit sweep on evolve) or "lazy" (closed form, see DecayClock)
+    decay_unit_stats: bool = True  # Per-unit stats from eager decay sweeps (summary only when False)
+    access_log_flush_size: int = 256
     
     # Emotional weighting settings
     enable_emotional_weighting: bool = True
     use_enhanced_emotional_analysis: bool = True  # Use external libraries for better emotion detection
+    model_warmup: str = "lazy"  # Analyzers/embedding/NLP models: "lazy" (first use), "background" (daemon thread), "eager"
     emotional_importance_factor: float = 2.2  # Increased to encourage emotional responses
     emotional_decay_influence: float = 0.8   # Increased for stronger emotional persistence
     emotional_retrieval_boost: float = 1.6   # Increased for better emotional recall
@@ -125,6 +189,15 @@ class UnifiedXPConfig:
 # XP UNIT - The Fundamental Mathematical Unit of Experience
 # =============================================================================
 
+# Kernel retrieval modes (UnifiedXPConfig.retrieval_mode)
+RETRIEVAL_MODES = ("semantic", "hybrid")
+
+# Kernel model loading (UnifiedXPConfig.model_warmup)
+WARMUP_MODES = ("lazy", "background", "eager")
+
+# Vector fields whose norms XPUnit caches (see XPUnit.vector_norm)
+UNIT_VECTOR_FIELDS = ('semantic_vector', 'hrr_shape', 'emotion_vector')
+
 @dataclass
 class XPUnit:
     """
@@ -157,6 +230,8 @@ class XPUnit:
     decay_rate: float
     importance: float
     access_count: int = 0
+    decay_reference: float = 0.0  # Decay-clock hours at which importance was last materialized
+    effective_decay_rate: float = 0.0  # decay_rate / emotional resistance (lazy decay)
     
     # Relational properties
     coherence_links: Dict[str, float] = field(default_factory=dict)
@@ -177,6 +252,85 @@ class XPUnit:
         if not self.last_access:
             self.last_access = self.timestamp
     
+    def __setattr__(self, name: str, value: Any):
+        """Write numeric state through to the owning ColumnarUnitStore, if any"""
+        object.__setattr__(self, name, value)
+        if name in UNIT_VECTOR_FIELDS:
+            self.__dict__.get('_vector_norms', {}).pop(name, None)
+        if name in SYNCED_FIELDS:
+            store = self.__dict__.get('_column_store')
+            if store is not None:
+                store.sync_field(self, name, self.__dict__[name])
+        if name in ('emotion_vector', 'decay_rate') and self.__dict__.get('_decay_clock') is not None:
+            self.refresh_effective_decay_rate()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle without the store and clock back-references (decay materialized)"""
+        state = self.__dict__.copy()
+        state['importance'] = self.importance
+        state.pop('_column_store', None)
+        state.pop('_decay_clock', None)
+        return state
+    
+    def _get_importance(self) -> float:
+        """Importance, decayed to the current decay-clock time when a clock is attached"""
+        state = self.__dict__
+        clock = state.get('_decay_clock')
+        importance = state['importance']
+        if clock is None:
+            return importance
+        elapsed = clock.hours - state['decay_reference']
+        if elapsed <= 0.0:
+            return importance
+        return importance * float(np.exp(-state['effective_decay_rate'] * elapsed))
+    
+    def _set_importance(self, value: float):
+        self.__dict__['importance'] = value
+        clock = self.__dict__.get('_decay_clock')
+        if clock is not None and self.__dict__.get('decay_reference') != clock.hours:
+            self.decay_reference = clock.hours
+    
+    def attach_decay_clock(self, clock: 'DecayClock'):
+        """
+        Switch this unit to lazy decay driven by a shared DecayClock.
+        
+        The current importance becomes the value at the clock's present
+        time; from then on reads of ``importance`` apply
+        exp(-effective_decay_rate * elapsed clock hours).
+        """
+        self.__dict__['importance'] = self.importance
+        self.__dict__['_decay_clock'] = clock
+        self.decay_reference = clock.hours
+        self.refresh_effective_decay_rate()
+    
+    def detach_decay_clock(self):
+        """Materialize the decayed importance and return to eager decay"""
+        importance = self.importance
+        self.__dict__['_decay_clock'] = None
+        self.importance = importance
+    
+    def refresh_effective_decay_rate(self):
+        """Recompute the lazy decay rate (after emotion or decay rate changes)"""
+        # Materialize decay accumulated under the previous rate first
+        self.importance = self.importance
+        resistance = self._calculate_emotional_decay_resistance(age_hours=0.0)
+        self.effective_decay_rate = float(self.decay_rate / resistance)
+    
+    def vector_norm(self, name: str) -> float:
+        """
+        Cached Euclidean norm of a vector field (semantic_vector, hrr_shape or
+        emotion_vector; 0.0 when unset).
+        
+        The cache is invalidated when the field is reassigned; mutate vectors
+        by reassignment, not in place.
+        """
+        norms = self.__dict__.setdefault('_vector_norms', {})
+        norm = norms.get(name)
+        if norm is None:
+            vector = self.__dict__[name]
+            norm = norms[name] = np.linalg.norm(vector) if vector is not None else 0.0
+        return norm
+    
     def _compute_content_hash(self) -> str:
         """Compute cryptographic hash of content for integrity"""
         content_data = {
@@ -198,6 +352,15 @@ class XPUnit:
         access_boost = min(0.1, self.access_count * 0.01)
         self.importance = min(2.0, self.importance + access_boost)
     
+    def record_accesses(self, n_accesses: int, timestamp: Optional[float] = None):
+        """Apply n accesses at once (same result as n update_access calls)"""
+        if n_accesses <= 0:
+            return
+        importance, access_count = apply_accesses(self.importance, self.access_count, n_accesses)
+        self.last_access = timestamp if timestamp is not None else get_current_timestamp()
+        self.access_count = int(access_count)
+        self.importance = float(importance)
+    
     def get_age_hours(self) -> float:
         """Get age in hours for decay calculations"""
         return (get_current_timestamp() - self.timestamp) / 3600.0
@@ -221,44 +384,24 @@ class XPUnit:
         effective_decay_factor = base_decay + ((1.0 - base_decay) * (emotional_modifier - 1.0) / emotional_modifier)
         return np.clip(effective_decay_factor, base_decay, 1.0)
     
-    def _calculate_emotional_decay_resistance(self) -> float:
+    def _calculate_emotional_decay_resistance(self, age_hours: Optional[float] = None) -> float:
         """
         Calculate decay resistance based on emotional content.
         
         Core principle: Deviation from emotional neutral increases persistence.
         Both strong positive and strong negative emotions resist decay.
-        """
-        emotion = self.get_emotional_state()
-        
-        # Base resistance from emotional intensity (distance from neutral)
-        intensity = emotion.intensity()
-        valence_deviation = abs(emotion.valence)  # Distance from neutral (0)
-        
-        # Base resistance: strong emotions resist decay
-        base_resistance = 1.0 + (intensity * 0.4)  # 1.0 to 1.4 multiplier
+        See emotional_kernels.decay_resistances for the formula.
         
-        # Valence deviation bonus: further from neutral = more persistent
-        valence_resistance = 1.0 + (valence_deviation * 0.3)  # 1.0 to 1.3 multiplier
-        
-        # Specific emotional persistence effects
-        fear_resistance = 1.0 + (emotion.fear * 0.5)      # Fear memories very persistent
-        curiosity_resistance = 1.0 + (emotion.curiosity * 0.3)  # Curiosity maintains access
-        arousal_resistance = 1.0 + (emotion.arousal * 0.2)      # High arousal = memorable
-        
-        # Combine resistances (multiplicative for compounding effects)
-        total_resistance = (base_resistance * valence_resistance * 
-                          fear_resistance * curiosity_resistance * arousal_resistance)
-        
-        # Time-dependent effects: some emotions strengthen over time
-        age_hours = self.get_age_hours()
-        if age_hours > 168:  # After 1 week
-            if emotion.fear > 0.7:  # Traumatic memories can strengthen
-                total_resistance *= 1.2
-            elif emotion.joy > 0.8:  # Very positive memories may persist longer
-                total_resistance *= 1.1
-        
-        # Cap resistance (memories can't become completely immune to decay)
-        return np.clip(total_resistance, 1.0, 3.0)  # 1x to 3x decay resistance
+        Args:
+            age_hours: Age used for the time-dependent effects (default: current age)
+        """
+        if age_hours is None:
+            age_hours = self.get_age_hours()
+        return decay_resistances(self._emotion_row(), age_hours)[0]
+    
+    def _emotion_row(self) -> np.ndarray:
+        """Emotional state as a (1, 6) matrix for the emotional kernels"""
+        return emotion_matrix([self.emotion_vector])
     
     def get_emotional_state(self) -> EmotionalState:
         """Get emotional state from emotion vector"""
@@ -270,8 +413,11 @@ class XPUnit:
         """Set emotional state by updating emotion vector"""
         emotion_vector = emotion.to_vector()
         if self.emotion_vector is not None and len(self.emotion_vector) > 6:
-            # Preserve any additional emotion dimensions
-            self.emotion_vector[:6] = emotion_vector
+            # Preserve any additional emotion dimensions (reassign so the
+            # column store sees the change)
+            extended = self.emotion_vector.copy()
+            extended[:6] = emotion_vector
+            self.emotion_vector = extended
         else:
             # Create new emotion vector
             self.emotion_vector = emotion_vector
@@ -282,36 +428,9 @@ class XPUnit:
         
         Core behavior: Deviation from emotional neutral increases importance.
         Both strong positive and strong negative emotions are more important.
+        See emotional_kernels.importance_boosts for the formula.
         """
-        emotion = self.get_emotional_state()
-        
-        # Base boost from emotional intensity
-        intensity = emotion.intensity()
-        base_boost = intensity * 0.4  # 0.0 to 0.4
-        
-        # Valence deviation boost: distance from neutral (0) increases importance
-        valence_deviation = abs(emotion.valence)
-        valence_boost = valence_deviation * 0.3  # 0.0 to 0.3
-        
-        # Specific emotional importance effects
-        fear_boost = emotion.fear * 0.5        # Fear memories are critically important
-        curiosity_boost = emotion.curiosity * 0.3  # Curiosity drives learning
-        arousal_boost = emotion.arousal * 0.2      # High arousal = significant
-        
-        # Joy and sadness both important (positive and negative peaks)
-        joy_boost = emotion.joy * 0.25
-        sadness_boost = getattr(emotion, 'sadness', 0) * 0.25
-        
-        # Combine all boosts
-        total_boost = (base_boost + valence_boost + fear_boost + 
-                      curiosity_boost + arousal_boost + joy_boost + sadness_boost)
-        
-        # Apply access pattern multiplier (frequently accessed emotional memories are very important)
-        if self.access_count > 2:
-            access_multiplier = 1.0 + (min(self.access_count, 10) * 0.05)  # Up to 1.5x
-            total_boost *= access_multiplier
-        
-        return np.clip(total_boost, 0.0, 1.5)  # Cap at 1.5 (150% boost)
+        return importance_boosts(self._emotion_row(), self.access_count)[0]
     
     def apply_temporal_decay(self, time_delta_hours: float = None) -> Dict[str, float]:
         """
@@ -359,79 +478,42 @@ class XPUnit:
         
         Core behavior: Strong emotions make memories easier to recall.
         Emotional similarity between query and memory provides additional boost.
+        See emotional_kernels.retrieval_boosts for the formula.
         """
-        memory_emotion = self.get_emotional_state()
-        
-        # Base boost from memory emotional intensity
-        memory_intensity = memory_emotion.intensity()
-        base_boost = memory_intensity * 0.3
-        
-        # Valence deviation boost (strong positive/negative easier to recall)
-        valence_boost = abs(memory_emotion.valence) * 0.2
-        
-        # Specific emotional recall effects
-        fear_boost = memory_emotion.fear * 0.4      # Fear memories very accessible
-        curiosity_boost = memory_emotion.curiosity * 0.25  # Curiosity maintains access
-        arousal_boost = memory_emotion.arousal * 0.15      # High arousal = memorable
-        
-        total_boost = base_boost + valence_boost + fear_boost + curiosity_boost + arousal_boost
-        
-        # Emotional similarity boost if query emotion provided
-        if query_emotion is not None:
-            similarity_boost = self._calculate_emotional_similarity_boost(query_emotion, memory_emotion)
-            total_boost += similarity_boost
-        
-        # Access pattern boost (frequently accessed memories easier to recall)
-        if self.access_count > 1:
-            access_boost = min(self.access_count * 0.05, 0.3)  # Up to 0.3 boost
-            total_boost += access_boost
-        
-        return np.clip(total_boost, 0.0, 1.0)  # Cap at 1.0 (100% boost)
+        return retrieval_boosts(self._emotion_row(), self.access_count, query_emotion)[0]
     
     def _calculate_emotional_similarity_boost(self, query_emotion: EmotionalState, 
                                             memory_emotion: EmotionalState) -> float:
         """Calculate boost from emotional similarity between query and memory"""
-        
-        # Valence similarity (same emotional direction)
-        valence_similarity = 1.0 - abs(query_emotion.valence - memory_emotion.valence)
-        valence_boost = valence_similarity * 0.2
-        
-        # Arousal similarity
-        arousal_similarity = 1.0 - abs(query_emotion.arousal - memory_emotion.arousal)
-        arousal_boost = arousal_similarity * 0.1
-        
-        # Specific emotion matching
-        fear_match = min(query_emotion.fear, memory_emotion.fear) * 0.3
-        curiosity_match = min(query_emotion.curiosity, memory_emotion.curiosity) * 0.2
-        joy_match = min(query_emotion.joy, memory_emotion.joy) * 0.15
-        
-        total_similarity_boost = (valence_boost + arousal_boost + 
-                                fear_match + curiosity_match + joy_match)
-        
-        return np.clip(total_similarity_boost, 0.0, 0.4)  # Cap similarity boost
+        return similarity_boosts(memory_emotion.to_vector(), query_emotion)[0]
     
     def score_against(self, query_unit: 'XPUnit', 
                      w_semantic: float = DEFAULT_W_SEMANTIC,
                      w_emotion: float = DEFAULT_W_EMOTION) -> float:
         """
         Mathematical scoring against another XP unit.
-        Uses canonical formulas from math_foundation.py
+        Uses canonical formulas from math_foundation.py (cached norms, so
+        the cosines reduce to dot products)
         """
-        return memory_unit_score(
+        return memory_unit_score_normalized(
             query_unit.semantic_vector, self.semantic_vector,
             query_unit.emotion_vector, self.emotion_vector,
             self.get_age_hours(), self.decay_rate, self.importance,
-            w_semantic, w_emotion
+            w_semantic, w_emotion,
+            query_unit.vector_norm('semantic_vector') * self.vector_norm('semantic_vector'),
+            query_unit.vector_norm('emotion_vector') * self.vector_norm('emotion_vector')
         )
     
     def compute_coherence_with(self, other: 'XPUnit') -> float:
         """
         Compute mathematical coherence with another unit.
-        Uses canonical formulas from math_foundation.py
+        Uses canonical formulas from math_foundation.py (cached norms)
         """
-        return mathematical_coherence(
+        return mathematical_coherence_normalized(
             self.hrr_shape, other.hrr_shape,
-            self.semantic_vector, other.semantic_vector
+            self.semantic_vector, other.semantic_vector,
+            self.vector_norm('hrr_shape') * other.vector_norm('hrr_shape'),
+            self.vector_norm('semantic_vector') * other.vector_norm('semantic_vector')
         )
     
     def bind_with_role(self, role: str, filler_unit: 'XPUnit') -> np.ndarray:
@@ -522,6 +604,12 @@ class XPUnit:
         )
 
 
+# importance is a dataclass field backed by a property so lazily decayed
+# units report their current value (the raw __dict__ entry holds the value
+# at decay_reference)
+XPUnit.importance = property(XPUnit._get_importance, XPUnit._set_importance)
+
+
 # =============================================================================
 # XP ENVIRONMENT - The Computational Container
 # =============================================================================
@@ -543,23 +631,49 @@ class XPEnvironment:
     - Production ready (optimized, error handling, logging)
     """
     
+    EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+    
     def __init__(self, config: UnifiedXPConfig = None):
         self.config = config or UnifiedXPConfig()
         
         # Core storage systems
         self.versioned_store = VersionedXPStore() if self.config.use_versioned_store else None
-        self.units: Dict[str, XPUnit] = {}
+        self._ann_index: Optional[ANNIndex] = None
+        self.metadata_index = MetadataIndex(self.config.metadata_index_keys)
+        self.time_index = TimeIndex()
+        self.lexical_index: Optional[BM25Index] = BM25Index() if self.config.enable_lexical_index else None
+        self.near_duplicate_index: Optional[MinHashLSH] = None
+        if self.config.near_duplicate_gate:
+            self.near_duplicate_index = MinHashLSH(self.config.near_duplicate_threshold,
+                                                   self.config.near_duplicate_num_perm,
+                                                   seed=self.config.deterministic_seed)
         self.relationship_graph: Dict[str, Dict[str, float]] = {}
         
         # Processing engines (initialized lazily)
         self._embedding_engine = None
+        self._embedding_model_name: Optional[str] = None  # None = uncached engine
+        self._embedding_cache: Optional[EmbeddingCache] = None
         self._nlp_pipeline = None
+        self._engine_lock = threading.Lock()  # Engines may be loaded by a warm-up thread
         self._vector_index = None
         
         # Mathematical operations
         self.decay_engine = DecayMathematicsEngine(self.config)
         self.consolidation_engine = ConsolidationEngine(self.config)
         self.relationship_manager = RelationshipManager(self.config)
+        self.access_log = AccessLog(self.config.access_log_flush_size)
+        self.capacity_manager = CapacityManager(
+            self.config.max_memory_capacity, self.config.capacity_policy,
+            self.config.capacity_soft_margin,
+            UnitArchive(self.config.capacity_spill_dir) if self.config.capacity_spill_dir else None
+        )
+        
+        # Store generation: advanced whenever stored units change in a way that
+        # affects ranking (see bump_generation); validates cached results
+        self.generation = 0
+        
+        # Unit storage (after the managers that index it)
+        self.units: Dict[str, XPUnit] = {}  # ColumnarUnitStore when use_columnar_store
         
         # Statistics
         self.stats = {
@@ -567,36 +681,204 @@ class XPEnvironment:
             'total_ingestions': 0,
             'total_retrievals': 0,
             'total_consolidations': 0,
+            'total_evictions': 0,
+            'near_duplicates_merged': 0,
             'avg_coherence': 0.0,
             'system_uptime': get_current_timestamp()
         }
         
         logger.info(f"XP Environment initialized with {self.config.embedding_dim}D embeddings")
     
+    @property
+    def units(self) -> Dict[str, XPUnit]:
+        """Unit mapping (content_id -> XPUnit)"""
+        return self._units
+    
+    @units.setter
+    def units(self, units: Dict[str, XPUnit]):
+        """Assigning a plain dict wraps it in a ColumnarUnitStore when enabled"""
+        if self.config.use_columnar_store and not isinstance(units, ColumnarUnitStore):
+            units = ColumnarUnitStore(units)
+        self._units = units
+        self._rebuild_unit_indexes()
+    
+    def bump_generation(self):
+        """
+        Mark the stored units as changed, invalidating cached retrieval
+        results. Called on ingest, consolidation, decay, removal and unit-map
+        replacement; call it after editing units directly.
+        """
+        self.generation += 1
+    
+    def _rebuild_unit_indexes(self):
+        """Rebuild secondary unit indexes from scratch (after the unit map is replaced)"""
+        self.bump_generation()
+        if self.config.validate_vector_norms:
+            for unit in self._units.values():
+                self._validate_unit_vectors(unit)
+        if self.config.decay_mode == "lazy":
+            if isinstance(self._units, ColumnarUnitStore):
+                self._units.decay_clock = self.decay_engine.clock
+            for unit in self._units.values():
+                unit.attach_decay_clock(self.decay_engine.clock)
+        self.relationship_manager.rebuild_index(self._units)
+        self.capacity_manager.invalidate()
+        self.metadata_index.clear()
+        self.time_index.clear()
+        for content_id, unit in self._units.items():
+            self.metadata_index.add(content_id, unit.metadata)
+            self.time_index.add(content_id, unit.timestamp)
+        if self.lexical_index is not None:
+            self.lexical_index.clear()
+            for content_id, unit in self._units.items():
+                self.lexical_index.add(content_id, unit.content)
+        if self.near_duplicate_index is not None:
+            self.near_duplicate_index.clear()
+            for content_id, unit in self._units.items():
+                self.near_duplicate_index.add(content_id, unit.content)
+        if isinstance(self._units, ColumnarUnitStore):
+            self._units.emotion_index = self._build_emotion_index()
+        self._ann_index = None
+        if self.config.ann_index != "none":
+            self._ann_index = create_ann_index(self.config.ann_index, self.config.embedding_dim)
+            if self._units:
+                self._ann_index.add(list(self._units),
+                                    [unit.semantic_vector for unit in self._units.values()])
+    
+    def _build_emotion_index(self) -> EmotionIndex:
+        index = EmotionIndex(max(1024, len(self._units)))
+        for content_id, unit in self._units.items():
+            index.update(content_id, unit.emotion_vector)
+        return index
+    
+    @property
+    def emotion_index(self) -> EmotionIndex:
+        """
+        Emotion-space index over all units.
+        
+        A ColumnarUnitStore keeps its index in sync with every emotion_vector
+        write and deletion; plain dict stores have no write hooks, so the
+        index is rebuilt on each access.
+        """
+        if isinstance(self._units, ColumnarUnitStore) and self._units.emotion_index is not None:
+            return self._units.emotion_index
+        return self._build_emotion_index()
+    
+    @staticmethod
+    def _validate_unit_vectors(unit: XPUnit):
+        """
+        Check the stored-vector invariant: semantic and HRR vectors are
+        unit-normalized at ingest (emotion vectors keep their magnitude, which
+        the emotional formulas use as intensity, and only carry a cached norm).
+        """
+        check_unit_norm(unit.semantic_vector, f"semantic_vector of {unit.content_id}")
+        check_unit_norm(unit.hrr_shape, f"hrr_shape of {unit.content_id}")
+    
+    def _index_unit(self, unit: XPUnit):
+        """Add a newly stored unit to the secondary indexes"""
+        self.bump_generation()
+        if self.config.validate_vector_norms:
+            self._validate_unit_vectors(unit)
+        if self.config.decay_mode == "lazy":
+            unit.attach_decay_clock(self.decay_engine.clock)
+        if self._ann_index is not None:
+            self._ann_index.add_item(unit.content_id, unit.semantic_vector)
+        self.metadata_index.add(unit.content_id, unit.metadata)
+        self.time_index.add(unit.content_id, unit.timestamp)
+        if self.lexical_index is not None:
+            self.lexical_index.add(unit.content_id, unit.content)
+        if self.near_duplicate_index is not None and unit.content_id not in self.near_duplicate_index:
+            self.near_duplicate_index.add(unit.content_id, unit.content)
+        self.capacity_manager.track(unit)
+    
+    def _near_duplicate_of(self, content: str) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        (content ID of a stored near-duplicate or None, MinHash signature of
+        the content); both None when the gate is off.
+        """
+        if self.near_duplicate_index is None:
+            return None, None
+        signature = self.near_duplicate_index.signature(content)
+        match = self.near_duplicate_index.query(signature=signature,
+                                                valid=self.units.__contains__)
+        if match is not None:
+            return match[0], signature
+        return None, signature
+    
+    def _ann_candidates(self, query_unit: XPUnit, k: int,
+                        allowed: Optional[Set[str]] = None) -> Optional[List[str]]:
+        """
+        Candidate content IDs from the ANN index, or None for exact search.
+        
+        Candidates are over-fetched (ann_candidate_factor * k) on semantic
+        similarity alone and then rescored with the full XP scoring formula.
+        With a filter (allowed IDs) the index only returns allowed units, and
+        exact search is used while the allowed subset is small.
+        """
+        n_searchable = len(self.units) if allowed is None else len(allowed)
+        if self._ann_index is None or n_searchable < self.config.ann_min_units:
+            return None
+        n_candidates = self.config.ann_candidate_factor * k + 1  # +1 in case the query is stored
+        if self.config.ann_index == "ivf":
+            params = {'nprobe': self.config.ann_nprobe}
+        else:
+            params = {'ef': self.config.ann_ef_search}
+        matches = self._ann_index.search(query_unit.semantic_vector, n_candidates,
+                                         allowed=allowed, **params)
+        return [content_id for content_id, _ in matches if content_id in self.units]
+    
+    def _filter_ids(self, filters: Optional[Dict[str, Any]]) -> Optional[Set[str]]:
+        """
+        Content IDs matching metadata filters (None = no filtering).
+        
+        The reserved "$timestamp" key holds a range condition on unit
+        timestamps and is answered by the time index.
+        """
+        if not filters:
+            return None
+        if TIMESTAMP_FILTER not in filters:
+            return self.metadata_index.match(filters)
+        filters = dict(filters)
+        allowed = self.time_index.select(filters.pop(TIMESTAMP_FILTER))
+        if filters and allowed:
+            allowed &= self.metadata_index.match(filters)
+        return allowed
+    
+    def units_between(self, start: Optional[float] = None,
+                      end: Optional[float] = None) -> List[XPUnit]:
+        """Units with start <= timestamp <= end (either bound optional), oldest first"""
+        return [self.units[content_id] for content_id in self.time_index.between(start, end)]
+    
     def _init_embedding_engine(self):
-        """Initialize embedding engine (lazy loading)"""
+        """Initialize embedding engine (lazy loading, safe to call from a warm-up thread)"""
         if self._embedding_engine is None:
-            try:
-                # Try to use SentenceTransformers if available
-                from sentence_transformers import SentenceTransformer
-                self._embedding_engine = SentenceTransformer('all-MiniLM-L6-v2')
-                logger.info("Initialized SentenceTransformers embedding engine")
-            except ImportError:
-                # Fallback to simple hash-based embeddings
-                self._embedding_engine = SimpleEmbeddingEngine(self.config.embedding_dim)
-                logger.info("Using simple hash-based embedding engine")
+            with self._engine_lock:
+                if self._embedding_engine is None:
+                    try:
+                        # Try to use SentenceTransformers if available
+                        from sentence_transformers import SentenceTransformer
+                        self._embedding_model_name = self.EMBEDDING_MODEL_NAME
+                        self._embedding_engine = SentenceTransformer(self.EMBEDDING_MODEL_NAME)
+                        logger.info("Initialized SentenceTransformers embedding engine")
+                    except ImportError:
+                        # Fallback to simple hash-based embeddings
+                        self._embedding_model_name = None
+                        self._embedding_engine = SimpleEmbeddingEngine(self.config.embedding_dim)
+                        logger.info("Using simple hash-based embedding engine")
         return self._embedding_engine
     
     def _init_nlp_pipeline(self):
-        """Initialize NLP pipeline (lazy loading)"""
+        """Initialize NLP pipeline (lazy loading, safe to call from a warm-up thread)"""
         if self._nlp_pipeline is None:
-            try:
-                import spacy
-                self._nlp_pipeline = spacy.load("en_core_web_sm")
-                logger.info("Initialized SpaCy NLP pipeline")
-            except (ImportError, OSError):
-                self._nlp_pipeline = SimpleNLPPipeline()
-                logger.info("Using simple NLP pipeline")
+            with self._engine_lock:
+                if self._nlp_pipeline is None:
+                    try:
+                        import spacy
+                        self._nlp_pipeline = spacy.load("en_core_web_sm")
+                        logger.info("Initialized SpaCy NLP pipeline")
+                    except (ImportError, OSError):
+                        self._nlp_pipeline = SimpleNLPPipeline()
+                        logger.info("Using simple NLP pipeline")
         return self._nlp_pipeline
     
     def _generate_content_id(self, content: str) -> str:
@@ -616,7 +898,7 @@ class XPEnvironment:
         
         if hasattr(engine, 'encode'):
             # SentenceTransformers
-            embedding = engine.encode(content)
+            embedding = self._encode_cached([content], engine)[0]
             # Pad or truncate to desired dimension
             if len(embedding) != self.config.embedding_dim:
                 if len(embedding) > self.config.embedding_dim:
@@ -628,73 +910,168 @@ class XPEnvironment:
             # Simple engine
             embedding = engine.encode(content)
         
-        return embedding.astype(VECTOR_DTYPE)
+        # Stored semantic vectors are unit-normalized, so cosines are dot products
+        return normalize_rows(embedding.astype(VECTOR_DTYPE))[0]
+    
+    def _compute_semantic_vectors(self, contents: List[str]) -> np.ndarray:
+        """Compute semantic embeddings for several texts with one encode call"""
+        contents = [str(content) for content in contents]
+        engine = self._init_embedding_engine()
+        embeddings = np.atleast_2d(np.asarray(self._encode_cached(contents, engine)))
+        
+        # Pad or truncate to desired dimension
+        dim = self.config.embedding_dim
+        if embeddings.shape[1] > dim:
+            embeddings = embeddings[:, :dim]
+        elif embeddings.shape[1] < dim:
+            padding = np.zeros((len(embeddings), dim - embeddings.shape[1]))
+            embeddings = np.concatenate([embeddings, padding], axis=1)
+        
+        # Stored semantic vectors are unit-normalized, so cosines are dot products
+        return normalize_rows(embeddings.astype(VECTOR_DTYPE))
+    
+    def _encode_cached(self, contents: List[str], engine) -> np.ndarray:
+        """
+        Encode texts through the shared embedding cache (one encode call for all misses).
+        
+        The hash-based fallback engine is not cached: it is cheap and its
+        vectors are only stable within one process.
+        """
+        cache = self.embedding_cache
+        if cache is None or self._embedding_model_name is None:
+            return np.atleast_2d(np.asarray(engine.encode(contents)))
+        return cache.encode(self._embedding_model_name, contents,
+                            lambda texts: engine.encode(texts))
+    
+    @property
+    def embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Shared embedding cache (None when cache_embeddings is off)"""
+        if not self.config.cache_embeddings:
+            return None
+        if self._embedding_cache is None:
+            self._embedding_cache = get_shared_embedding_cache(
+                self.config.embedding_cache_size, self.config.embedding_cache_dir
+            )
+        return self._embedding_cache
     
     def _compute_hrr_shape(self, semantic_vector: np.ndarray, 
                           metadata: Dict[str, Any]) -> np.ndarray:
         """Compute holographic shape using HRR operations"""
-        # Create context vector from metadata
-        context_seed = abs(hash(json.dumps(metadata, sort_keys=True))) % (2**32)
-        rng = np.random.default_rng(context_seed)
-        context_vector = normalize_vector(rng.normal(size=self.config.hrr_dim))
-        
-        # Pad or project semantic vector to HRR dimension
-        if len(semantic_vector) != self.config.hrr_dim:
-            if len(semantic_vector) > self.config.hrr_dim:
-                sem_proj = semantic_vector[:self.config.hrr_dim]
-            else:
-                padding = np.zeros(self.config.hrr_dim - len(semantic_vector))
-                sem_proj = np.concatenate([semantic_vector, padding])
-        else:
-            sem_proj = semantic_vector.copy()
+        return self._compute_hrr_shapes(np.atleast_2d(semantic_vector), [metadata])[0]
+    
+    def _compute_hrr_shapes(self, semantic_vectors: np.ndarray,
+                            metadatas: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Compute holographic shapes for a batch of units.
+        
+        The binding runs as one batched rfft/irfft over the (n, hrr_dim)
+        matrix; every row is computed exactly as it would be on its own.
+        """
+        hrr_dim = self.config.hrr_dim
+        
+        # Create context vectors from metadata
+        context_vectors = np.empty((len(metadatas), hrr_dim))
+        for i, metadata in enumerate(metadatas):
+            context_seed = abs(hash(json.dumps(metadata, sort_keys=True))) % (2**32)
+            rng = np.random.default_rng(context_seed)
+            context_vectors[i] = normalize_vector(rng.normal(size=hrr_dim))
+        
+        # Pad or project semantic vectors to HRR dimension
+        width = min(semantic_vectors.shape[1], hrr_dim)
+        sem_proj = np.zeros((len(semantic_vectors), hrr_dim))
+        sem_proj[:, :width] = semantic_vectors[:, :width]
         
         # Bind semantic and context using circular convolution
-        hrr_shape = circular_convolution(sem_proj, context_vector)
-        return normalize_vector(hrr_shape).astype(VECTOR_DTYPE)
+        hrr_shapes = circular_convolution(sem_proj, context_vectors)
+        return normalize_rows(hrr_shapes).astype(VECTOR_DTYPE)
     
-    def _compute_emotion_vector(self, content: str) -> np.ndarray:
-        """Compute emotion vector (simple heuristic or NLP-based)"""
-        nlp = self._init_nlp_pipeline()
+    def analyze(self, text: str, memo: Optional[AnalysisMemo] = None) -> AnalysisContext:
+        """Analysis context for a text with the environment's NLP fields (doc, emotion vector)"""
+        return self.analyze_batch([text], memo)[0]
+    
+    def analyze_batch(self, texts: List[str],
+                      memo: Optional[AnalysisMemo] = None) -> List[AnalysisContext]:
+        """
+        Analysis contexts for several texts, parsing each distinct text once.
         
-        if hasattr(nlp, '__call__'):
-            # SpaCy pipeline
-            doc = nlp(content)
-            # Simple emotion heuristics based on linguistic features
-            word_count = len(doc)
-            entity_count = len(doc.ents)
-            
-            # [joy, anger, fear, sadness, surprise, neutral]
-            emotion_vec = np.array([
-                min(1.0, word_count / 50.0) * 0.6,  # joy from content richness
-                0.1,  # baseline anger
-                0.05,  # baseline fear
-                0.1,  # baseline sadness
-                min(1.0, entity_count / 5.0) * 0.3,  # surprise from entities
-                0.5  # neutral baseline
-            ], dtype=VECTOR_DTYPE)
+        Texts already analyzed in the memo are reused; the rest are streamed
+        through nlp.pipe when available.
+        """
+        if memo is None:
+            memo = AnalysisMemo()
+        contexts = [memo.get(str(text)) for text in texts]
+        pending = list({id(context): context for context in contexts
+                        if context.emotion_vector is None}.values())
+        if not pending:
+            return contexts
+        
+        nlp = self._init_nlp_pipeline()
+        if hasattr(nlp, 'pipe'):
+            docs = nlp.pipe([context.text for context in pending])
+        elif hasattr(nlp, '__call__'):
+            docs = (nlp(context.text) for context in pending)
         else:
-            # Simple heuristic
-            word_count = len(content.split())
-            excitement = min(1.0, word_count / 50.0)
-            
-            emotion_vec = np.array([
-                excitement * 0.6,  # joy
-                0.1,  # anger
-                0.05,  # fear
-                0.1,  # sadness
-                excitement * 0.3,  # surprise
-                1.0 - excitement  # neutral
-            ], dtype=VECTOR_DTYPE)
+            for context in pending:
+                context.emotion_vector = self._heuristic_emotion_vector(context.text)
+            return contexts
+        for context, doc in zip(pending, docs):
+            context.doc = doc
+            context.emotion_vector = self._emotion_vector_from_doc(doc)
+        return contexts
+    
+    def _compute_emotion_vector(self, content: str,
+                                memo: Optional[AnalysisMemo] = None) -> np.ndarray:
+        """Compute emotion vector (simple heuristic or NLP-based)"""
+        return self.analyze(content, memo).emotion_vector
+    
+    def _compute_emotion_vectors(self, contents: List[str],
+                                 memo: Optional[AnalysisMemo] = None) -> List[np.ndarray]:
+        """Compute emotion vectors for several texts (streams them through nlp.pipe when available)"""
+        return [context.emotion_vector for context in self.analyze_batch(contents, memo)]
+    
+    def _emotion_vector_from_doc(self, doc) -> np.ndarray:
+        """Emotion heuristics based on linguistic features of a parsed document"""
+        word_count = len(doc)
+        entity_count = len(doc.ents)
+        
+        # [joy, anger, fear, sadness, surprise, neutral]
+        emotion_vec = np.array([
+            min(1.0, word_count / 50.0) * 0.6,  # joy from content richness
+            0.1,  # baseline anger
+            0.05,  # baseline fear
+            0.1,  # baseline sadness
+            min(1.0, entity_count / 5.0) * 0.3,  # surprise from entities
+            0.5  # neutral baseline
+        ], dtype=VECTOR_DTYPE)
         
         # Normalize to unit vector
         return normalize_vector(emotion_vec)
     
-    def ingest_experience(self, content: str, metadata: Dict[str, Any] = None) -> XPUnit:
+    def _heuristic_emotion_vector(self, content: str) -> np.ndarray:
+        """Emotion heuristics from word count alone (no NLP pipeline)"""
+        word_count = len(content.split())
+        excitement = min(1.0, word_count / 50.0)
+        
+        emotion_vec = np.array([
+            excitement * 0.6,  # joy
+            0.1,  # anger
+            0.05,  # fear
+            0.1,  # sadness
+            excitement * 0.3,  # surprise
+            1.0 - excitement  # neutral
+        ], dtype=VECTOR_DTYPE)
+        
+        # Normalize to unit vector
+        return normalize_vector(emotion_vec)
+    
+    def ingest_experience(self, content: str, metadata: Dict[str, Any] = None,
+                          memo: Optional[AnalysisMemo] = None) -> XPUnit:
         """
         Ingest new experience into XP unit with complete mathematical processing.
         
         This is the core method that transforms raw experience into mathematical
-        representation with all XP Core properties.
+        representation with all XP Core properties. Pass the request's
+        AnalysisMemo to reuse analysis already done on the text.
         """
         if not content.strip():
             raise ValueError("Content cannot be empty")
@@ -708,13 +1085,24 @@ class XPEnvironment:
         if content_id in self.units:
             existing_unit = self.units[content_id]
             existing_unit.update_access()
+            self.bump_generation()  # Importance and access count feed the ranking
             logger.info(f"Retrieved existing unit: {content_id[:16]}...")
             return existing_unit
         
+        # Near-duplicate gate: merge before paying for embedding and topology
+        duplicate_of, signature = self._near_duplicate_of(content)
+        if duplicate_of is not None:
+            existing_unit = self.units[duplicate_of]
+            existing_unit.update_access()
+            self.bump_generation()
+            self.stats['near_duplicates_merged'] += 1
+            logger.info(f"Merged near-duplicate into unit: {duplicate_of[:16]}...")
+            return existing_unit
+        
         # Compute mathematical representations
         semantic_vector = self._compute_semantic_vector(content)
         hrr_shape = self._compute_hrr_shape(semantic_vector, metadata)
-        emotion_vector = self._compute_emotion_vector(content)
+        emotion_vector = self._compute_emotion_vector(content, memo)
         
         # Create XP unit with all mathematical properties
         unit = XPUnit(
@@ -740,6 +1128,9 @@ class XPEnvironment:
         
         # Store in environment
         self.units[content_id] = unit
+        if signature is not None:
+            self.near_duplicate_index.add(content_id, signature=signature)
+        self._index_unit(unit)
         
         # Update spatial topology
         self.relationship_manager.update_topology(unit, self.units)
@@ -748,53 +1139,397 @@ class XPEnvironment:
         self.stats['total_units'] += 1
         self.stats['total_ingestions'] += 1
         
+        self.enforce_capacity(protected=[content_id])
+        
         logger.info(f"Ingested XP unit: {content_id[:16]}... (dim={len(semantic_vector)})")
         return unit
     
+    def ingest_experiences_batch(self, contents: List[str],
+                                 metadatas: Optional[List[Dict[str, Any]]] = None,
+                                 memo: Optional[AnalysisMemo] = None) -> List[XPUnit]:
+        """
+        Ingest many experiences at once.
+        
+        Produces the same units, vectors and topology as calling
+        ingest_experience on each item in order, but embeds all new texts
+        with one encode call, computes HRR shapes with one batched FFT,
+        streams emotion analysis through the NLP pipeline, writes a single
+        versioned-store commit and updates the topology once for the batch.
+        
+        Returns:
+            One XPUnit per input, in input order (duplicates and, with the
+            near-duplicate gate, near-duplicates of stored units or earlier
+            batch items return the existing unit, exactly like
+            ingest_experience)
+        """
+        if metadatas is None:
+            metadatas = [None] * len(contents)
+        if len(metadatas) != len(contents):
+            raise ValueError("metadatas must have one entry per content")
+        for content in contents:
+            if not content.strip():
+                raise ValueError("Content cannot be empty")
+        
+        # Split into new units and duplicates (of stored units or earlier batch items)
+        content_ids = [self._generate_content_id(content) for content in contents]
+        new_positions: List[int] = []
+        merged_into: Dict[int, str] = {}  # Position -> near-duplicate's content ID
+        seen = set()
+        for i, content_id in enumerate(content_ids):
+            if content_id in self.units or content_id in seen:
+                continue
+            if self.near_duplicate_index is not None:
+                signature = self.near_duplicate_index.signature(contents[i])
+                match = self.near_duplicate_index.query(
+                    signature=signature,
+                    valid=lambda item_id: item_id in self.units or item_id in seen)
+                if match is not None:
+                    merged_into[i] = match[0]
+                    continue
+                # Index the pending item now so later batch items can match it
+                self.near_duplicate_index.add(content_id, signature=signature)
+            seen.add(content_id)
+            new_positions.append(i)
+        
+        try:
+            new_units = self._store_batch(contents, metadatas, content_ids, new_positions, memo)
+        except Exception:
+            # Pending signatures of units that were never stored must not match later ingests
+            if self.near_duplicate_index is not None:
+                for content_id in seen - set(self.units):
+                    self.near_duplicate_index.remove(content_id)
+            raise
+        
+        # Duplicates behave like repeated ingest_experience calls
+        new_position_set = set(new_positions)
+        results = []
+        for i, content_id in enumerate(content_ids):
+            unit = self.units[merged_into.get(i, content_id)]
+            if i not in new_position_set:
+                unit.update_access()
+            results.append(unit)
+        if len(new_position_set) < len(content_ids):
+            self.bump_generation()
+        self.stats['near_duplicates_merged'] += len(merged_into)
+        
+        # Units of a batch larger than the capacity can be evicted before returning
+        self.enforce_capacity(protected=set(content_ids))
+        
+        logger.info(f"Ingested batch of {len(contents)} experiences ({len(new_units)} new units)")
+        return results
+    
+    def _store_batch(self, contents: List[str], metadatas: List[Optional[Dict[str, Any]]],
+                     content_ids: List[str], new_positions: List[int],
+                     memo: Optional[AnalysisMemo]) -> List[XPUnit]:
+        """Embed, store, index and link the new units of a batch"""
+        new_contents = [str(contents[i]) for i in new_positions]
+        new_metadatas = [metadatas[i] or {} for i in new_positions]
+        new_units: List[XPUnit] = []
+        if new_positions:
+            # Compute mathematical representations for the whole batch
+            semantic_vectors = self._compute_semantic_vectors(new_contents)
+            hrr_shapes = self._compute_hrr_shapes(semantic_vectors, new_metadatas)
+            emotion_vectors = self._compute_emotion_vectors(new_contents, memo)
+            
+            commit_id = None
+            if self.versioned_store:
+                commit_id = self.versioned_store.commit(
+                    changes={'action': 'ingest_batch',
+                             'content_ids': [content_ids[i] for i in new_positions]},
+                    message=f"Ingest batch: {len(new_positions)} experiences"
+                )
+            
+            decay_rate = np.log(2) / self.config.decay_half_life
+            for j, i in enumerate(new_positions):
+                now = get_current_timestamp()
+                unit = XPUnit(
+                    content_id=content_ids[i],
+                    content=new_contents[j],
+                    semantic_vector=semantic_vectors[j],
+                    hrr_shape=hrr_shapes[j],
+                    emotion_vector=emotion_vectors[j],
+                    timestamp=now,
+                    last_access=now,
+                    decay_rate=decay_rate,
+                    importance=1.0,
+                    metadata=new_metadatas[j]
+                )
+                unit.commit_id = commit_id
+                self.units[unit.content_id] = unit
+                self._index_unit(unit)
+                new_units.append(unit)
+            
+            # Update spatial topology once for the whole batch
+            self.relationship_manager.update_topology_batch(new_units, self.units)
+            
+            self.stats['total_units'] += len(new_units)
+            self.stats['total_ingestions'] += len(new_units)
+        return new_units
+    
+    def _make_query_unit(self, query_str: str,
+                         semantic_vector: Optional[np.ndarray] = None,
+                         memo: Optional[AnalysisMemo] = None) -> XPUnit:
+        """Create a temporary query unit for a string query"""
+        # Ensure proper string conversion (numpy strings)
+        query_str = str(query_str)
+        if semantic_vector is None:
+            semantic_vector = self._compute_semantic_vector(query_str)
+        return XPUnit(
+            content_id="query_temp",
+            content=query_str,
+            semantic_vector=semantic_vector,
+            hrr_shape=np.zeros(self.config.hrr_dim, dtype=VECTOR_DTYPE),
+            emotion_vector=self._compute_emotion_vector(query_str, memo),
+            timestamp=get_current_timestamp(),
+            last_access=get_current_timestamp(),
+            decay_rate=0.0,
+            importance=1.0
+        )
+    
     def retrieve_similar(self, query: Union[str, XPUnit], k: int = 10, 
-                        threshold: float = 0.0) -> List[Tuple[XPUnit, float]]:
+                        threshold: float = 0.0,
+                        memo: Optional[AnalysisMemo] = None,
+                        filters: Optional[Dict[str, Any]] = None,
+                        track_access: bool = True,
+                        allowed_ids: Optional[Set[str]] = None) -> List[Tuple[XPUnit, float]]:
         """
         Retrieve similar XP units using mathematical similarity.
         
         Supports both string queries and XPUnit queries for maximum flexibility.
+        ``filters`` restricts the search to units whose metadata matches (see
+        metadata_index.py for the filter syntax, plus "$timestamp" for a range
+        on unit timestamps); only matching units are scored.
+        ``track_access=False`` leaves access statistics untouched (for
+        internal candidate generation). ``allowed_ids`` is an already
+        resolved filter (see _filter_ids) and takes the place of ``filters``.
         """
+        if isinstance(self.units, ColumnarUnitStore):
+            return self.retrieve_similar_batch([query], k, threshold, memo, filters,
+                                               track_access, allowed_ids)[0]
+        
         if isinstance(query, str) or hasattr(query, 'dtype'):  # Handle numpy strings
-            # Ensure proper string conversion
-            query_str = str(query)
-            # Create temporary query unit
-            query_unit = XPUnit(
-                content_id="query_temp",
-                content=query_str,
-                semantic_vector=self._compute_semantic_vector(query_str),
-                hrr_shape=np.zeros(self.config.hrr_dim, dtype=VECTOR_DTYPE),
-                emotion_vector=self._compute_emotion_vector(query_str),
-                timestamp=get_current_timestamp(),
-                last_access=get_current_timestamp(),
-                decay_rate=0.0,
-                importance=1.0
-            )
+            query_unit = self._make_query_unit(query, memo=memo)
         else:
             query_unit = query
         
-        # Compute similarities with all units
+        # Compute similarities with all (matching) units, or the ANN candidates
+        allowed = self._filter_ids(filters) if allowed_ids is None else allowed_ids
+        candidates = self._ann_candidates(query_unit, k, allowed)
+        if candidates is not None:
+            unit_items = ((cid, self.units[cid]) for cid in candidates)
+        elif allowed is not None:
+            unit_items = ((cid, unit) for cid, unit in self.units.items() if cid in allowed)
+        else:
+            unit_items = self.units.items()
+        eager_access = track_access and self.config.access_tracking == "eager"
         similarities = []
-        for unit_id, unit in self.units.items():
+        for unit_id, unit in unit_items:
             if unit_id == query_unit.content_id:
                 continue  # Skip self
             
             score = unit.score_against(query_unit)
             if score >= threshold:
                 similarities.append((unit, score))
-                unit.update_access()  # Update access statistics
+                if eager_access:
+                    unit.update_access()  # Update access statistics
         
-        # Sort by similarity and return top k
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        # Select top k with a bounded heap instead of a full sort
+        similarities = top_k_stream(similarities, k)
+        if track_access and not eager_access:
+            self._log_access(unit.content_id for unit, _ in similarities)
         
         # Update statistics
         self.stats['total_retrievals'] += 1
         
-        logger.info(f"Retrieved {min(k, len(similarities))} similar units for query")
-        return similarities[:k]
+        logger.info(f"Retrieved {len(similarities)} similar units for query")
+        return similarities
+    
+    def retrieve_similar_batch(self, queries: List[Union[str, XPUnit]], k: int = 10,
+                               threshold: float = 0.0,
+                               memo: Optional[AnalysisMemo] = None,
+                               filters: Optional[Dict[str, Any]] = None,
+                               track_access: bool = True,
+                               allowed_ids: Optional[Set[str]] = None
+                               ) -> List[List[Tuple[XPUnit, float]]]:
+        """
+        Retrieve similar XP units for several queries at once.
+        
+        String queries are embedded with a single encode call and all queries
+        are scored against the unit store with one matrix-matrix product.
+        Results (including access statistics updates) are identical to calling
+        retrieve_similar for each query in order. ``filters`` applies to every
+        query.
+        """
+        return list(self.iter_retrieve_similar_batch(queries, k, threshold, memo, filters,
+                                                     track_access, allowed_ids))
+    
+    def iter_retrieve_similar_batch(self, queries: List[Union[str, XPUnit]], k: int = 10,
+                                    threshold: float = 0.0,
+                                    memo: Optional[AnalysisMemo] = None,
+                                    filters: Optional[Dict[str, Any]] = None,
+                                    track_access: bool = True,
+                                    allowed_ids: Optional[Set[str]] = None
+                                    ) -> Iterator[List[Tuple[XPUnit, float]]]:
+        """
+        Generator form of retrieve_similar_batch.
+        
+        Each query's results are ranked (and their access statistics updated)
+        only when requested, so callers can read unit state between queries
+        exactly as they would between sequential retrieve_similar calls.
+        """
+        if memo is None:
+            memo = AnalysisMemo()
+        if not isinstance(self.units, ColumnarUnitStore):
+            for query in queries:
+                yield self.retrieve_similar(query, k, threshold, memo, filters, track_access,
+                                            allowed_ids)
+            return
+        
+        # Build query units, embedding all string queries in one call and
+        # parsing each distinct query text once
+        is_text = [isinstance(q, str) or hasattr(q, 'dtype') for q in queries]
+        texts = [str(q) for q, text in zip(queries, is_text) if text]
+        text_vectors = iter(self._compute_semantic_vectors(texts)) if texts else iter(())
+        self.analyze_batch(texts, memo)
+        query_units = [
+            self._make_query_unit(q, next(text_vectors), memo) if text else q
+            for q, text in zip(queries, is_text)
+        ]
+        if not query_units:
+            return
+        
+        # One matrix-matrix product for the similarity part of every score
+        store = self.units
+        query_semantic = np.stack([q.semantic_vector for q in query_units])
+        query_emotion = None
+        if any(q.emotion_vector is not None for q in query_units):
+            emotion_dim = max(len(q.emotion_vector) for q in query_units
+                              if q.emotion_vector is not None)
+            query_emotion = np.full((len(query_units), emotion_dim), np.nan, dtype=VECTOR_DTYPE)
+            for i, q in enumerate(query_units):
+                if q.emotion_vector is not None:
+                    query_emotion[i] = q.emotion_vector
+        # Metadata filters restrict scoring (or the ANN search) to the matching rows
+        allowed = self._filter_ids(filters) if allowed_ids is None else allowed_ids
+        filter_rows = None if allowed is None else store.rows_of(allowed)
+        n_searchable = len(store) if filter_rows is None else len(filter_rows)
+        use_ann = self._ann_index is not None and n_searchable >= self.config.ann_min_units
+        if not use_ann:
+            rows, similarity = store.similarities(query_semantic, query_emotion, rows=filter_rows)
+        
+        # Decay/importance are applied per query, after the previous query's
+        # access updates, so results match sequential retrieval
+        for i, query_unit in enumerate(query_units):
+            if use_ann:
+                # Exact rescoring of this query's ANN candidates only
+                candidate_rows = np.sort(np.array(
+                    [store.row_of(cid) for cid in self._ann_candidates(query_unit, k, allowed)],
+                    dtype=np.int64))
+                rows, candidate_similarity = store.similarities(
+                    query_semantic[i], None if query_emotion is None else query_emotion[i],
+                    rows=candidate_rows)
+                query_similarity = candidate_similarity[0]
+            else:
+                query_similarity = similarity[i]
+            scores = store.weighted_scores(rows, query_similarity)
+            similarities = self._rank_scored_rows(rows, scores, query_unit, k, threshold,
+                                                  track_access)
+            self.stats['total_retrievals'] += 1
+            logger.info(f"Retrieved {len(similarities)} similar units for query")
+            yield similarities
+    
+    def _rank_scored_rows(self, rows: np.ndarray, scores: np.ndarray, query_unit: XPUnit,
+                          k: int, threshold: float,
+                          track_access: bool = True) -> List[Tuple[XPUnit, float]]:
+        """Threshold, access-update and select the top k of scored column store rows"""
+        store = self.units
+        keep = scores >= threshold
+        if query_unit.content_id in store:
+            keep &= rows != store.row_of(query_unit.content_id)  # Skip self
+        rows, scores = rows[keep], scores[keep]
+        
+        eager_access = track_access and self.config.access_tracking == "eager"
+        if eager_access:
+            for row in rows:
+                store.unit_at(row).update_access()  # Update access statistics
+        
+        # Partial sort: O(n) selection, ties keep insertion order like list.sort
+        similarities = [(store.unit_at(rows[i]), float(scores[i])) for i in top_k_indices(scores, k)]
+        if track_access and not eager_access:
+            self._log_access(unit.content_id for unit, _ in similarities)
+        return similarities
+    
+    def retrieve_lexical(self, query: str, k: int = 10,
+                         filters: Optional[Dict[str, Any]] = None) -> List[Tuple[XPUnit, float]]:
+        """
+        Keyword retrieval: the top k units by BM25 score over their content.
+        
+        An inverted-index lookup over the query's terms; nothing is embedded.
+        Requires enable_lexical_index.
+        """
+        if self.lexical_index is None:
+            raise ValueError("Lexical retrieval requires enable_lexical_index")
+        matches = self.lexical_index.search(str(query), k, self._filter_ids(filters))
+        results = [(self.units[content_id], score) for content_id, score in matches]
+        self._record_result_access(results)
+        self.stats['total_retrievals'] += 1
+        return results
+    
+    def retrieve_hybrid(self, query: Union[str, XPUnit], k: int = 10,
+                        threshold: float = 0.0,
+                        memo: Optional[AnalysisMemo] = None,
+                        filters: Optional[Dict[str, Any]] = None) -> List[Tuple[XPUnit, float]]:
+        """
+        Hybrid retrieval: BM25 and semantic rankings fused with reciprocal
+        rank fusion.
+        
+        Each ranking contributes hybrid_candidate_factor * k candidates.
+        ``threshold`` applies to the semantic scores only, so exact keyword
+        hits survive even when their embeddings are dissimilar. Returned
+        scores are RRF scores (higher is better).
+        """
+        if self.lexical_index is None:
+            raise ValueError("Hybrid retrieval requires enable_lexical_index")
+        n_candidates = self.config.hybrid_candidate_factor * k
+        allowed = self._filter_ids(filters)  # Resolved once for both rankings
+        semantic = self.retrieve_similar(query, n_candidates, threshold, memo,
+                                         track_access=False, allowed_ids=allowed)
+        if isinstance(query, XPUnit):
+            query_text, query_id = query.content, query.content_id
+        else:
+            query_text, query_id = str(query), None
+        lexical = self.lexical_index.search(query_text, n_candidates + 1, allowed)
+        fused = reciprocal_rank_fusion(
+            [[unit.content_id for unit, _ in semantic],
+             [content_id for content_id, _ in lexical if content_id != query_id]],
+            self.config.rrf_k
+        )[:k]
+        results = [(self.units[content_id], score) for content_id, score in fused]
+        self._record_result_access(results)
+        return results
+    
+    def _record_result_access(self, results: List[Tuple[XPUnit, float]]):
+        """Access-update returned units (eager) or log them (deferred)"""
+        if self.config.access_tracking == "eager":
+            for unit, _ in results:
+                unit.update_access()
+        else:
+            self._log_access(unit.content_id for unit, _ in results)
+    
+    def _log_access(self, content_ids: Iterable[str]):
+        """Record returned units in the access log, flushing once it is large enough"""
+        self.access_log.record(content_ids)
+        if self.access_log.should_flush():
+            self.flush_access_log()
+    
+    def flush_access_log(self) -> int:
+        """
+        Apply pending (deferred) access statistics to the units.
+        
+        Returns:
+            Number of accesses applied
+        """
+        return self.access_log.flush(self.units)
     
     def consolidate_memories(self) -> int:
         """
@@ -802,6 +1537,9 @@ class XPEnvironment:
         
         Strengthens important memories and weakens less important ones.
         """
+        self.flush_access_log()
+        self.capacity_manager.invalidate()
+        self.bump_generation()
         return self.consolidation_engine.consolidate(self.units)
     
     def evolve_temporal_state(self, time_delta_hours: float = 1.0) -> Dict[str, Any]:
@@ -809,13 +1547,134 @@ class XPEnvironment:
         Apply temporal evolution to all units (decay, consolidation).
         
         This simulates the passage of time and natural memory processes.
+        In lazy decay mode this only advances the decay clock (O(1)); see
+        materialize_decay for writing decayed importance back to the units.
+        """
+        self.flush_access_log()
+        self.capacity_manager.invalidate()
+        self.bump_generation()
+        if self.config.decay_mode == "lazy":
+            result = self.decay_engine.advance(time_delta_hours, len(self.units))
+        else:
+            result = self.decay_engine.apply_decay(self.units, time_delta_hours,
+                                                   self.config.decay_unit_stats)
+        evicted = self.enforce_capacity(maintenance=True)
+        if evicted:
+            result['evicted_units'] = len(evicted)
+        return result
+    
+    def materialize_decay(self) -> Dict[str, Any]:
+        """Lazy decay mode: write decayed importance back to all units (summary stats)"""
+        if self.config.decay_mode != "lazy":
+            return {'mode': self.config.decay_mode, 'materialized_units': 0}
+        self.bump_generation()
+        return self.decay_engine.materialize(self.units)
+    
+    def enforce_capacity(self, maintenance: bool = False,
+                         protected: Iterable[str] = ()) -> List[str]:
+        """
+        Evict the lowest-value units while over capacity (see CapacityManager).
+        
+        Args:
+            maintenance: Maintenance pass (soft policy trims to capacity)
+            protected: IDs evicted only after every other unit
+        
+        Returns:
+            Content IDs of the evicted units
+        """
+        n_evict = self.capacity_manager.eviction_count(len(self.units), maintenance)
+        if not n_evict:
+            return []
+        # Pending accesses raise priorities; apply them before choosing victims
+        self.flush_access_log()
+        victims = self.capacity_manager.select_victims(self.units, n_evict, protected)
+        self.remove_units(victims, archive=self.capacity_manager.archive is not None,
+                          reason='evict')
+        self.stats['total_evictions'] += len(victims)
+        logger.info(f"Evicted {len(victims)} units (capacity {self.capacity_manager.max_units})")
+        return victims
+    
+    def remove_units(self, content_ids: Iterable[str], archive: bool = False,
+                     reason: str = 'remove') -> int:
         """
-        return self.decay_engine.apply_decay(self.units, time_delta_hours)
+        Remove units and every reference to them: topology edges, the ANN
+        and emotion indexes, pending accesses and the eviction heap. The
+        removal is recorded as a versioned-store commit.
+        
+        Args:
+            content_ids: Units to remove (unknown IDs are ignored)
+            archive: Write the units to the spill archive first
+                (requires capacity_spill_dir)
+            reason: Action recorded in the commit
+        
+        Returns:
+            Number of units removed
+        """
+        removed = [cid for cid in dict.fromkeys(content_ids) if cid in self.units]
+        if not removed:
+            return 0
+        if archive and self.capacity_manager.archive is None:
+            raise ValueError("Archiving requires capacity_spill_dir")
+        self.bump_generation()
+        
+        for content_id in removed:
+            self.relationship_manager.remove_unit(content_id, self.units)
+            if archive:
+                self.capacity_manager.archive.store(self.units[content_id])
+            self.access_log.discard(content_id)
+            self.capacity_manager.discard(content_id)
+            self.metadata_index.remove(content_id)
+            self.time_index.remove(content_id)
+            if self.lexical_index is not None:
+                self.lexical_index.remove(content_id, self.units[content_id].content)
+            if self.near_duplicate_index is not None:
+                self.near_duplicate_index.remove(content_id)
+            del self.units[content_id]
+        if self._ann_index is not None:
+            self._ann_index.remove(removed)
+        
+        if self.versioned_store:
+            action = 'archive' if archive else reason
+            self.versioned_store.commit(
+                changes={'action': action, 'content_ids': removed},
+                message=f"{action.capitalize()}: {len(removed)} units"
+            )
+        self.stats['total_units'] = len(self.units)
+        return len(removed)
+    
+    def restore_unit(self, content_id: str) -> Optional[XPUnit]:
+        """
+        Bring an archived (spilled) unit back into the environment.
+        
+        Its topology is recomputed against the current units. Returns None
+        if the unit is not archived.
+        """
+        archive = self.capacity_manager.archive
+        if content_id in self.units:
+            return self.units[content_id]
+        data = archive.load(content_id) if archive is not None else None
+        if data is None:
+            return None
+        data.update(coherence_links={}, topology_neighbors={})
+        unit = XPUnit.from_dict(data)
+        if self.versioned_store:
+            unit.commit_id = self.versioned_store.commit(
+                changes={'action': 'restore', 'content_id': content_id},
+                message=f"Restore: {unit.content[:50]}..."
+            )
+        self.units[content_id] = unit
+        self._index_unit(unit)
+        self.relationship_manager.update_topology(unit, self.units)
+        archive.discard(content_id)
+        self.stats['total_units'] = len(self.units)
+        self.enforce_capacity(protected=[content_id])
+        return unit
     
     def get_unit(self, content_id: str) -> Optional[XPUnit]:
         """Retrieve unit by content ID"""
         unit = self.units.get(content_id)
         if unit:
+            self.flush_access_log()
             unit.update_access()
         return unit
     
@@ -825,10 +1684,16 @@ class XPEnvironment:
     
     def get_comprehensive_stats(self) -> Dict[str, Any]:
         """Get comprehensive system statistics"""
+        self.flush_access_log()
         current_time = get_current_timestamp()
         uptime_hours = (current_time - self.stats['system_uptime']) / 3600.0
         
-        if self.units:
+        if isinstance(self.units, ColumnarUnitStore) and self.units:
+            rows = self.units.live_rows()
+            avg_importance = float(np.mean(self.units.current_importance(rows)))
+            avg_access_count = float(np.mean(self.units.access_count[rows]))
+            total_relationships = sum(len(unit.coherence_links) for unit in self.units.values())
+        elif self.units:
             avg_importance = np.mean([unit.importance for unit in self.units.values()])
             avg_access_count = np.mean([unit.access_count for unit in self.units.values()])
             total_relationships = sum(len(unit.coherence_links) for unit in self.units.values())
@@ -854,6 +1719,22 @@ class XPEnvironment:
         if self.versioned_store:
             stats['versioned_store'] = self.versioned_store.stats()
         
+        if self.embedding_cache is not None:
+            stats['embedding_cache'] = self.embedding_cache.stats()
+        
+        stats['access_log'] = {
+            'mode': self.config.access_tracking,
+            'total_flushed': self.access_log.total_flushed
+        }
+        stats['capacity'] = self.capacity_manager.stats()
+        stats['metadata_index'] = self.metadata_index.stats()
+        stats['generation'] = self.generation
+        stats['time_index'] = self.time_index.stats()
+        if self.lexical_index is not None:
+            stats['lexical_index'] = self.lexical_index.stats()
+        if self.near_duplicate_index is not None:
+            stats['near_duplicate_gate'] = self.near_duplicate_index.stats()
+        
         return stats
 
 
@@ -867,8 +1748,11 @@ class SimpleEmbeddingEngine:
     def __init__(self, dim: int):
         self.dim = dim
     
-    def encode(self, text: str) -> np.ndarray:
+    def encode(self, text: Union[str, List[str]]) -> np.ndarray:
         """Generate deterministic embedding from text hash"""
+        if isinstance(text, (list, tuple)):
+            return np.stack([self.encode(t) for t in text]) if text else \
+                np.empty((0, self.dim), dtype=VECTOR_DTYPE)
         seed = abs(hash(text)) % (2**32)
         rng = np.random.default_rng(seed)
         return rng.normal(size=self.dim).astype(VECTOR_DTYPE)
@@ -894,18 +1778,92 @@ class SimpleDoc:
         return len(self.tokens)
 
 
+class DecayClock:
+    """
+    Shared virtual clock for lazy decay.
+    
+    ``hours`` is the total decay time applied through evolve_temporal_state.
+    Units attached to the clock keep their importance as of a reference
+    clock time and decay it in closed form when read, so advancing the
+    clock is O(1) regardless of the number of units.
+    """
+    
+    def __init__(self, hours: float = 0.0):
+        self.hours = hours
+
+
 class DecayMathematicsEngine:
     """Engine for applying temporal decay mathematics"""
     
     def __init__(self, config: UnifiedXPConfig):
         self.config = config
+        self.clock = DecayClock()
+    
+    def advance(self, time_delta_hours: float, n_units: int = 0) -> Dict[str, Any]:
+        """
+        Lazy decay: move the decay clock forward (O(1)).
+        
+        Each attached unit's importance decays by
+        exp(-effective_decay_rate * time_delta_hours), evaluated when read.
+        """
+        self.clock.hours += time_delta_hours
+        return {
+            'mode': 'lazy',
+            'time_delta_hours': time_delta_hours,
+            'decay_clock_hours': self.clock.hours,
+            'total_units': n_units
+        }
+    
+    def materialize(self, units: Dict[str, XPUnit]) -> Dict[str, Any]:
+        """
+        Write lazily decayed importance back to every unit (vectorized for columnar stores).
+        
+        Returns summary statistics of the decay since the previous
+        materialization.
+        """
+        now = self.clock.hours
+        if isinstance(units, ColumnarUnitStore):
+            rows = units.live_rows() if len(units) else np.empty(0, dtype=np.int64)
+            stored = units.importance[rows]
+            current = units.current_importance(rows)
+            decay_rates = units.decay_rate[rows]
+            effective_rates = units.effective_decay_rate[rows]
+            units.importance[rows] = current
+            units.decay_reference[rows] = now
+            # Columns are already up to date, so bypass the unit write-through
+            for row, importance in zip(rows.tolist(), current.tolist()):
+                unit_state = units.unit_at(row).__dict__
+                unit_state['importance'] = importance
+                unit_state['decay_reference'] = now
+        else:
+            stored = np.array([unit.__dict__['importance'] for unit in units.values()])
+            current = np.array([unit.importance for unit in units.values()])
+            decay_rates = np.array([unit.decay_rate for unit in units.values()])
+            effective_rates = np.array([unit.effective_decay_rate for unit in units.values()])
+            for unit, importance in zip(units.values(), current.tolist()):
+                unit.importance = importance
+        
+        importance_lost = stored - current
+        with np.errstate(divide='ignore', invalid='ignore'):
+            resistance = np.where(effective_rates > 0, decay_rates / effective_rates, 1.0)
+        return {
+            'mode': 'lazy',
+            'materialized_units': len(current),
+            'decayed_units': int(np.count_nonzero(importance_lost > 0.01)),
+            'total_decay': float(importance_lost.sum()),
+            'avg_decay': float(importance_lost.mean()) if len(current) else 0.0,
+            'avg_emotional_resistance': float(resistance.mean()) if len(current) else 1.0,
+            'decay_clock_hours': now
+        }
     
-    def apply_decay(self, units: Dict[str, XPUnit], time_delta_hours: float) -> Dict[str, Any]:
+    def apply_decay(self, units: Dict[str, XPUnit], time_delta_hours: float,
+                    include_unit_stats: bool = True) -> Dict[str, Any]:
         """
         Apply decay using XPUnit's core decay behavior with emotional resistance.
         
         This method now delegates to each XPUnit's apply_temporal_decay() method,
         ensuring consistent decay behavior with integrated emotional weighting.
+        Per-unit statistics are only collected when include_unit_stats is set.
         """
         decayed_count = 0
         total_decay = 0.0
@@ -924,16 +1882,19 @@ class DecayMathematicsEngine:
             if importance_lost > 0.01:  # Significant decay
                 decayed_count += 1
             
-            decay_stats.append(unit_decay_stats)
+            if include_unit_stats:
+                decay_stats.append(unit_decay_stats)
         
-        return {
+        stats = {
             'decayed_units': decayed_count,
             'total_decay': total_decay,
             'avg_decay': total_decay / len(units) if units else 0.0,
             'avg_emotional_resistance': total_emotional_resistance / len(units) if units else 1.0,
-            'time_delta_hours': time_delta_hours,
-            'unit_decay_stats': decay_stats
+            'time_delta_hours': time_delta_hours
         }
+        if include_unit_stats:
+            stats['unit_decay_stats'] = decay_stats
+        return stats
 
 
 class ConsolidationEngine:
@@ -960,46 +1921,186 @@ class ConsolidationEngine:
         return consolidated_count
 
 
+# Coherence matrix entries computed per block during topology updates
+TOPOLOGY_BLOCK_ELEMENTS = 1 << 22
+
+
 class RelationshipManager:
-    """Manager for spatial topology and unit relationships"""
+    """
+    Manager for spatial topology and unit relationships.
+    
+    Keeps a matrix of coherence embeddings (pre-normalized HRR and semantic
+    vectors, see coherence_embedding) so a new unit's neighbour candidates
+    come from one matrix product, or from an inner-product ANN index once
+    the store reaches ann_min_units. Edges are symmetric and each unit keeps
+    at most max_topology_degree of them: linking to a full unit drops that
+    unit's weakest edge.
+    """
     
     def __init__(self, config: UnifiedXPConfig):
         self.config = config
         self.graph: Dict[str, Dict[str, float]] = {}
+        self._vectors: Optional[_VectorRows] = None
+        self._ann: Optional[ANNIndex] = None
     
     def update_topology(self, new_unit: XPUnit, all_units: Dict[str, XPUnit]):
         """Update spatial topology with new unit"""
+        self.update_topology_batch([new_unit], all_units)
+    
+    def update_topology_batch(self, new_units: List[XPUnit], all_units: Dict[str, XPUnit]):
+        """
+        Update spatial topology for units that were just added, in order.
+        
+        Each new unit is linked against the units indexed before it (older
+        units plus earlier units of the batch), which gives exactly the
+        topology of adding them one at a time. Candidates are shortlisted
+        with one BLAS product per row block and rescored with einsum, whose
+        values do not depend on the block shape, so batch and sequential
+        updates store identical coherences.
+        """
+        if not new_units:
+            return
+        rows = [self._index_vectors(unit) for unit in new_units]
+        store = self._vectors
+        candidates = store.live[:store.n_rows].copy()
+        candidates[rows] = False  # Batch units become candidates once linked
+        n_candidates = int(candidates.sum())
+        
+        block_size = max(1, TOPOLOGY_BLOCK_ELEMENTS // store.n_rows)
+        for start in range(0, len(new_units), block_size):
+            block_rows = rows[start:start + block_size]
+            block = None
+            for offset, row in enumerate(block_rows):
+                unit = new_units[start + offset]
+                if self._ann_active(n_candidates, candidates):
+                    neighbor_rows, coherences = self._ann_neighbors(row)
+                else:
+                    if block is None:
+                        block = store.vectors[block_rows] @ store.vectors[:store.n_rows].T
+                    shortlist = np.where(candidates, block[offset], -np.inf)
+                    neighbor_rows, coherences = self._rescore(row, shortlist)
+                
+                self._link_neighbors(unit, [store.row_ids[r] for r in neighbor_rows],
+                                     coherences, all_units)
+                candidates[row] = True
+                n_candidates += 1
+                if self._ann is not None:
+                    self._ann.add_item(unit.content_id, store.vectors[row])
+    
+    def remove_unit(self, content_id: str, all_units: Dict[str, XPUnit]):
+        """Drop a unit from the index and remove all its edges"""
+        for neighbor_id in list(self.graph.get(content_id, {})):
+            self._disconnect(content_id, neighbor_id, all_units)
+        self.graph.pop(content_id, None)
+        if self._vectors is not None and content_id in self._vectors.rows:
+            self._vectors.remove(content_id)
+        if self._ann is not None:
+            self._ann.remove([content_id])
+    
+    def rebuild_index(self, all_units: Dict[str, XPUnit]):
+        """Re-index the coherence embeddings of all units (the graph is kept as is)"""
+        self._vectors = None
+        self._ann = None
+        for unit in all_units.values():
+            self._index_vectors(unit)
+    
+    def _index_vectors(self, unit: XPUnit) -> int:
+        """Store a unit's coherence embedding, returning its row"""
+        vector = coherence_embedding(np.atleast_2d(unit.hrr_shape),
+                                     np.atleast_2d(unit.semantic_vector))[0]
+        if self._vectors is None:
+            self._vectors = _VectorRows(len(vector), normalize=False)
+        if unit.content_id in self._vectors.rows:
+            self._vectors.remove(unit.content_id)
+            if self._ann is not None:
+                self._ann.remove([unit.content_id])
+        return self._vectors.add(unit.content_id, self._vectors.prepare(vector))
+    
+    @staticmethod
+    def _coherences(queries: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+        """Coherence of query rows against stored rows (einsum: shape-independent values)"""
+        return np.clip(np.einsum('ij,kj->ik', queries, vectors), MIN_SCORE, MAX_SCORE)
+    
+    def _ann_active(self, n_candidates: int, candidates: np.ndarray) -> bool:
+        """Whether neighbour candidates come from the ANN index (built on first use)"""
+        if self.config.ann_index == "none" or n_candidates < self.config.ann_min_units:
+            return False
+        if self._ann is None:
+            store = self._vectors
+            rows = np.flatnonzero(candidates)
+            self._ann = create_ann_index(self.config.ann_index, store.dim, metric="ip")
+            self._ann.add([store.row_ids[r] for r in rows], store.vectors[rows])
+        return True
+    
+    def _rescore(self, row: int, approximate: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k neighbours of a stored row from approximate scores over all rows.
+        
+        The best 2k rows by the approximate (BLAS) scores are rescored with
+        _coherences and the top k of those are returned; masked rows carry
+        -inf and stay masked.
+        """
+        k = self.config.k_neighbors
+        shortlist = np.sort(top_k_indices(approximate, 2 * k))
+        coherences = self._coherences(self._vectors.vectors[row][None, :],
+                                      self._vectors.vectors[shortlist])[0]
+        coherences[~np.isfinite(approximate[shortlist])] = -np.inf
+        best = top_k_indices(coherences, k)
+        return shortlist[best], coherences[best]
+    
+    def _ann_neighbors(self, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k neighbours among ANN candidates, rescored exactly"""
+        store = self._vectors
+        if self.config.ann_index == "ivf":
+            params = {'nprobe': self.config.ann_nprobe}
+        else:
+            params = {'ef': self.config.ann_ef_search}
+        matches = self._ann.search(store.vectors[row],
+                                   self.config.ann_candidate_factor * self.config.k_neighbors,
+                                   **params)
+        candidate_rows = np.sort(np.array([store.rows[item_id] for item_id, _ in matches],
+                                          dtype=np.int64))
+        coherences = self._coherences(store.vectors[row][None, :], store.vectors[candidate_rows])[0]
+        best = top_k_indices(coherences, self.config.k_neighbors)
+        return candidate_rows[best], coherences[best]
+    
+    def _link_neighbors(self, new_unit: XPUnit, neighbor_ids: List[str],
+                        coherences: np.ndarray, all_units: Dict[str, XPUnit]):
+        """Link a unit to its most coherent candidates (best first) and back"""
         if new_unit.content_id not in self.graph:
             self.graph[new_unit.content_id] = {}
         
-        # Compute similarities with existing units
-        similarities = []
-        for unit_id, unit in all_units.items():
-            if unit_id == new_unit.content_id:
-                continue
-            
-            coherence = new_unit.compute_coherence_with(unit)
-            similarities.append((unit_id, coherence))
-        
-        # Keep top k neighbors
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        top_neighbors = similarities[:self.config.k_neighbors]
-        
-        # Update topology
-        for neighbor_id, coherence in top_neighbors:
+        for neighbor_id, coherence in zip(neighbor_ids, coherences):
+            coherence = float(coherence)
             if coherence > self.config.topology_update_threshold:
-                self.graph[new_unit.content_id][neighbor_id] = coherence
-                new_unit.topology_neighbors[neighbor_id] = coherence
-                new_unit.coherence_links[neighbor_id] = coherence
-                
-                # Update reverse relationship
-                if neighbor_id not in self.graph:
-                    self.graph[neighbor_id] = {}
-                self.graph[neighbor_id][new_unit.content_id] = coherence
-                
-                neighbor_unit = all_units[neighbor_id]
-                neighbor_unit.topology_neighbors[new_unit.content_id] = coherence
-                neighbor_unit.coherence_links[new_unit.content_id] = coherence
+                self._connect(new_unit.content_id, neighbor_id, coherence, all_units)
+    
+    def _connect(self, unit_id: str, neighbor_id: str, coherence: float,
+                 all_units: Dict[str, XPUnit]):
+        """Add a symmetric edge, then enforce the degree cap on both ends"""
+        for a, b in ((unit_id, neighbor_id), (neighbor_id, unit_id)):
+            self.graph.setdefault(a, {})[b] = coherence
+            unit = all_units.get(a)
+            if unit is not None:
+                unit.topology_neighbors[b] = coherence
+                unit.coherence_links[b] = coherence
+        
+        max_degree = self.config.max_topology_degree
+        if max_degree:
+            for node_id in (neighbor_id, unit_id):
+                edges = self.graph.get(node_id, {})
+                if len(edges) > max_degree:
+                    weakest = min(edges, key=edges.get)
+                    self._disconnect(node_id, weakest, all_units)
+    
+    def _disconnect(self, unit_id: str, neighbor_id: str, all_units: Dict[str, XPUnit]):
+        """Remove a symmetric edge"""
+        for a, b in ((unit_id, neighbor_id), (neighbor_id, unit_id)):
+            self.graph.get(a, {}).pop(b, None)
+            unit = all_units.get(a)
+            if unit is not None:
+                unit.topology_neighbors.pop(b, None)
+                unit.coherence_links.pop(b, None)
     
     def get_graph(self) -> Dict[str, Dict[str, float]]:
         """Get the complete relationship graph"""
@@ -1027,34 +2128,145 @@ class UnifiedXPKernel:
     def __init__(self, config: UnifiedXPConfig = None):
         self.config = config or UnifiedXPConfig()
         self.environment = XPEnvironment(self.config)
+        self.query_cache: Optional[QueryResultCache] = None
+        if self.config.query_cache_size > 0:
+            self.query_cache = QueryResultCache(self.config.query_cache_size,
+                                                self.config.query_cache_ttl)
+        
+        # Emotional weighting system (built on first use, see _init_emotional_system)
+        if self.config.model_warmup not in WARMUP_MODES:
+            raise ValueError(f"Unknown model_warmup: {self.config.model_warmup} "
+                             f"(expected one of {WARMUP_MODES})")
+        self._emotional_lock = threading.RLock()
+        self._emotional_system_ready = False
+        self._emotional_analyzer = None
+        self._emotional_weighter = None
+        self._consciousness_integrator = None
+        self._robust_analyzer = None
+        self.warmup_thread: Optional[threading.Thread] = None
+        if self.config.model_warmup == "eager":
+            self.warm_up(background=False)
+        elif self.config.model_warmup == "background":
+            self.warm_up()
         
-        # Initialize emotional weighting system
-        if self.config.enable_emotional_weighting:
-            if self.config.use_enhanced_emotional_analysis:
-                try:
-                    # Use consciousness-optimized analyzer for better results
-                    self.emotional_analyzer = ConsciousnessOptimizedEmotionalAnalyzer()
-                    self.robust_analyzer = RobustMultiLibraryAnalyzer()
-                    self.emotional_weighter = EnhancedEmotionalMemoryWeighter(self.emotional_analyzer)
-                    self.consciousness_integrator = EnhancedConsciousnessEmotionalIntegrator(self.emotional_weighter)
-                    logger.info("Consciousness-optimized emotional weighting system initialized")
-                except Exception as e:
-                    logger.warning(f"Enhanced emotional analysis failed, falling back to basic: {e}")
-                    self.emotional_analyzer = EmotionalAnalyzer()
-                    self.emotional_weighter = EmotionalMemoryWeighter(self.emotional_analyzer)
-                    self.consciousness_integrator = ConsciousnessEmotionalIntegrator(self.emotional_weighter)
+        logger.info("Unified XP Kernel initialized - HD Kernel interface ready")
+    
+    # Lazily constructed emotional weighting system
+    
+    def _init_emotional_system(self):
+        """
+        Build the emotion analyzer, weighter and consciousness integrator.
+        
+        Runs once, on first access to any of them (or from warm_up). The
+        enhanced analyzer loads every available NLP library, so it is only
+        constructed when needed and only once.
+        """
+        if self._emotional_system_ready:
+            return
+        with self._emotional_lock:
+            if self._emotional_system_ready:
+                return
+            if self.config.enable_emotional_weighting:
+                if self.config.use_enhanced_emotional_analysis:
+                    try:
+                        from .consciousness_optimized_emotional_analysis import (
+                            ConsciousnessOptimizedEmotionalAnalyzer
+                        )
+                        from .enhanced_emotional_weighting import (
+                            EnhancedEmotionalMemoryWeighter, EnhancedConsciousnessEmotionalIntegrator
+                        )
+                        # Use consciousness-optimized analyzer for better results
+                        analyzer = ConsciousnessOptimizedEmotionalAnalyzer()
+                        weighter = EnhancedEmotionalMemoryWeighter(analyzer)
+                        integrator = EnhancedConsciousnessEmotionalIntegrator(weighter)
+                        logger.info("Consciousness-optimized emotional weighting system initialized")
+                    except Exception as e:
+                        logger.warning(f"Enhanced emotional analysis failed, falling back to basic: {e}")
+                        analyzer = EmotionalAnalyzer()
+                        weighter = EmotionalMemoryWeighter(analyzer)
+                        integrator = ConsciousnessEmotionalIntegrator(weighter)
+                        logger.info("Basic emotional weighting system initialized")
+                else:
+                    analyzer = EmotionalAnalyzer()
+                    weighter = EmotionalMemoryWeighter(analyzer)
+                    integrator = ConsciousnessEmotionalIntegrator(weighter)
                     logger.info("Basic emotional weighting system initialized")
-            else:
-                self.emotional_analyzer = EmotionalAnalyzer()
-                self.emotional_weighter = EmotionalMemoryWeighter(self.emotional_analyzer)
-                self.consciousness_integrator = ConsciousnessEmotionalIntegrator(self.emotional_weighter)
-                logger.info("Basic emotional weighting system initialized")
-        else:
-            self.emotional_analyzer = None
-            self.emotional_weighter = None
-            self.consciousness_integrator = None
+                self._emotional_analyzer = analyzer
+                self._emotional_weighter = weighter
+                self._consciousness_integrator = integrator
+            self._emotional_system_ready = True
+    
+    @property
+    def emotional_analyzer(self):
+        """Emotion analyzer (None when emotional weighting is disabled)"""
+        self._init_emotional_system()
+        return self._emotional_analyzer
+    
+    @emotional_analyzer.setter
+    def emotional_analyzer(self, analyzer):
+        self._init_emotional_system()
+        self._emotional_analyzer = analyzer
+    
+    @property
+    def emotional_weighter(self):
+        self._init_emotional_system()
+        return self._emotional_weighter
+    
+    @emotional_weighter.setter
+    def emotional_weighter(self, weighter):
+        self._init_emotional_system()
+        self._emotional_weighter = weighter
+    
+    @property
+    def consciousness_integrator(self):
+        self._init_emotional_system()
+        return self._consciousness_integrator
+    
+    @consciousness_integrator.setter
+    def consciousness_integrator(self, integrator):
+        self._init_emotional_system()
+        self._consciousness_integrator = integrator
+    
+    @property
+    def robust_analyzer(self):
+        """
+        Multi-analyzer with confidence scores (None unless enhanced emotional
+        analysis is enabled). Kernel operations do not use it, so it is
+        built separately on first access.
+        """
+        if (self._robust_analyzer is None and self.config.enable_emotional_weighting
+                and self.config.use_enhanced_emotional_analysis):
+            with self._emotional_lock:
+                if self._robust_analyzer is None:
+                    try:
+                        from .consciousness_optimized_emotional_analysis import RobustMultiLibraryAnalyzer
+                        self._robust_analyzer = RobustMultiLibraryAnalyzer()
+                    except Exception as e:
+                        logger.warning(f"Robust emotional analyzer unavailable: {e}")
+        return self._robust_analyzer
+    
+    @robust_analyzer.setter
+    def robust_analyzer(self, analyzer):
+        self._robust_analyzer = analyzer
+    
+    def warm_up(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Load the emotion analyzers, embedding engine and NLP pipeline now
+        instead of on first use.
         
-        logger.info("Unified XP Kernel initialized - HD Kernel interface ready")
+        Args:
+            background: Load on a daemon thread and return it (callers may
+                join it); otherwise load before returning None
+        """
+        initializers = [self._init_emotional_system,
+                        self.environment._init_embedding_engine,
+                        self.environment._init_nlp_pipeline]
+        if not background:
+            for initializer in initializers:
+                initializer()
+            return None
+        self.warmup_thread = start_warmup(initializers, name="lumina-kernel-warmup")
+        return self.warmup_thread
     
     # HD Kernel Interface Methods
     
@@ -1070,10 +2282,56 @@ class UnifiedXPKernel:
             Content ID of the created XP unit
         """
         content_str = str(content) if not isinstance(content, str) else content
+        memo = AnalysisMemo()
+        metadata = self._add_emotional_metadata(content_str, metadata, memo)
+        
+        unit = self.environment.ingest_experience(content_str, metadata, memo)
+        self._apply_emotional_boost(unit)
+        
+        return unit.content_id
+    
+    def process_memory_batch(self, contents: List[Any],
+                             metadatas: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+        """
+        Batch version of process_memory.
         
+        Emotional analysis runs per item in order (the weighter state evolves
+        exactly as with sequential calls, repeated texts are analyzed once);
+        ingestion goes through XPEnvironment.ingest_experiences_batch.
+        
+        Returns:
+            Content IDs in input order
+        """
+        if metadatas is None:
+            metadatas = [None] * len(contents)
+        if len(metadatas) != len(contents):
+            raise ValueError("metadatas must have one entry per content")
+        
+        content_strs = [str(content) if not isinstance(content, str) else content
+                        for content in contents]
+        memo = AnalysisMemo()
+        metadatas = [self._add_emotional_metadata(content_str, metadata, memo)
+                     for content_str, metadata in zip(content_strs, metadatas)]
+        
+        units = self.environment.ingest_experiences_batch(content_strs, metadatas, memo)
+        for unit in units:
+            self._apply_emotional_boost(unit)
+        
+        return [unit.content_id for unit in units]
+    
+    def _analyze_emotion(self, context: AnalysisContext) -> EmotionalState:
+        """Emotional state of an analysis context (analyzed on first use)"""
+        if context.emotion is None:
+            context.emotion = self.emotional_analyzer.analyze_text(context.text)
+        return context.emotion
+    
+    def _add_emotional_metadata(self, content_str: str, metadata: Optional[Dict[str, Any]],
+                                memo: Optional[AnalysisMemo] = None) -> Optional[Dict[str, Any]]:
+        """Analyze emotional content and record it in the metadata (if enabled)"""
         # Analyze emotional content if emotional weighting is enabled
         if self.config.enable_emotional_weighting and self.emotional_analyzer:
-            emotion = self.emotional_analyzer.analyze_text(content_str)
+            context = (memo if memo is not None else AnalysisMemo()).get(content_str)
+            emotion = self._analyze_emotion(context)
             
             # Update emotional weighter state
             self.emotional_weighter.update_emotional_state(emotion)
@@ -1081,36 +2339,38 @@ class UnifiedXPKernel:
             # Calculate emotional importance boost (use enhanced method if available)
             if hasattr(self.emotional_weighter, 'calculate_enhanced_emotional_importance'):
                 emotional_importance = self.emotional_weighter.calculate_enhanced_emotional_importance(
-                    content_str, metadata
+                    content_str, metadata, emotion=emotion
                 )
             else:
                 emotional_importance = self.emotional_weighter.calculate_emotional_importance(
-                    content_str, metadata
+                    content_str, metadata, emotion=emotion
                 )
+            context.emotional_importance = emotional_importance
             
             # Add emotional metadata
             if metadata is None:
                 metadata = {}
             metadata['emotional_importance'] = emotional_importance
             metadata['emotional_state'] = emotion.to_vector().tolist()
-        
-        unit = self.environment.ingest_experience(content_str, metadata)
-        
-        # Apply emotional importance boost if enabled
+        return metadata
+    
+    def _apply_emotional_boost(self, unit: XPUnit):
+        """Apply emotional importance boost if enabled"""
         if (self.config.enable_emotional_weighting and 
             'emotional_importance' in unit.metadata):
             emotional_boost = unit.metadata['emotional_importance']
             unit.importance *= (emotional_boost * self.config.emotional_importance_factor)
+            self.environment.capacity_manager.track(unit)
             
             # Set emotional state in the unit
             if 'emotional_state' in unit.metadata:
                 emotion_vector = np.array(unit.metadata['emotional_state'])
                 emotion = EmotionalState.from_vector(emotion_vector)
                 unit.set_emotional_state(emotion)
-        
-        return unit.content_id
     
-    def retrieve_memory(self, query: Any, k: int = 10, threshold: float = 0.0) -> List[Dict[str, Any]]:
+    def retrieve_memory(self, query: Any, k: int = 10, threshold: float = 0.0,
+                        filters: Optional[Dict[str, Any]] = None,
+                        mode: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         HD Kernel interface: Retrieve memories using XP HRR operations.
         
@@ -1118,49 +2378,160 @@ class UnifiedXPKernel:
             query: Query content (string or XPUnit)
             k: Number of results to return
             threshold: Minimum similarity threshold
+            filters: Metadata filters, e.g. {'speaker': 'user', 'turn': {'$gte': 10}}
+                ("$timestamp": {'$gte': t0} restricts to a time window)
+            mode: "semantic" or "hybrid" (BM25 + semantic, reciprocal rank
+                fusion); defaults to config.retrieval_mode
             
         Returns:
             List of memory results with content, similarity, and metadata
+            
+        With query_cache_size set, repeated string queries are answered from
+        the query cache until the store generation changes (see query_cache.py).
         """
+        mode = self._retrieval_mode(mode)
+        cache_key = None
+        if self.query_cache is not None and isinstance(query, str):
+            cache_key = query_cache_key(query, k, threshold, filters, mode)
+            cached = self._cached_results(cache_key)
+            if cached is not None:
+                return cached
+        
         # Analyze query emotion if emotional weighting is enabled
+        memo = AnalysisMemo()
         query_emotion = None
         if (self.config.enable_emotional_weighting and 
             self.emotional_analyzer and isinstance(query, str)):
-            query_emotion = self.emotional_analyzer.analyze_text(query)
+            query_emotion = self._analyze_emotion(memo.get(query))
         
-        results = self.environment.retrieve_similar(query, k, threshold)
+        if mode == "hybrid":
+            results = self.environment.retrieve_hybrid(query, k, threshold, memo, filters)
+        else:
+            results = self.environment.retrieve_similar(query, k, threshold, memo, filters)
+        formatted = self._format_retrieval_results(results, query_emotion)
+        if cache_key is not None:
+            self._cache_results(cache_key, formatted)
+        return formatted
+    
+    def _cached_results(self, cache_key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """
+        Cached results for a retrieval (copies), or None. A hit still counts
+        as an access of the returned units.
+        """
+        cached = self.query_cache.get(cache_key, self.environment.generation)
+        if cached is None:
+            return None
+        units = self.environment.units
+        self.environment._record_result_access(
+            [(units[result['content_id']], result['similarity']) for result in cached])
+        self.environment.stats['total_retrievals'] += 1
+        return [dict(result) for result in cached]
+    
+    def _cache_results(self, cache_key: Tuple, formatted: List[Dict[str, Any]]):
+        self.query_cache.put(cache_key, self.environment.generation,
+                             [dict(result) for result in formatted])
+    
+    def _retrieval_mode(self, mode: Optional[str]) -> str:
+        mode = mode or self.config.retrieval_mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode} (expected one of {RETRIEVAL_MODES})")
+        return mode
+    
+    def retrieve_memory_batch(self, queries: List[Any], k: int = 10, threshold: float = 0.0,
+                              filters: Optional[Dict[str, Any]] = None,
+                              mode: Optional[str] = None
+                              ) -> List[List[Dict[str, Any]]]:
+        """
+        HD Kernel interface: Retrieve memories for several queries at once.
         
-        # Convert to HD Kernel format with integrated emotional boosting
-        formatted_results = []
-        for unit, similarity in results:
-            # Use XPUnit's core retrieval boost behavior
-            final_similarity = similarity
-            retrieval_boost = 0.0
-            
-            if self.config.enable_emotional_weighting:
-                # Get retrieval boost from unit's core behavior
-                retrieval_boost = unit.get_retrieval_boost(query_emotion)
-                
-                # Apply boost with configuration factor
-                final_similarity = similarity * (1.0 + retrieval_boost * self.config.emotional_retrieval_boost)
+        Embeds all queries in one call and scores them against every unit with
+        a single matrix-matrix product. Each per-query result list is identical
+        to what retrieve_memory would return when called for the queries in order.
+        
+        Args:
+            queries: Query contents (strings or XPUnits)
+            k: Number of results to return per query
+            threshold: Minimum similarity threshold
+            filters: Metadata filters applied to every query
+            mode: "semantic" or "hybrid" (see retrieve_memory)
             
+        Returns:
+            One list of memory results per query
+        """
+        mode = self._retrieval_mode(mode)
+        output: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+        cache_keys: List[Optional[Tuple]] = [None] * len(queries)
+        if self.query_cache is not None:
+            for i, query in enumerate(queries):
+                if isinstance(query, str):
+                    cache_keys[i] = query_cache_key(query, k, threshold, filters, mode)
+                    output[i] = self._cached_results(cache_keys[i])
+        pending = [i for i, results in enumerate(output) if results is None]
+        pending_queries = [queries[i] for i in pending]
+        
+        memo = AnalysisMemo()
+        query_emotions = [None] * len(pending_queries)
+        if self.config.enable_emotional_weighting and self.emotional_analyzer:
+            query_emotions = [
+                self._analyze_emotion(memo.get(query)) if isinstance(query, str) else None
+                for query in pending_queries
+            ]
+        
+        if mode == "hybrid":
+            batch_results = (self.environment.retrieve_hybrid(query, k, threshold, memo, filters)
+                             for query in pending_queries)
+        else:
+            batch_results = self.environment.iter_retrieve_similar_batch(pending_queries, k,
+                                                                         threshold, memo, filters)
+        for i, results, query_emotion in zip(pending, batch_results, query_emotions):
+            output[i] = self._format_retrieval_results(results, query_emotion)
+            if cache_keys[i] is not None:
+                self._cache_results(cache_keys[i], output[i])
+        return output
+    
+    def _format_retrieval_results(self, results: List[Tuple[XPUnit, float]],
+                                  query_emotion: Optional[EmotionalState]) -> List[Dict[str, Any]]:
+        """Convert environment results to HD Kernel format with emotional boosting"""
+        if not results:
+            return []
+        units = [unit for unit, _ in results]
+        similarities = np.array([similarity for _, similarity in results], dtype=np.float64)
+        
+        # Integrated emotional boosting, computed for all results at once
+        if self.config.enable_emotional_weighting:
+            emotions = emotion_matrix([unit.emotion_vector for unit in units])
+            access_counts = np.array([unit.access_count for unit in units])
+            boosts = retrieval_boosts(emotions, access_counts, query_emotion)
+            final_similarities = np.minimum(
+                1.0, similarities * (1.0 + boosts * self.config.emotional_retrieval_boost)
+            )
+            # Re-sort by final similarity (stable, best first)
+            order = np.argsort(-final_similarities, kind='stable')
+            emotional_states = emotions.tolist()
+        else:
+            boosts = np.zeros(len(units))
+            final_similarities = np.minimum(1.0, similarities)
+            order = np.arange(len(units))
+            emotional_states = [None] * len(units)
+        
+        # Convert to HD Kernel format
+        final_list, boost_list = final_similarities.tolist(), boosts.tolist()
+        formatted_results = []
+        for i in order.tolist():
+            unit = units[i]
             formatted_results.append({
                 'content_id': unit.content_id,
                 'content': unit.content,
-                'similarity': min(1.0, final_similarity),  # Cap at 1.0
-                'base_similarity': similarity,
+                'similarity': final_list[i],  # Capped at 1.0
+                'base_similarity': results[i][1],
                 'importance': unit.importance,
                 'access_count': unit.access_count,
                 'age_hours': unit.get_age_hours(),
-                'emotional_boost': retrieval_boost,
-                'emotional_state': unit.get_emotional_state().to_vector().tolist() if self.config.enable_emotional_weighting else None,
+                'emotional_boost': boost_list[i],
+                'emotional_state': emotional_states[i],
                 'metadata': unit.metadata
             })
         
-        # Re-sort by final similarity (now includes integrated emotional effects)
-        if self.config.enable_emotional_weighting:
-            formatted_results.sort(key=lambda x: x['similarity'], reverse=True)
-        
         return formatted_results
     
     def consolidate_memory(self) -> Dict[str, Any]:
@@ -1239,10 +2610,19 @@ class UnifiedXPKernel:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get comprehensive system statistics"""
-        return self.environment.get_comprehensive_stats()
+        stats = self.environment.get_comprehensive_stats()
+        if self.query_cache is not None:
+            stats['query_cache'] = self.query_cache.stats()
+        stats['models_loaded'] = {
+            'emotional_system': self._emotional_system_ready,
+            'embedding_engine': self.environment._embedding_engine is not None,
+            'nlp_pipeline': self.environment._nlp_pipeline is not None,
+        }
+        return stats
     
     def export_state(self) -> Dict[str, Any]:
         """Export complete system state for persistence"""
+        self.environment.flush_access_log()
         return {
             'config': {
                 'embedding_dim': self.config.embedding_dim,
@@ -1262,6 +2642,7 @@ class UnifiedXPKernel:
             for unit_id, unit_data in state_data.get('units', {}).items():
                 unit = XPUnit.from_dict(unit_data)
                 self.environment.units[unit_id] = unit
+            self.environment._rebuild_unit_indexes()
             
             # Import relationship graph
             self.environment.relationship_manager.graph = state_data.get('relationship_graph', {})
@@ -1320,29 +2701,32 @@ class UnifiedXPKernel:
             return unit.metadata['emotional_importance']
         return None
     
-    def get_emotionally_similar_memories(self, emotion: EmotionalState, k: int = 10) -> List[Dict[str, Any]]:
-        """Retrieve memories with similar emotional content"""
+    def get_emotionally_similar_memories(self, emotion: EmotionalState, k: int = 10,
+                                         threshold: float = DEFAULT_EMOTIONAL_SIMILARITY_THRESHOLD
+                                         ) -> List[Dict[str, Any]]:
+        """
+        Retrieve memories with similar emotional content.
+        
+        Uses the environment's EmotionIndex, so only the top-k matches with
+        similarity > threshold are materialized. Importance is read from the
+        units at query time and reflects decay and consolidation.
+        """
         if not self.config.enable_emotional_weighting:
             return []
         
         results = []
-        for unit in self.environment.units.values():
-            memory_emotion = unit.get_emotional_state()
-            similarity = emotion.similarity(memory_emotion)
-            
-            if similarity > 0.3:  # Minimum emotional similarity threshold
-                results.append({
-                    'content_id': unit.content_id,
-                    'content': unit.content,
-                    'emotional_similarity': similarity,
-                    'emotional_state': memory_emotion.to_vector().tolist(),
-                    'importance': unit.importance,
-                    'metadata': unit.metadata
-                })
-        
-        # Sort by emotional similarity
-        results.sort(key=lambda x: x['emotional_similarity'], reverse=True)
-        return results[:k]
+        units = self.environment.units
+        for content_id, similarity in self.environment.emotion_index.search(emotion, k, threshold):
+            unit = units[content_id]
+            results.append({
+                'content_id': unit.content_id,
+                'content': unit.content,
+                'emotional_similarity': similarity,
+                'emotional_state': unit.get_emotional_state().to_vector().tolist(),
+                'importance': unit.importance,
+                'metadata': unit.metadata
+            })
+        return results
 
 
 # =============================================================================
@@ -1440,6 +2824,7 @@ def test_unified_xp_core():
 __all__ = [
     # Core classes
     'UnifiedXPConfig', 'XPUnit', 'XPEnvironment', 'UnifiedXPKernel',
+    'RETRIEVAL_MODES', 'WARMUP_MODES',
     
     # Supporting engines
     'DecayMathematicsEngine', 'ConsolidationEngine', 'RelationshipManager',
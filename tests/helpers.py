@@ -0,0 +1,12 @@
+"""
+Shared helpers for the vector store tests
+"""
+
+from src.lumina_memory.core import MemoryEntry
+
+
+def make_entries(vectors, prefix="e"):
+    """One MemoryEntry per vector: id f"{prefix}{i}", content "memory i", metadata {"n": i}"""
+    return [MemoryEntry(id=f"{prefix}{i}", content=f"memory {i}", embedding=vector,
+                        metadata={"n": i}, access_count=i)
+            for i, vector in enumerate(vectors)]
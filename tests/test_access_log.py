@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for deferred access accounting
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.xp_core_unified import XPEnvironment, UnifiedXPConfig
+
+
+TEXTS = [f"note {i} on {['rivers', 'mountains', 'forests'][i % 3]} and weather {i}" for i in range(30)]
+
+
+def _build_env(**config) -> XPEnvironment:
+    env = XPEnvironment(UnifiedXPConfig(**config))
+    for text in TEXTS:
+        env.ingest_experience(text)
+    return env
+
+
+def test_deferred_mode_only_touches_returned_units():
+    """Retrieval leaves unreturned units untouched and logs the returned ones"""
+    env = _build_env(access_tracking="deferred")
+    results = env.retrieve_similar("rivers and weather", k=3)
+    returned = {unit.content_id for unit, _ in results}
+
+    assert all(unit.access_count == 0 for unit in env.units.values())
+    assert len(env.access_log) == 3
+
+    env.flush_access_log()
+    for content_id, unit in env.units.items():
+        assert unit.access_count == (1 if content_id in returned else 0)
+
+
+def test_eager_mode_keeps_legacy_semantics():
+    """Eager mode (the default) still updates every unit that passes the threshold"""
+    env = _build_env()
+    env.retrieve_similar("rivers and weather", k=3, threshold=0.0)
+    touched = sum(1 for unit in env.units.values() if unit.access_count > 0)
+    assert touched > 3
+    assert len(env.access_log) == 0
+
+
+def test_batched_flush_matches_sequential_updates():
+    """Applying logged accesses equals repeated update_access calls"""
+    for use_columnar_store in (True, False):
+        env = _build_env(use_columnar_store=use_columnar_store)
+        reference = _build_env(use_columnar_store=use_columnar_store)
+        content_id = next(iter(env.units))
+
+        for _ in range(15):  # crosses the per-access boost cap at 10
+            env.access_log.record([content_id])
+            reference.units[content_id].update_access()
+        env.flush_access_log()
+
+        unit, expected = env.units[content_id], reference.units[content_id]
+        assert unit.access_count == expected.access_count == 15
+        assert abs(unit.importance - expected.importance) < 1e-9
+        if use_columnar_store:
+            row = env.units.row_of(content_id)
+            assert env.units.importance[row] == unit.importance
+            assert env.units.access_count[row] == unit.access_count
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for single-pass text analysis shared between kernel and environment
+"""
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.analysis_context import AnalysisMemo
+from src.lumina_memory.emotional_weighting import EmotionalAnalyzer
+from src.lumina_memory.xp_core_unified import (
+    UnifiedXPKernel, UnifiedXPConfig, SimpleNLPPipeline
+)
+
+
+class CountingAnalyzer(EmotionalAnalyzer):
+    def __init__(self):
+        super().__init__()
+        self.calls = Counter()
+
+    def analyze_text(self, text):
+        self.calls[text] += 1
+        return super().analyze_text(text)
+
+
+class CountingPipeline(SimpleNLPPipeline):
+    def __init__(self):
+        self.calls = Counter()
+
+    def __call__(self, text):
+        self.calls[text] += 1
+        return super().__call__(text)
+
+
+def _kernel(columnar=True):
+    kernel = UnifiedXPKernel(UnifiedXPConfig(use_columnar_store=columnar))
+    analyzer, pipeline = CountingAnalyzer(), CountingPipeline()
+    kernel.emotional_analyzer = analyzer
+    kernel.emotional_weighter.analyzer = analyzer
+    kernel.environment._nlp_pipeline = pipeline
+    return kernel, analyzer, pipeline
+
+
+def test_ingest_and_query_analyze_each_text_once():
+    kernel, analyzer, pipeline = _kernel()
+    text = "I am thrilled and a little scared about tomorrow's launch!"
+    content_id = kernel.process_memory(text)
+    assert analyzer.calls[text] == 1 and pipeline.calls[text] == 1
+    assert 'emotional_importance' in kernel.environment.units[content_id].metadata
+
+    query = "how do I feel about the launch?"
+    kernel.retrieve_memory(query, k=3)
+    assert analyzer.calls[query] == 1 and pipeline.calls[query] == 1
+
+
+def test_batch_analyzes_repeated_texts_once():
+    for columnar in (True, False):
+        kernel, analyzer, pipeline = _kernel(columnar)
+        texts = ["What a wonderful day", "I worry about the exam", "What a wonderful day"]
+        kernel.process_memory_batch(texts)
+        assert analyzer.calls == Counter({texts[0]: 1, texts[1]: 1})
+        assert pipeline.calls == Counter({texts[0]: 1, texts[1]: 1})
+
+        queries = ["the exam", "the exam", "a wonderful day"]
+        kernel.retrieve_memory_batch(queries, k=2)
+        assert analyzer.calls["the exam"] == 1 and pipeline.calls["the exam"] == 1
+
+
+def test_memo_results_match_unmemoized_analysis():
+    kernel, _, _ = _kernel()
+    env = kernel.environment
+    memo = AnalysisMemo()
+    context = env.analyze("A calm and curious note", memo)
+    assert memo.get("A calm and curious note") is context
+    assert context.tokens == ["A", "calm", "and", "curious", "note"]
+    assert (context.emotion_vector == env._compute_emotion_vector("A calm and curious note")).all()
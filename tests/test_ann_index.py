@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the pure-NumPy ANN indexes
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.ann_index import IVFFlatIndex, HNSWIndex, create_ann_index
+
+
+def _dataset(n=1500, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(20, dim))
+    data = centers[rng.integers(0, 20, n)] + 0.5 * rng.normal(size=(n, dim))
+    queries = centers[rng.integers(0, 20, 20)] + 0.5 * rng.normal(size=(20, dim))
+    return data.astype(np.float32), queries.astype(np.float32)
+
+
+def _recall(index, data, queries, k=10, **params):
+    normalized = data / np.linalg.norm(data, axis=1, keepdims=True)
+    hits = 0
+    for query in queries:
+        exact = set(np.argsort(-(normalized @ query))[:k].tolist())
+        found = {int(item_id) for item_id, _ in index.search(query, k, **params)}
+        hits += len(exact & found)
+    return hits / (k * len(queries))
+
+
+@pytest.mark.parametrize("index_type,params", [("ivf", {"nprobe": 8}), ("hnsw", {"ef": 64})])
+def test_recall_against_exact_search(index_type, params):
+    data, queries = _dataset()
+    index = create_ann_index(index_type, data.shape[1])
+    index.add([str(i) for i in range(len(data))], data)
+    assert len(index) == len(data)
+    assert _recall(index, data, queries, **params) >= 0.9
+
+
+@pytest.mark.parametrize("index_cls", [IVFFlatIndex, HNSWIndex])
+def test_incremental_delete_and_reinsert(index_cls):
+    data, queries = _dataset(n=1200)
+    index = index_cls(data.shape[1])
+    ids = [str(i) for i in range(len(data))]
+    index.add(ids, data)
+
+    removed = set(ids[:500])
+    assert index.remove(ids[:500]) == 500
+    assert len(index) == 700
+    for query in queries:
+        assert not removed & {item_id for item_id, _ in index.search(query, 10)}
+
+    index.add(ids[:5], data[:5])
+    assert len(index) == 705
+    assert index.search(data[0], 1)[0][0] == "0"
+
+
+def test_ivf_is_exact_before_training():
+    data, queries = _dataset(n=200)
+    index = IVFFlatIndex(data.shape[1], min_train_size=1000)
+    index.add([str(i) for i in range(len(data))], data)
+    assert not index.is_trained
+    assert _recall(index, data, queries) == 1.0
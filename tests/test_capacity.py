@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for capacity enforcement and importance-ordered eviction
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.capacity_manager import IndexedMinHeap, UnitArchive
+from src.lumina_memory.xp_core_unified import XPEnvironment, UnifiedXPConfig
+
+
+TEXTS = [f"note {i} about topic {i % 4}" for i in range(30)]
+
+
+def _env(**overrides):
+    config = dict(max_memory_capacity=10, capacity_policy="hard", k_neighbors=3)
+    config.update(overrides)
+    return XPEnvironment(UnifiedXPConfig(**config))
+
+
+def test_indexed_heap_orders_updates_and_removals():
+    rng = np.random.default_rng(0)
+    heap = IndexedMinHeap()
+    keys = {str(i): float(k) for i, k in enumerate(rng.uniform(size=200))}
+    heap.heapify(list(keys.items())[:100])
+    for item_id, key in list(keys.items())[100:]:
+        heap.push(item_id, key)
+    for item_id in list(keys)[::7]:
+        keys[item_id] = float(rng.uniform())
+        heap.push(item_id, keys[item_id])
+    for item_id in list(keys)[::5]:
+        assert heap.remove(item_id)
+        del keys[item_id]
+    assert not heap.remove('missing')
+    popped = [heap.pop() for _ in range(len(heap))]
+    assert popped == sorted(keys.items(), key=lambda item: item[1])
+
+
+@pytest.mark.parametrize("columnar,decay_mode", [(True, "eager"), (True, "lazy"), (False, "eager")])
+def test_hard_cap_evicts_lowest_importance(columnar, decay_mode):
+    env = _env(use_columnar_store=columnar, decay_mode=decay_mode)
+    units = env.ingest_experiences_batch(TEXTS[:10])
+    for i, unit in enumerate(units):
+        unit.importance = 0.5 + 0.05 * i
+    env.evolve_temporal_state(1.0)
+    env.ingest_experience(TEXTS[10])
+
+    keep = units[1]
+    env.get_unit(keep.content_id)  # Raised after the heap was built: stale-low key
+    keep.importance = 5.0
+    env.ingest_experiences_batch(TEXTS[11:14])
+    assert len(env.units) == 10
+    assert env.stats['total_evictions'] == 4
+    evicted = [units[i].content_id for i in (0, 2, 3, 4)]
+    assert not set(evicted) & set(env.units)
+    assert keep.content_id in env.units
+
+    # No dangling references to evicted units
+    graph = env.get_relationship_graph()
+    for content_id in evicted:
+        assert content_id not in graph
+        assert all(content_id not in edges for edges in graph.values())
+        assert all(content_id not in unit.coherence_links for unit in env.units.values())
+    assert env.versioned_store.get_commit(env.versioned_store.get_branch_head("main")).changes['action'] == 'evict'
+    assert env.get_comprehensive_stats()['capacity']['total_evicted'] == 4
+
+
+def test_soft_cap_evicts_during_maintenance():
+    env = _env(capacity_policy="soft", capacity_soft_margin=0.5)
+    env.ingest_experiences_batch(TEXTS[:15])
+    assert len(env.units) == 15
+    env.ingest_experience(TEXTS[15])
+    assert len(env.units) == 10
+    env.ingest_experiences_batch(TEXTS[16:20])
+    assert len(env.units) == 14
+    result = env.evolve_temporal_state(1.0)
+    assert len(env.units) == 10 and result['evicted_units'] == 4
+
+    unbounded = _env(capacity_policy="none")
+    unbounded.ingest_experiences_batch(TEXTS)
+    assert len(unbounded.units) == 30
+
+    default = XPEnvironment(UnifiedXPConfig(max_memory_capacity=10, k_neighbors=3))
+    default.ingest_experiences_batch(TEXTS)
+    assert len(default.units) == 30  # Eviction is opt-in
+
+
+def test_spill_to_disk_and_restore(tmp_path):
+    env = _env(capacity_spill_dir=str(tmp_path), ann_index="ivf")
+    units = env.ingest_experiences_batch(TEXTS[:12])
+    archive = env.capacity_manager.archive
+    assert len(env.units) == 10 and len(archive) == 2
+    spilled = archive.ids()[0]
+    assert spilled in [unit.content_id for unit in units[:12]]
+
+    restored = env.restore_unit(spilled)
+    assert restored.content == next(u.content for u in units if u.content_id == spilled)
+    assert np.allclose(restored.semantic_vector, env._compute_semantic_vector(restored.content))
+    assert spilled in env.units and len(env.units) == 10
+    assert spilled not in archive and len(archive) == 2
+    assert env.restore_unit('missing') is None
+
+    # The archive survives a reopen
+    reopened = UnitArchive(tmp_path)
+    assert sorted(reopened.ids()) == sorted(archive.ids())
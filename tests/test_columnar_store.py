@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the matrix-backed XP unit store
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.xp_core_unified import XPEnvironment, UnifiedXPConfig
+from src.lumina_memory.columnar_store import ColumnarUnitStore
+
+
+TEXTS = [f"memory {i} about {['cats', 'dogs', 'birds', 'fish', 'trees'][i % 5]} number {i * 7}"
+         for i in range(40)]
+
+
+def _build_env(use_columnar_store: bool) -> XPEnvironment:
+    env = XPEnvironment(UnifiedXPConfig(use_columnar_store=use_columnar_store))
+    for text in TEXTS:
+        env.ingest_experience(text)
+    return env
+
+
+def test_columns_track_unit_attributes():
+    """Unit attribute writes are mirrored into the store columns"""
+    env = _build_env(True)
+    store = env.units
+    assert isinstance(store, ColumnarUnitStore)
+    assert len(store) == len(TEXTS)
+
+    unit = next(iter(store.values()))
+    row = store.row_of(unit.content_id)
+    unit.importance = 1.25
+    unit.update_access()
+    assert store.importance[row] == unit.importance
+    assert store.access_count[row] == unit.access_count
+    np.testing.assert_array_equal(store.semantic[row], unit.semantic_vector)
+
+
+def test_deleted_rows_are_reused():
+    """Removing a unit frees its row for the next insert"""
+    env = _build_env(True)
+    store = env.units
+    victim = next(iter(store))
+    freed_row = store.row_of(victim)
+    del store[victim]
+    assert victim not in store
+
+    unit = env.ingest_experience("a completely new experience")
+    assert store.row_of(unit.content_id) == freed_row
+    assert store.n_rows == len(TEXTS)
+
+
+def test_plain_dict_assignment_is_wrapped():
+    """Assigning a dict (as PersistentXPEnvironment does) keeps the columnar store"""
+    env = _build_env(True)
+    env.units = dict(env.units)
+    assert isinstance(env.units, ColumnarUnitStore)
+    assert len(env.units) == len(TEXTS)
+
+
+def test_retrieval_matches_dict_storage():
+    """Vectorized scoring returns the same ranking as the per-unit loop"""
+    columnar_env = _build_env(True)
+    dict_env = _build_env(False)
+
+    # Align time-dependent state so both environments score identically
+    for content_id, unit in dict_env.units.items():
+        columnar_env.units[content_id].timestamp = unit.timestamp
+
+    for query in ["cats and dogs", "memory 3", "trees"]:
+        columnar_results = columnar_env.retrieve_similar(query, k=10)
+        dict_results = dict_env.retrieve_similar(query, k=10)
+        assert [u.content_id for u, _ in columnar_results] == \
+            [u.content_id for u, _ in dict_results]
+        for (_, a), (_, b) in zip(columnar_results, dict_results):
+            assert abs(a - b) < 1e-6
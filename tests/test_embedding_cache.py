@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed embedding cache
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.embedding_cache import EmbeddingCache, get_shared_embedding_cache
+from src.lumina_memory.xp_core_unified import XPEnvironment, UnifiedXPConfig
+
+
+class CountingEncoder:
+    """Deterministic stand-in for a sentence encoder that counts encoded texts"""
+
+    def __init__(self, dim: int = 16):
+        self.dim = dim
+        self.encoded = 0
+
+    def encode(self, texts):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        self.encoded += len(texts)
+        vectors = np.stack([
+            np.random.default_rng(sum(map(ord, t))).normal(size=self.dim).astype(np.float32)
+            for t in texts
+        ])
+        return vectors[0] if single else vectors
+
+
+def test_lru_hits_misses_and_eviction():
+    cache = EmbeddingCache(max_entries=2)
+    encoder = CountingEncoder()
+
+    first = cache.encode("model", ["a", "b", "a"], encoder.encode)
+    assert encoder.encoded == 2  # duplicate within the batch embedded once
+    np.testing.assert_array_equal(first[0], first[2])
+
+    cache.encode("model", ["  a  "], encoder.encode)  # normalized text hits
+    assert encoder.encoded == 2
+
+    cache.encode("model", ["c"], encoder.encode)  # evicts "b"
+    cache.encode("model", ["b"], encoder.encode)
+    assert encoder.encoded == 4
+    assert len(cache) == 2
+
+    cache.encode("other-model", ["a"], encoder.encode)  # keyed by model too
+    assert encoder.encoded == 5
+    assert cache.stats()['hits'] > 0 and cache.stats()['misses'] == 6
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    encoder = CountingEncoder()
+    cache = EmbeddingCache(max_entries=10, disk_dir=str(tmp_path))
+    expected = cache.encode("model", ["hello world", "second text"], encoder.encode)
+
+    reopened = EmbeddingCache(max_entries=10, disk_dir=str(tmp_path))
+    restored = reopened.encode("model", ["hello world", "second text"], encoder.encode)
+    np.testing.assert_array_equal(expected, restored)
+    assert encoder.encoded == 2
+    assert reopened.stats()['disk_hits'] == 2
+
+
+def test_shared_cache_grows_to_largest_request(tmp_path):
+    cache = get_shared_embedding_cache(max_entries=2, disk_dir=str(tmp_path))
+    assert get_shared_embedding_cache(max_entries=5, disk_dir=str(tmp_path)) is cache
+    assert cache.max_entries == 5
+    assert get_shared_embedding_cache(max_entries=3, disk_dir=str(tmp_path)).max_entries == 5
+    for i in range(5):
+        cache.put("model", f"text {i}", np.ones(4))
+    assert cache.stats()['memory_entries'] == 5
+
+
+def test_environment_reuses_cached_embeddings():
+    encoder = CountingEncoder(dim=384)
+    env = XPEnvironment(UnifiedXPConfig(embedding_cache_size=100))
+    env._embedding_engine = encoder
+    env._embedding_model_name = "counting-encoder"
+    env._embedding_cache = EmbeddingCache(max_entries=100)
+
+    env.ingest_experience("the same experience twice")
+    env.retrieve_similar("the same experience twice", k=1)
+    env.retrieve_similar_batch(["the same experience twice", "a new query"], k=1)
+    assert encoder.encoded == 2
+    assert env.get_comprehensive_stats()['embedding_cache']['hits'] == 2
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the vectorized emotional weighting kernels
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.emotional_kernels import (
+    emotion_matrix, retrieval_boosts, importance_boosts, decay_resistances
+)
+from src.lumina_memory.emotional_weighting import EmotionalState
+from src.lumina_memory.xp_core_unified import XPUnit, UnifiedXPKernel, UnifiedXPConfig
+
+
+def _units(n=50, seed=0):
+    rng = np.random.default_rng(seed)
+    units = []
+    for i in range(n):
+        emotion = rng.uniform(-1, 1, [6, 6, 8, 3][i % 4]).astype(np.float32)
+        units.append(XPUnit(
+            content_id=str(i), content=f"unit {i}",
+            semantic_vector=np.ones(4, dtype=np.float32), hrr_shape=np.ones(4, dtype=np.float32),
+            emotion_vector=emotion, timestamp=0.0, last_access=0.0, decay_rate=0.1,
+            importance=1.0, access_count=int(rng.integers(0, 15))
+        ))
+    return units
+
+
+def test_neutral_state_formulas():
+    """Hand-computed values for the neutral emotional state"""
+    neutral = EmotionalState().to_vector()[None, :]  # v=0, a=.5, d=0, j=.5, f=0, c=.5
+    intensity = np.sqrt(0.75)
+    assert retrieval_boosts(neutral)[0] == pytest.approx(intensity * 0.3 + 0.125 + 0.075)
+    assert importance_boosts(neutral)[0] == pytest.approx(intensity * 0.4 + 0.15 + 0.1 + 0.125)
+    assert decay_resistances(neutral)[0] == pytest.approx((1 + intensity * 0.4) * 1.15 * 1.1)
+
+
+def test_matrix_kernels_match_unit_methods():
+    units = _units()
+    query = EmotionalState(valence=0.4, arousal=0.9, fear=0.6, joy=0.1, curiosity=0.7)
+    emotions = emotion_matrix([unit.emotion_vector for unit in units])
+    counts = np.array([unit.access_count for unit in units])
+    ages = np.linspace(0, 400, len(units))
+
+    np.testing.assert_allclose(retrieval_boosts(emotions, counts, query),
+                               [unit.get_retrieval_boost(query) for unit in units])
+    np.testing.assert_allclose(importance_boosts(emotions, counts),
+                               [unit.get_emotional_importance_boost() for unit in units])
+    np.testing.assert_allclose(decay_resistances(emotions, ages),
+                               [unit._calculate_emotional_decay_resistance(age)
+                                for unit, age in zip(units, ages)])
+
+
+def test_kernel_results_are_reranked_by_boosted_similarity():
+    kernel = UnifiedXPKernel(UnifiedXPConfig())
+    kernel.process_memory_batch([f"I am so afraid and worried about exam {i}!" for i in range(10)]
+                                + [f"A calm note about topic {i}" for i in range(10)])
+    results = kernel.retrieve_memory("worried about the exam", k=8)
+    similarities = [result['similarity'] for result in results]
+    assert similarities == sorted(similarities, reverse=True)
+    for result in results:
+        unit = kernel.environment.units[result['content_id']]
+        assert result['emotional_state'] == unit.get_emotional_state().to_vector().tolist()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for FAISSVectorStore deletion, tombstones and compaction
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+faiss = pytest.importorskip("faiss")
+
+from src.lumina_memory.core import MemoryEntry
+from src.lumina_memory.vector_store import FAISSVectorStore
+from tests.helpers import make_entries
+
+
+def _exact(vectors, ids, query, k):
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = normed @ (query / np.linalg.norm(query))
+    order = np.argsort(-scores)[:k]
+    return [ids[i] for i in order]
+
+
+def test_removed_entries_leave_search_and_get_compacted():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 16)).astype("float32")
+    store = FAISSVectorStore(dimension=16, compaction_threshold=0.25)
+    store.add(make_entries(vectors))
+    ids = [f"e{i}" for i in range(200)]
+
+    removed = ids[:40]  # Below the threshold: tombstoned, not yet deleted
+    store.remove(removed)
+    assert store.size == 160 and store.index.ntotal == 200
+    assert store.stats()['tombstones'] == 40 and store.compactions == 0
+
+    live = np.array([i for i in range(200) if ids[i] not in removed])
+    for query in rng.normal(size=(5, 16)).astype("float32"):
+        results = store.search(query, k=10)
+        assert [entry_id for entry_id, _ in results] == _exact(vectors[live], [ids[i] for i in live], query, 10)
+    assert store.search(vectors[0], k=5, allowed_ids=["e0", "e50"])[0][0] == "e50"
+
+    store.remove(ids[40:80])  # Dead fraction 0.4 > 0.25: compacted
+    assert store.compactions == 1 and store.index.ntotal == store.size == 120
+    assert store.stats()['dead_fraction'] == 0.0
+    assert len(store.search(vectors[100], k=500)) == 120
+
+
+def test_readd_replaces_vector():
+    store = FAISSVectorStore(dimension=4, compaction_threshold=0.0)
+    store.add(make_entries(np.eye(4, dtype="float32")))
+    store.add([MemoryEntry(id="e0", content="moved", embedding=np.array([0, 0, 0, 1], dtype="float32"))])
+    assert store.size == 4 and store.index.ntotal == 4
+    top = store.search(np.array([0, 0, 0, 1], dtype="float32"), k=4)
+    assert {entry_id for entry_id, score in top if score > 0.99} == {"e0", "e3"}
+    store.clear()
+    assert store.size == 0 and store.search(np.ones(4, dtype="float32")) == []
+
+
+@pytest.mark.parametrize("index_type", ["ivf_flat", "ivf_pq", "hnsw"])
+def test_index_family_migrates_and_tunes_per_query(index_type):
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(16, 32))
+    vectors = (centers[rng.integers(0, 16, 2000)] + 0.3 * rng.normal(size=(2000, 32))).astype("float32")
+    store = FAISSVectorStore(dimension=32, index_type=index_type, nlist=16, train_threshold=1000,
+                             pq_m=16, pq_nbits=6, nprobe=1, ef_search=16)
+    assert store.active_index_type == "flat"
+    store.add(make_entries(vectors[:600]))
+    assert store.active_index_type == "flat"
+    store.add(make_entries(vectors[600:], prefix="f"))
+    assert store.active_index_type == index_type and store.migrations == 1
+    assert store.index.ntotal == store.size == 2000
+
+    ids = [f"e{i}" for i in range(600)] + [f"f{i}" for i in range(1400)]
+    queries = vectors[rng.integers(0, 2000, 20)] + 0.1 * rng.normal(size=(20, 32)).astype("float32")
+
+    def recall(**params):
+        hits = 0
+        for query in queries:
+            found = {entry_id for entry_id, _ in store.search(query, k=10, **params)}
+            hits += len(found & set(_exact(vectors, ids, query, 10)))
+        return hits / (10 * len(queries))
+
+    wide = recall(nprobe=16, ef_search=256)
+    assert wide >= recall() and wide >= (0.5 if index_type == "ivf_pq" else 0.95)
+
+    store.remove(ids[:500])  # 25% dead: compacted (HNSW by rebuilding)
+    assert store.compactions == 1 and store.index.ntotal == store.size == 1500
+    assert store.active_index_type == index_type
+    results = store.search(vectors[1000], k=5, nprobe=16, ef_search=64)
+    assert results[0][0] == ids[1000] and not {entry_id for entry_id, _ in results} & set(ids[:500])
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the matrix-backed InMemoryVectorStore
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.core import MemoryEntry, StorageError
+from src.lumina_memory.vector_store import FAISSVectorStore, InMemoryVectorStore
+from tests.helpers import make_entries
+
+
+def test_matrix_grows_and_reuses_rows():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(10, 4))
+    store = InMemoryVectorStore(initial_capacity=4)
+    store.add(make_entries(vectors))
+    assert store.stats()['capacity'] == 16 and store.stats()['vectors'] == 10
+
+    store.remove(["e2", "e5", "missing"])
+    store.add(make_entries(rng.normal(size=(2, 4)), prefix="new"))
+    assert store.stats()['capacity'] == 16 and store.stats()['free_rows'] == 0
+    assert store.size == 10 and store.search(vectors[2], k=10)[0][0] != "e2"
+
+    store.add([MemoryEntry(id="e0", content="moved", embedding=vectors[9])])
+    assert {entry_id for entry_id, score in store.search(vectors[9], k=2)} == {"e0", "e9"}
+    store.add([MemoryEntry(id="bare", content="no embedding")])
+    assert store.size == 11 and "bare" not in dict(store.search(vectors[0], k=20))
+    with pytest.raises(StorageError):
+        store.add([MemoryEntry(id="bad", content="x", embedding=np.ones(3))])
+    store.clear()
+    assert store.size == 0 and store.search(vectors[0]) == []
+
+
+@pytest.mark.parametrize("metric", ["cosine", "euclidean", "inner_product"])
+def test_scores_match_faiss(metric):
+    pytest.importorskip("faiss")
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(500, 24)).astype(np.float32)
+    vectors[3] = 0.0
+    memory, flat = InMemoryVectorStore(metric=metric), FAISSVectorStore(24, metric=metric)
+    for store in (memory, flat):
+        store.add(make_entries(vectors))
+        store.remove([f"e{i}" for i in range(0, 500, 7)])
+
+    allowed = {f"e{i}" for i in range(0, 500, 3)}
+    for query in rng.normal(size=(5, 24)).astype(np.float32):
+        for kwargs in ({}, {'allowed_ids': allowed}):
+            expected = flat.search(query, k=10, **kwargs)
+            results = memory.search(query, k=10, **kwargs)
+            assert [entry_id for entry_id, _ in results] == [entry_id for entry_id, _ in expected]
+            assert [score for _, score in results] == pytest.approx(
+                [score for _, score in expected], rel=1e-4, abs=1e-5)
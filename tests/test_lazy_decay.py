@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy closed-form decay mode
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.xp_core_unified import UnifiedXPKernel, UnifiedXPConfig
+
+
+TEXTS = [f"I was {['thrilled', 'terrified', 'curious', 'calm'][i % 4]} about event {i}" for i in range(40)]
+
+
+def _kernel(columnar: bool = True) -> UnifiedXPKernel:
+    kernel = UnifiedXPKernel(UnifiedXPConfig(decay_mode="lazy", use_columnar_store=columnar,
+                                             access_tracking="deferred"))
+    kernel.process_memory_batch(TEXTS)
+    return kernel
+
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_evolve_is_closed_form_and_lazy(columnar):
+    kernel = _kernel(columnar)
+    units = list(kernel.environment.units.values())
+    before = [unit.importance for unit in units]
+    rates = [unit.effective_decay_rate for unit in units]
+    assert all(0 < rate <= unit.decay_rate for rate, unit in zip(rates, units))
+
+    stats = kernel.environment.evolve_temporal_state(24.0)
+    stats = kernel.environment.evolve_temporal_state(24.0)
+    assert stats == {'mode': 'lazy', 'time_delta_hours': 24.0, 'decay_clock_hours': 48.0,
+                     'total_units': len(units)}
+
+    for unit, importance, rate in zip(units, before, rates):
+        assert unit.__dict__['importance'] == importance  # nothing was rewritten
+        assert unit.importance == pytest.approx(importance * np.exp(-rate * 48.0))
+
+
+def test_materialize_matches_lazy_reads_and_scores():
+    kernel = _kernel()
+    env = kernel.environment
+    env.evolve_temporal_state(100.0)
+    expected = {cid: unit.importance for cid, unit in env.units.items()}
+    scores = [score for _, score in env.retrieve_similar(TEXTS[5], k=10)]
+
+    stats = env.materialize_decay()
+    assert stats['materialized_units'] == len(TEXTS)
+    assert stats['total_decay'] > 0 and 'unit_decay_stats' not in stats
+    for cid, unit in env.units.items():
+        assert unit.__dict__['importance'] == pytest.approx(expected[cid])
+        assert unit.decay_reference == 100.0
+    assert [score for _, score in env.retrieve_similar(TEXTS[5], k=10)] == pytest.approx(scores)
+
+
+def test_columnar_and_dict_stores_agree():
+    columnar, plain = _kernel(True), _kernel(False)
+    for kernel in (columnar, plain):
+        kernel.environment.evolve_temporal_state(72.0)
+        kernel.environment.get_unit(next(iter(kernel.environment.units))).update_access()
+    for cid, unit in columnar.environment.units.items():
+        assert unit.importance == pytest.approx(plain.environment.units[cid].importance)
+
+
+def test_writes_apply_to_decayed_importance():
+    env = _kernel().environment
+    unit = next(iter(env.units.values()))
+    env.evolve_temporal_state(500.0)
+    decayed = unit.importance
+    unit.update_access()
+    assert unit.importance == pytest.approx(min(2.0, decayed + 0.01))
+
+
+def test_eager_summary_only_stats():
+    kernel = UnifiedXPKernel(UnifiedXPConfig(decay_unit_stats=False))
+    kernel.process_memory_batch(TEXTS[:5])
+    stats = kernel.environment.evolve_temporal_state(1.0)
+    assert 'unit_decay_stats' not in stats and stats['time_delta_hours'] == 1.0
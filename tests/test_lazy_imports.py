@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy imports and deferred model loading in the kernel
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory import xp_core_unified
+from src.lumina_memory.emotional_weighting import EmotionalAnalyzer
+from src.lumina_memory.xp_core_unified import UnifiedXPConfig, UnifiedXPKernel
+
+
+def test_kernel_import_defers_emotion_modules():
+    code = ("import sys; sys.path.insert(0, 'src'); import lumina_memory.xp_core_unified as x; "
+            "heavy = [m for m in sys.modules if m.endswith(('enhanced_emotional_weighting', "
+            "'consciousness_optimized_emotional_analysis'))]; "
+            "print(heavy, x.UnifiedXPKernel.__name__, 'UnifiedXPKernel' in dir(sys.modules['lumina_memory']))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=project_root,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["[]", "UnifiedXPKernel", "True"]
+
+    assert xp_core_unified.RobustMultiLibraryAnalyzer.__name__ == "RobustMultiLibraryAnalyzer"
+    with pytest.raises(AttributeError):
+        xp_core_unified.NoSuchAnalyzer
+
+
+def test_analyzers_are_built_on_first_use():
+    kernel = UnifiedXPKernel(UnifiedXPConfig(use_enhanced_emotional_analysis=False))
+    assert kernel._emotional_analyzer is None and not kernel.get_stats()['models_loaded']['emotional_system']
+    kernel.process_memory("I am thrilled about the trip")
+    analyzer = kernel.emotional_analyzer
+    assert isinstance(analyzer, EmotionalAnalyzer) and kernel.emotional_weighter.analyzer is analyzer
+
+    injected = EmotionalAnalyzer()
+    fresh = UnifiedXPKernel(UnifiedXPConfig(use_enhanced_emotional_analysis=False))
+    fresh.emotional_analyzer = injected
+    assert fresh.emotional_analyzer is injected and fresh.robust_analyzer is None
+
+    disabled = UnifiedXPKernel(UnifiedXPConfig(enable_emotional_weighting=False))
+    assert disabled.emotional_analyzer is None and disabled.robust_analyzer is None
+
+
+def test_background_warm_up_loads_models():
+    kernel = UnifiedXPKernel(UnifiedXPConfig(model_warmup="background"))
+    kernel.warmup_thread.join(timeout=60)
+    assert all(kernel.get_stats()['models_loaded'].values())
+    assert kernel.emotional_analyzer is not None
+
+    eager = UnifiedXPKernel(UnifiedXPConfig(model_warmup="eager", enable_emotional_weighting=False))
+    assert eager.warmup_thread is None and all(eager.get_stats()['models_loaded'].values())
+    with pytest.raises(ValueError):
+        UnifiedXPKernel(UnifiedXPConfig(model_warmup="sometimes"))
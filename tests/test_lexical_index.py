@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Tests for the BM25 lexical index and hybrid retrieval
+"""
+
+import math
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.advanced_xpunit import AdvancedXPUnit
+from src.lumina_memory.emotion_engine import EmotionXPEnvironment
+from src.lumina_memory.lexical_index import (BM25Index, LexicalUnitMap, reciprocal_rank_fusion,
+                                             tokenize)
+from src.lumina_memory.xp_core_unified import UnifiedXPConfig, UnifiedXPKernel, XPEnvironment
+
+
+DOCS = {f"d{i}": text for i, text in enumerate([
+    "the cat sat on the mat",
+    "dogs and cats living together",
+    "the quick brown fox jumps over the lazy dog",
+    "a cat, a dog and a bird",
+    "stock markets fell sharply today",
+    "my favourite colour is blue",
+])}
+
+
+def _bm25(query, docs, k1=1.5, b=0.75):
+    tokens = {doc_id: tokenize(text) for doc_id, text in docs.items()}
+    average = sum(len(t) for t in tokens.values()) / len(tokens)
+    scores = {}
+    for term in set(tokenize(query)):
+        df = sum(term in t for t in tokens.values())
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for doc_id, doc_tokens in tokens.items():
+            tf = Counter(doc_tokens)[term]
+            if tf:
+                norm = k1 * (1 - b + b * len(doc_tokens) / average)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+    return scores
+
+
+def test_incremental_scores_match_from_scratch():
+    index = BM25Index()
+    for doc_id, text in DOCS.items():
+        index.add(doc_id, text)
+    index.add("d1", "dogs dogs everywhere")  # Re-index
+    index.remove("d4", DOCS["d4"])
+    docs = dict(DOCS, d1="dogs dogs everywhere")
+    del docs["d4"]
+
+    for query in ["cat", "the dog", "dogs everywhere", "Blue colour!", "markets"]:
+        expected = _bm25(query, docs)
+        assert index.scores(query) == pytest.approx(expected)
+        top = index.search(query, k=2)
+        assert [score for _, score in top] == sorted(expected.values(), reverse=True)[:2]
+    assert set(index.scores("cat dog", allowed={"d0", "d2"})) == {"d0", "d2"}
+    assert index.stats()['documents'] == 5
+
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], rrf_k=60)
+    assert [item_id for item_id, _ in fused] == ["a", "c", "b"]
+
+
+def test_unit_map_keeps_index_in_sync():
+    units = LexicalUnitMap(BM25Index())
+    units["a"] = AdvancedXPUnit(content_id="a", content="favourite colour is blue")
+    units["b"] = AdvancedXPUnit(content_id="b", content="reading a book")
+    units["a"] = AdvancedXPUnit(content_id="a", content="favourite food is pasta")
+    assert units.index.search("blue") == [] and units.index.search("pasta")[0][0] == "a"
+    assert units.pop("b").content == "reading a book" and units.index.search("book") == []
+    assert units.pop("missing", None) is None
+
+    env = EmotionXPEnvironment()
+    for i, text in enumerate(["My favorite color is blue.", "I read a book about gardens."]):
+        env.xpunits[f"u{i}"] = AdvancedXPUnit(content_id=f"u{i}", content=text)
+    env.xpunits["thread_narrative_0"] = AdvancedXPUnit(content_id="thread_narrative_0",
+                                                       content="favorite color talk")
+    matches = env.search_memory_for_keywords("What is my favorite color?")
+    assert [(xpunit_id, relevance) for xpunit_id, _, relevance in matches] == [("u0", 1.0)]
+
+    # Sorted by the reported relevance, not by BM25
+    env.xpunits["u2"] = AdvancedXPUnit(content_id="u2", content="color")
+    for i in range(3, 8):
+        env.xpunits[f"u{i}"] = AdvancedXPUnit(content_id=f"u{i}", content=f"favorite thing {i}")
+    assert max(env.xpunit_lexical_index.scores("favorite color").items(), key=lambda item: item[1])[0] == "u2"
+    matches = env.search_memory_for_keywords("favorite color")
+    relevances = [relevance for _, _, relevance in matches]
+    assert matches[0][0] == "u0" and relevances == sorted(relevances, reverse=True)
+
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_hybrid_retrieval_surfaces_keyword_hits(columnar):
+    config = UnifiedXPConfig(use_columnar_store=columnar, max_memory_capacity=0,
+                             enable_emotional_weighting=False)
+    env = XPEnvironment(config)
+    texts = [f"general chatter number {i} about the weather" for i in range(40)]
+    texts.append("order ZX-4471 shipped on tuesday")
+    units = env.ingest_experiences_batch(texts)
+
+    lexical = env.retrieve_lexical("where is ZX-4471", k=3)
+    assert lexical[0][0] is units[-1]
+    hybrid = env.retrieve_hybrid("where is ZX-4471", k=5, threshold=-1.0)
+    assert units[-1] in [unit for unit, _ in hybrid] and len(hybrid) == 5
+    scores = [score for _, score in hybrid]
+    assert scores == sorted(scores, reverse=True)
+    filter_calls = []
+    filter_ids = env._filter_ids
+    env._filter_ids = lambda filters: filter_calls.append(filters) or filter_ids(filters)
+    assert env.retrieve_hybrid("ZX-4471", k=5, threshold=-1.0,
+                               filters={'$timestamp': {'$lt': 0}}) == []
+    assert len(filter_calls) == 1  # One filter resolution shared by both rankings
+    env._filter_ids = filter_ids
+
+    env.remove_units([units[-1].content_id])
+    assert env.retrieve_lexical("ZX-4471", k=3) == []
+
+    kernel = UnifiedXPKernel(config)
+    for text in texts:
+        kernel.process_memory(text)
+    results = kernel.retrieve_memory("ZX-4471", k=3, threshold=-1.0, mode="hybrid")
+    assert texts[-1] in [result['content'] for result in results]
+    assert len(kernel.retrieve_memory_batch(["ZX-4471", "weather"], k=2, threshold=-1.0,
+                                            mode="hybrid")) == 2
+    with pytest.raises(ValueError):
+        kernel.retrieve_memory("ZX-4471", mode="keyword")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for MemorySystem entry lookup and batched forgetting
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+pytest.importorskip("rich")  # Imported by lumina_memory.utils
+
+from src.lumina_memory.config import LuminaConfig
+from src.lumina_memory.embeddings import MockEmbeddingProvider
+from src.lumina_memory.memory_system import MemorySystem
+from src.lumina_memory.vector_store import InMemoryVectorStore
+
+
+class CountingStore(InMemoryVectorStore):
+    def __init__(self):
+        super().__init__()
+        self.remove_calls = 0
+
+    def remove(self, entry_ids):
+        self.remove_calls += 1
+        super().remove(entry_ids)
+
+
+def test_index_follows_eviction_consolidation_and_forget():
+    store = CountingStore()
+    memory = MemorySystem(MockEmbeddingProvider(dimension=16), store,
+                          LuminaConfig(stm_capacity=3, consolidation_threshold=0.5))
+    ids = [memory.ingest(f"memory number {i}", {"i": i}) for i in range(3)]
+    memory.stm[0].importance_score = 0.9
+    assert memory.consolidate() == 1
+
+    ids += [memory.ingest(f"memory number {i}", {"i": i}) for i in range(3, 5)]
+    # ids[0] left STM but is in LTM; ids[1] was evicted
+    assert memory._find_entry(ids[0]).content == "memory number 0"
+    assert memory._find_entry(ids[1]) is None and memory._find_entry(ids[4]) is not None
+    assert set(memory._entries) == {ids[0], ids[2], ids[3], ids[4]}
+    assert memory.recall("memory number 1", k=5, filters={"i": 1}) == []
+
+    assert memory.forget_many([ids[0], ids[3], ids[4], "unknown"]) == 3
+    assert store.remove_calls == 1
+    assert [entry.id for entry in memory.stm] == [ids[2]] and memory.ltm == {}
+    assert set(memory._entries) == {ids[2]} and memory._stm_ids == {ids[2]}
+    assert [result["id"] for result in memory.recall("memory number 2", k=5)] == [ids[2]]
+    assert memory.forget([]) == 0 and memory.get_stats()["total_memories"] == 2
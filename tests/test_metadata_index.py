@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the metadata inverted index and filtered retrieval
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.ann_index import HNSWIndex, IVFFlatIndex
+from src.lumina_memory.core import MemoryEntry
+from src.lumina_memory.metadata_index import MetadataIndex, matches_filters
+from src.lumina_memory.vector_store import InMemoryVectorStore
+from src.lumina_memory.xp_core_unified import UnifiedXPKernel, UnifiedXPConfig, XPEnvironment
+
+
+SPEAKERS = ['user', 'assistant', 'system']
+
+
+def _metadata(i):
+    return {'speaker': SPEAKERS[i % 3], 'turn': i, 'session': f"s{i % 4}",
+            'tags': ['a', 'b'] if i % 2 else ['c']}
+
+
+FILTERS = [
+    {'speaker': 'user'},
+    {'speaker': {'$in': ['user', 'system']}, 'turn': {'$gte': 10, '$lt': 40}},
+    {'session': 's1', 'turn': {'$gt': 20}},
+    {'tags': ['c']},
+    {'speaker': 'nobody'},
+    {'turn': {'$lte': 5}, 'missing': 1},
+]
+
+
+def test_match_agrees_with_brute_force():
+    index = MetadataIndex()
+    selective = MetadataIndex(keys=['speaker'])
+    items = {str(i): _metadata(i) for i in range(60)}
+    for item_id, metadata in items.items():
+        index.add(item_id, metadata)
+        selective.add(item_id, metadata)
+    items['5'] = {'speaker': 'assistant', 'turn': 5.5}
+    del items['7']
+    for metadata_index in (index, selective):
+        metadata_index.add('5', items['5'])  # Re-index
+        metadata_index.remove('7')
+
+    for filters in FILTERS + [{'turn': {'$gte': 5, '$lte': 5.5}}]:
+        expected = {item_id for item_id, metadata in items.items()
+                    if matches_filters(metadata, filters)}
+        assert index.match(filters) == expected
+        assert selective.match(filters) == expected
+    assert index.match({'turn': {'$gte': 10, '$lt': 13}}) == {'10', '11', '12'}
+    with pytest.raises(ValueError):
+        index.match({'turn': {'$between': [1, 2]}})
+
+
+@pytest.mark.parametrize("columnar,ann", [(True, "none"), (True, "ivf"), (True, "hnsw"),
+                                          (False, "none"), (False, "hnsw")])
+def test_filtered_retrieval_returns_k_matches(columnar, ann):
+    config = UnifiedXPConfig(use_columnar_store=columnar, ann_index=ann, ann_min_units=20,
+                             max_memory_capacity=0, access_tracking="deferred")
+    env = XPEnvironment(config)
+    texts = [f"conversation turn {i} about topic {i % 7}" for i in range(90)]
+    env.ingest_experiences_batch(texts, [_metadata(i) for i in range(90)])
+
+    exact = XPEnvironment(UnifiedXPConfig(use_columnar_store=columnar, max_memory_capacity=0,
+                                          access_tracking="deferred"))
+    exact.ingest_experiences_batch(texts, [_metadata(i) for i in range(90)])
+    for filters in FILTERS[:3]:
+        results = env.retrieve_similar("topic 3", k=10, filters=filters)
+        assert len(results) == 10
+        assert all(matches_filters(unit.metadata, filters) for unit, _ in results)
+        if ann == "none":
+            # Same ranking as post-filtering a full exact ranking
+            ranked = exact.retrieve_similar("topic 3", k=90, threshold=-1.0)
+            expected = [unit.content_id for unit, _ in ranked
+                        if matches_filters(unit.metadata, filters)][:10]
+            assert [unit.content_id for unit, _ in results] == expected
+    assert env.retrieve_similar("topic 3", k=10, filters={'speaker': 'nobody'}) == []
+
+    # Evicted units leave the index
+    removed = next(iter(env.metadata_index.match({'turn': 0})))
+    env.remove_units([removed])
+    assert env.metadata_index.match({'turn': 0}) == set()
+
+
+def test_kernel_and_stores_accept_filters():
+    kernel = UnifiedXPKernel(UnifiedXPConfig(enable_emotional_weighting=False))
+    for i in range(12):
+        kernel.process_memory(f"message {i} in the thread", {'thread': i % 2, 'turn': i})
+    results = kernel.retrieve_memory("thread message", k=5, threshold=-1.0,
+                                     filters={'thread': 1, 'turn': {'$gt': 2}})
+    assert len(results) == 5
+    assert all(r['metadata']['thread'] == 1 and r['metadata']['turn'] > 2 for r in results)
+    batch = kernel.retrieve_memory_batch(["thread", "message"], k=3, threshold=-1.0,
+                                         filters={'thread': 0})
+    assert all(len(results) == 3 for results in batch)
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 16)).astype(np.float32)
+    query = rng.normal(size=16).astype(np.float32)
+    allowed = {str(i) for i in range(0, 200, 9)}
+    store = InMemoryVectorStore()
+    store.add([MemoryEntry(id=str(i), content=str(i), embedding=v) for i, v in enumerate(vectors)])
+    expected = [item_id for item_id, _ in store.search(query, k=200) if item_id in allowed][:5]
+    assert [item_id for item_id, _ in store.search(query, k=5, allowed_ids=allowed)] == expected
+
+    for index in (IVFFlatIndex(16, nprobe=1, min_train_size=64), HNSWIndex(16, ef=8)):
+        index.add([str(i) for i in range(200)], vectors)
+        found = index.search(query, k=5, allowed=allowed)
+        assert len(found) == 5 and all(item_id in allowed for item_id, _ in found)
+
+
+def test_non_numeric_range_bounds_are_rejected():
+    index = MetadataIndex()
+    for i in range(5):
+        index.add(str(i), {'i': i})
+    for filters in ({'i': {'$gte': 'a'}}, {'i': {'$lt': None}}, {'i': {'$gt': True}}):
+        with pytest.raises(ValueError):
+            index.match(filters)
+        with pytest.raises(ValueError):
+            matches_filters({'i': 1}, filters)
+        with pytest.raises(ValueError):
+            matches_filters({}, filters)
+    assert index.match({'i': {'$gte': 1.5, '$lt': 4}}) == {'2', '3'}
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the MinHash near-duplicate ingest gate
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.near_duplicate import MinHashLSH, shingles
+from src.lumina_memory.xp_core_unified import UnifiedXPConfig, XPEnvironment
+
+
+def _jaccard(a, b):
+    a, b = shingles(a), shingles(b)
+    return len(a & b) / len(a | b)
+
+
+def test_signature_similarity_tracks_jaccard():
+    lsh = MinHashLSH(threshold=0.8, num_perm=128)
+    pairs = [("ok thanks", "OK,  thanks!"),
+             ("remind me about the dentist at 3pm tomorrow", "remind me about the dentist at 3 pm tomorrow"),
+             ("the quick brown fox jumps over the lazy dog", "a quick brown fox leaped over lazy dogs"),
+             ("completely unrelated text", "what is the weather like")]
+    for a, b in pairs:
+        estimate = lsh.similarity(lsh.signature(a), lsh.signature(b))
+        assert estimate == pytest.approx(_jaccard(a, b), abs=0.15)
+
+    lsh.add('a', pairs[1][0])
+    assert lsh.query(pairs[1][1])[0] == 'a'
+    assert lsh.query(pairs[3][1]) is None
+    assert lsh.remove('a') and lsh.query(pairs[1][1]) is None
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_gate_merges_before_embedding(batch):
+    env = XPEnvironment(UnifiedXPConfig(near_duplicate_gate=True, max_memory_capacity=0))
+    texts = ["ok thanks", "Can you remind me about the dentist appointment tomorrow at 3pm?",
+             "OK, thanks!", "can you remind me about the dentist appointment tomorrow at 3 pm",
+             "let's talk about the garden"]
+    embedded = []
+    compute = env._compute_semantic_vectors
+    env._compute_semantic_vectors = lambda contents: embedded.extend(contents) or compute(contents)
+    single = env._compute_semantic_vector
+    env._compute_semantic_vector = lambda content: embedded.append(content) or single(content)
+
+    if batch:
+        units = env.ingest_experiences_batch(texts)
+    else:
+        units = [env.ingest_experience(text) for text in texts]
+    assert units[2] is units[0] and units[3] is units[1]
+    assert len(env.units) == 3 and sorted(embedded) == sorted([texts[0], texts[1], texts[4]])
+    assert units[0].access_count == 1 and units[0].importance > 1.0
+    assert env.stats['near_duplicates_merged'] == 2
+    assert env.get_comprehensive_stats()['near_duplicate_gate']['items'] == 3
+
+    env.remove_units([units[0].content_id])
+    assert env.ingest_experience("ok thanks!!").content_id != units[0].content_id
+    off = XPEnvironment(UnifiedXPConfig(max_memory_capacity=0))
+    assert len(off.ingest_experiences_batch(texts)) == 5 and len(off.units) == 5
+
+
+def test_failed_batch_leaves_no_pending_signatures():
+    env = XPEnvironment(UnifiedXPConfig(near_duplicate_gate=True, max_memory_capacity=0))
+    stored = env.ingest_experience("remind me about the dentist at 3pm tomorrow")
+
+    def fail(contents):
+        raise RuntimeError("encoder down")
+    compute = env._compute_semantic_vectors
+    env._compute_semantic_vectors = fail
+    with pytest.raises(RuntimeError):
+        env.ingest_experiences_batch(["ok thanks", "let's talk about the garden"])
+    assert env.get_comprehensive_stats()['near_duplicate_gate']['items'] == 1
+    env._compute_semantic_vectors = compute
+
+    units = env.ingest_experiences_batch(["OK, thanks!", "remind me about the dentist at 3 pm tomorrow"])
+    assert units[0].content == "OK, thanks!" and units[1] is stored
+
+    # A stale best candidate does not hide a weaker stored match
+    lsh = MinHashLSH(threshold=0.7, num_perm=128)
+    lsh.add('stale', "remind me about the dentist at 3pm tomorrow")
+    lsh.add('kept', "remind me about the dentist at 3 pm tomorrow")
+    assert lsh.query("remind me about the dentist at 3pm tomorrow")[0] == 'stale'
+    assert lsh.query("remind me about the dentist at 3pm tomorrow",
+                     valid=lambda item_id: item_id != 'stale')[0] == 'kept'
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the pre-normalized vector invariant and the dot-product scoring paths
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.core import MemoryEntry
+from src.lumina_memory.math_foundation import (
+    memory_unit_score, mathematical_coherence, check_unit_norm, cosine_similarity
+)
+from src.lumina_memory.vector_store import InMemoryVectorStore
+from src.lumina_memory.versioned_xp_store import VersionedXPStore
+from src.lumina_memory.xp_core_unified import XPEnvironment, XPUnit, UnifiedXPConfig
+
+
+TEXTS = [f"entry {i} about subject {i % 5}" for i in range(30)]
+
+
+def _unit(content_id, rng):
+    return XPUnit(
+        content_id=content_id, content=content_id,
+        semantic_vector=rng.normal(size=16).astype(np.float32),
+        hrr_shape=rng.normal(size=32).astype(np.float32),
+        emotion_vector=rng.uniform(-1, 1, 6).astype(np.float32),
+        timestamp=0.0, last_access=0.0, decay_rate=0.01, importance=1.0
+    )
+
+
+def test_ingested_vectors_are_unit_normalized():
+    env = XPEnvironment(UnifiedXPConfig(validate_vector_norms=True))
+    env.ingest_experiences_batch(TEXTS[:20])
+    env.ingest_experience(TEXTS[20])
+    for unit in env.units.values():
+        assert np.linalg.norm(unit.semantic_vector) == pytest.approx(1.0, abs=1e-5)
+        assert unit.vector_norm('hrr_shape') == pytest.approx(1.0, abs=1e-5)
+
+    with pytest.raises(ValueError):
+        env.units = {'raw': _unit('raw', np.random.default_rng(0))}
+    with pytest.raises(ValueError):
+        check_unit_norm(np.full((2, 4), 0.9))
+    check_unit_norm(np.zeros(4))
+
+
+def test_cached_norm_scoring_matches_canonical_formulas():
+    rng = np.random.default_rng(1)
+    query, memory = _unit('q', rng), _unit('m', rng)
+    assert memory.score_against(query) == memory_unit_score(
+        query.semantic_vector, memory.semantic_vector, query.emotion_vector, memory.emotion_vector,
+        memory.get_age_hours(), memory.decay_rate, memory.importance)
+    assert memory.compute_coherence_with(query) == mathematical_coherence(
+        memory.hrr_shape, query.hrr_shape, memory.semantic_vector, query.semantic_vector)
+
+    # Reassigning a vector invalidates its cached norm
+    memory.emotion_vector = memory.emotion_vector * 3.0
+    assert memory.vector_norm('emotion_vector') == pytest.approx(
+        np.linalg.norm(memory.emotion_vector))
+
+
+def test_stores_use_cached_norms():
+    rng = np.random.default_rng(2)
+    vectors = rng.normal(size=(40, 8)).astype(np.float32)
+    query = rng.normal(size=8).astype(np.float32)
+    expected = sorted(((str(i), cosine_similarity(query, v)) for i, v in enumerate(vectors)),
+                      key=lambda item: item[1], reverse=True)[:5]
+
+    memory_store = InMemoryVectorStore()
+    memory_store.add([MemoryEntry(id=str(i), content=f"v{i}", embedding=v)
+                      for i, v in enumerate(vectors)])
+    memory_store.remove(['nonexistent'])
+    assert [i for i, _ in memory_store.search(query, k=5)] == [i for i, _ in expected]
+    assert [s for _, s in memory_store.search(query, k=5)] == pytest.approx([s for _, s in expected])
+
+    versioned = VersionedXPStore()
+    ids = [versioned.store(f"v{i}", v) for i, v in enumerate(vectors)]
+    results = versioned.search(query, k=5)
+    assert [ids.index(entry_id) for entry_id, _ in results] == [int(i) for i, _ in expected]
+    assert [s for _, s in results] == pytest.approx([s for _, s in expected])
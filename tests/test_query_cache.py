@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the generation-stamped query result cache
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.query_cache import QueryResultCache, query_cache_key
+from src.lumina_memory.xp_core_unified import UnifiedXPConfig, UnifiedXPKernel
+
+
+def test_lru_generation_and_ttl():
+    now = [0.0]
+    cache = QueryResultCache(max_entries=2, ttl_seconds=10.0, clock=lambda: now[0])
+    key = query_cache_key("  Hello   world ", 5, 0.0, {'b': 1, 'a': {'$gt': 2}})
+    assert key == query_cache_key("Hello world", 5, 0.0, {'a': {'$gt': 2}, 'b': 1})
+    assert key != query_cache_key("Hello world", 5, 0.0, None)
+
+    cache.put(key, 1, ['r'])
+    assert cache.get(key, 1) == ['r']
+    assert cache.get(key, 2) is None and cache.stale == 1  # Store changed
+    cache.put(key, 2, ['r2'])
+    now[0] = 11.0
+    assert cache.get(key, 2) is None and cache.expired == 1
+    for name in "abc":
+        cache.put(name, 2, name)
+    assert cache.get("a", 2) is None and cache.get("c", 2) == "c"
+    stats = cache.stats()
+    assert stats['hits'] == 2 and stats['misses'] == 3 and stats['hit_rate'] == pytest.approx(0.4)
+
+
+def test_kernel_serves_repeats_until_store_changes():
+    kernel = UnifiedXPKernel(UnifiedXPConfig(enable_emotional_weighting=False, query_cache_size=16,
+                                             max_memory_capacity=0))
+    for i in range(10):
+        kernel.process_memory(f"note {i} about the garden and the weather")
+    env = kernel.environment
+
+    embedded = []
+    compute = env._compute_semantic_vectors
+    env._compute_semantic_vectors = lambda contents: embedded.extend(contents) or compute(contents)
+    first = kernel.retrieve_memory("garden weather", k=3, threshold=-1.0)
+    first[0]['content'] = 'mutated by caller'
+    again = kernel.retrieve_memory("garden  weather", k=3, threshold=-1.0)
+    assert len(embedded) == 1 and again[0]['content'] != 'mutated by caller'
+    assert [r['content_id'] for r in again] == [r['content_id'] for r in first]
+    batch = kernel.retrieve_memory_batch(["garden weather", "note 3"], k=3, threshold=-1.0)
+    assert [r['content_id'] for r in batch[0]] == [r['content_id'] for r in first]
+    assert kernel.get_stats()['query_cache']['hits'] == 2
+
+    # Every mutation that affects ranking invalidates
+    for mutate in (lambda: kernel.process_memory("a brand new garden note"),
+                   lambda: kernel.process_memory("note 0 about the garden and the weather"),
+                   lambda: env.ingest_experiences_batch(["note 1 about the garden and the weather"]),
+                   kernel.consolidate_memory,
+                   lambda: kernel.evolve_state(1.0),
+                   lambda: env.remove_units([first[1]['content_id']])):
+        generation = env.generation
+        mutate()
+        assert env.generation > generation
+        before = len(embedded)
+        kernel.retrieve_memory("garden weather", k=3, threshold=-1.0)
+        assert len(embedded) == before + 1
+    assert kernel.get_stats()['query_cache']['stale'] == 6
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for the time index and time-window queries
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.conversational_memory import ConversationalMemoryManager, ConversationalMemoryUnit
+from src.lumina_memory.emotional_weighting import EmotionalMemoryWeighter, EmotionalState
+from src.lumina_memory.time_index import TimeIndex
+from src.lumina_memory.xp_core_unified import UnifiedXPConfig, XPEnvironment
+
+
+def test_range_queries_agree_with_scan():
+    rng = np.random.default_rng(0)
+    times = {str(i): float(t) for i, t in enumerate(rng.integers(0, 50, size=200))}
+    index = TimeIndex()
+    for item_id, timestamp in times.items():
+        index.add(item_id, timestamp)
+    for item_id in list(times)[::6]:
+        assert index.remove(item_id)
+        del times[item_id]
+    times['3'] = 70.0
+    index.add('3', 70.0)  # Re-index
+
+    for start, end in [(10, 20), (None, 5), (45, None), (None, None), (30, 10)]:
+        expected = {item_id for item_id, t in times.items()
+                    if (start is None or t >= start) and (end is None or t <= end)}
+        found = index.between(start, end)
+        assert set(found) == expected and len(found) == len(expected)
+        assert [times[item_id] for item_id in found] == sorted(times[item_id] for item_id in found)
+        assert index.count_between(start, end) == len(expected)
+    assert index.select({'$gt': 10, '$lt': 12}) == {i for i, t in times.items() if t == 11}
+    assert index.latest(1) == ['3']
+    with pytest.raises(ValueError):
+        index.select({'$in': [1, 2]})
+
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_timestamp_filter_combines_with_metadata(columnar):
+    env = XPEnvironment(UnifiedXPConfig(use_columnar_store=columnar, max_memory_capacity=0))
+    units = env.ingest_experiences_batch([f"entry {i} about topic {i % 3}" for i in range(30)],
+                                         [{'topic': i % 3} for i in range(30)])
+    for i, unit in enumerate(units):
+        unit.timestamp = 1000.0 + i
+    env.units = dict(env.units)  # Re-index the rewritten timestamps
+
+    assert [unit.content_id for unit in env.units_between(1010.0, 1014.0)] == \
+        [unit.content_id for unit in units[10:15]]
+    results = env.retrieve_similar("topic 1", k=30, threshold=-1.0,
+                                   filters={'$timestamp': {'$gte': 1020.0}, 'topic': 1})
+    assert sorted(unit.content_id for unit, _ in results) == \
+        sorted(unit.content_id for unit in units[20:] if unit.metadata['topic'] == 1)
+    env.remove_units([units[29].content_id])
+    assert env.time_index.latest(1) == [units[28].content_id]
+
+
+def test_emotional_and_conversational_windows():
+    weighter = EmotionalMemoryWeighter()
+    now = time.time()
+    for hours_ago in [30, 2, 10, 1, 50]:  # Out of order
+        weighter.update_emotional_state(EmotionalState(valence=0.5, joy=0.5), now - hours_ago * 3600)
+    times = [entry['timestamp'] for entry in weighter.emotional_history]
+    assert times == sorted(times)
+    assert weighter.get_emotional_context(lookback_hours=12)['average_emotion'].joy == pytest.approx(0.5)
+    weighter.emotional_history = weighter.emotional_history[-2:]  # Replaced from outside
+    assert weighter.get_emotional_context(lookback_hours=0.5)['emotional_volatility'] == 0.0
+
+    manager = ConversationalMemoryManager(UnifiedXPConfig())
+    for i in range(5):
+        manager.add_conversational_memory(f"live turn {i}")
+    manager.freeze_frame_load([{'content': f"old turn {i}", 'timestamp': now - 600 + i}
+                               for i in range(3)])
+    contents = [unit.content for unit in manager.conversation_units]
+    assert contents[:3] == ["old turn 0", "old turn 1", "old turn 2"]
+    assert [u.content for u in manager.units_between(manager.session_start_time)] == contents[3:]
+    assert manager.get_working_memory_context(max_units=2).endswith("live turn 4")
+
+
+def test_windows_follow_reassigned_lists_of_the_same_length():
+    weighter = EmotionalMemoryWeighter()
+    now = time.time()
+    for hours_ago in [3, 2, 1]:
+        weighter.update_emotional_state(EmotionalState(valence=0.5, joy=0.5), now - hours_ago * 3600)
+    assert weighter.get_emotional_context(lookback_hours=1.5)['emotion_count'] == 1
+    old = [dict(entry, timestamp=now - 100 * 3600) for entry in weighter.emotional_history]
+    weighter.emotional_history = old  # Same length, different timestamps
+    assert weighter.get_emotional_context(lookback_hours=1.5).get('emotion_count', 0) == 0
+
+    manager = ConversationalMemoryManager(UnifiedXPConfig())
+    for i in range(3):
+        manager.add_conversational_memory(f"live turn {i}")
+    assert len(manager.units_between(manager.session_start_time)) == 3
+    replacement = [ConversationalMemoryUnit(content=f"old turn {i}", timestamp=now - 600 + i,
+                                            turn_number=i) for i in range(3)]
+    manager.conversation_units = replacement
+    assert manager.units_between(manager.session_start_time) == []
+    assert manager.units_between(now - 600, now - 599) == replacement[:2]
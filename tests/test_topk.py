@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared top-k selection utilities
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.topk import top_k_indices, top_k_stream
+
+
+def _reference(scores, k):
+    """Full stable descending sort, NaN last"""
+    return list(np.argsort(-np.where(np.isnan(scores), -np.inf, scores), kind='stable')[:k])
+
+
+def test_matches_stable_sort_with_ties_and_nan():
+    """Partial selection returns exactly the prefix of a stable full sort"""
+    rng = np.random.default_rng(0)
+    for trial in range(500):
+        n = int(rng.integers(0, 40))
+        scores = rng.integers(0, 5, n).astype(float)  # plenty of ties
+        if n and trial % 3 == 0:
+            scores[rng.integers(0, n)] = np.nan
+        k = int(rng.integers(0, 45))
+
+        expected = _reference(scores, k)
+        assert list(top_k_indices(scores, k)) == expected
+        streamed = top_k_stream(((i, s) for i, s in enumerate(scores)), k)
+        assert [i for i, _ in streamed] == expected
+
+
+def test_none_returns_everything_sorted():
+    """k=None means a full descending ranking"""
+    scores = np.array([0.2, 0.9, 0.5])
+    assert list(top_k_indices(scores, None)) == [1, 2, 0]
+    assert top_k_stream([('a', 0.2), ('b', 0.9), ('c', 0.5)], None) == \
+        [('b', 0.9), ('c', 0.5), ('a', 0.2)]
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental k-NN topology maintenance in RelationshipManager
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.xp_core_unified import XPEnvironment, UnifiedXPConfig
+
+
+TEXTS = [f"note {i} on topic {i % 9} mentioning item {i * 11 % 17}" for i in range(300)]
+
+
+def _environment(**overrides) -> XPEnvironment:
+    config = UnifiedXPConfig(k_neighbors=5, topology_update_threshold=0.0, **overrides)
+    env = XPEnvironment(config)
+    env.ingest_experiences_batch(TEXTS)
+    return env
+
+
+def _assert_consistent(env: XPEnvironment):
+    graph = env.relationship_manager.graph
+    for unit_id, edges in graph.items():
+        for neighbor_id, coherence in edges.items():
+            assert graph[neighbor_id][unit_id] == coherence
+        assert env.units[unit_id].topology_neighbors == edges
+
+
+def test_neighbors_match_brute_force_coherence():
+    env = _environment(max_topology_degree=0)
+    units = list(env.units.values())
+    newest = units[-1]
+    expected = sorted(units[:-1], key=newest.compute_coherence_with, reverse=True)[:5]
+    assert set(newest.topology_neighbors) == {unit.content_id for unit in expected}
+    for unit in expected:
+        assert newest.topology_neighbors[unit.content_id] == pytest.approx(
+            newest.compute_coherence_with(unit), abs=1e-5)
+    _assert_consistent(env)
+
+
+def test_degree_cap_bounds_hub_units():
+    env = _environment(max_topology_degree=8)
+    assert max(len(edges) for edges in env.relationship_manager.graph.values()) <= 8
+    _assert_consistent(env)
+
+    uncapped = _environment(max_topology_degree=0)
+    assert max(len(edges) for edges in uncapped.relationship_manager.graph.values()) > 8
+
+
+def test_remove_unit_drops_edges():
+    env = _environment()
+    victim = next(iter(env.units))
+    neighbors = list(env.relationship_manager.graph[victim])
+    env.relationship_manager.remove_unit(victim, env.units)
+    assert victim not in env.relationship_manager.graph
+    for neighbor_id in neighbors:
+        assert victim not in env.relationship_manager.graph[neighbor_id]
+        assert victim not in env.units[neighbor_id].coherence_links
+
+
+@pytest.mark.parametrize("index_type", ["ivf", "hnsw"])
+def test_ann_candidates_agree_with_exact(index_type):
+    exact = _environment(max_topology_degree=0)
+    approximate = _environment(max_topology_degree=0, ann_index=index_type, ann_min_units=64)
+    assert approximate.relationship_manager._ann is not None
+
+    overlap = total = 0
+    for unit_id in list(exact.units)[64:]:
+        expected = set(exact.units[unit_id].topology_neighbors)
+        found = set(approximate.units[unit_id].topology_neighbors)
+        overlap += len(expected & found)
+        total += len(expected)
+    assert overlap / total >= 0.9
+    _assert_consistent(approximate)
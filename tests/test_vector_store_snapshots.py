@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for saving and memory-mapped loading of vector store snapshots
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.core import StorageError
+from src.lumina_memory.vector_store import FAISSVectorStore, InMemoryVectorStore
+from tests.helpers import make_entries
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_in_memory_store_round_trip(tmp_path, mmap):
+    vectors = np.random.default_rng(0).normal(size=(50, 8)).astype("float32")
+    store = InMemoryVectorStore(metric="euclidean")
+    store.add(make_entries(vectors))
+    store.remove(["e3"])
+    store.save(tmp_path / "store")
+
+    loaded = InMemoryVectorStore.load(tmp_path / "store", mmap=mmap)
+    assert loaded.metric == "euclidean" and loaded.size == 49
+    query = vectors[7] + 0.01
+    expected = store.search(query, k=5)
+    results = loaded.search(query, k=5)
+    assert [entry_id for entry_id, _ in results] == [entry_id for entry_id, _ in expected]
+    assert [score for _, score in results] == pytest.approx([score for _, score in expected])
+    entry = loaded.entries["e7"]
+    assert entry.content == "memory 7" and entry.metadata == {"n": 7} and entry.access_count == 7
+    assert isinstance(entry.embedding, np.memmap) == mmap
+
+    with pytest.raises(StorageError):
+        FAISSVectorStore.load(tmp_path / "store")
+    manifest = json.loads((tmp_path / "store" / "manifest.json").read_text())
+    (tmp_path / "store" / "manifest.json").write_text(json.dumps(dict(manifest, version=99)))
+    with pytest.raises(StorageError):
+        InMemoryVectorStore.load(tmp_path / "store")
+
+
+@pytest.mark.parametrize("index_type", ["flat", "hnsw", "ivf_flat"])
+def test_faiss_store_round_trip(tmp_path, index_type):
+    pytest.importorskip("faiss")
+    vectors = np.random.default_rng(1).normal(size=(300, 16)).astype("float32")
+    store = FAISSVectorStore(dimension=16, index_type=index_type, nlist=4, train_threshold=200)
+    store.add(make_entries(vectors))
+    store.remove(["e0", "e1"])  # Saved as tombstones
+    store.save(tmp_path / "faiss")
+
+    loaded = FAISSVectorStore.load(tmp_path / "faiss", mmap=True)
+    assert loaded.active_index_type == store.active_index_type and loaded.size == 298
+    assert loaded.stats()['memory_mapped'] == (index_type != "ivf_flat")
+    for query in vectors[:5]:
+        assert loaded.search(query, k=5, nprobe=4) == store.search(query, k=5, nprobe=4)
+
+    # Writes copy the mapped index first; the snapshot on disk is unchanged
+    loaded.add(make_entries(vectors[:3], prefix="new"))
+    loaded.remove([f"e{i}" for i in range(2, 100)])
+    assert not loaded.stats()['memory_mapped'] and loaded.size == 203
+    assert loaded.search(vectors[2], k=1, nprobe=4)[0][0] == "new2"
+    assert FAISSVectorStore.load(tmp_path / "faiss").size == 298
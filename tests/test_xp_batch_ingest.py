@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for batch ingestion (XPEnvironment.ingest_experiences_batch / UnifiedXPKernel.process_memory_batch)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.xp_core_unified import UnifiedXPKernel, UnifiedXPConfig
+
+
+TEXTS = [f"I felt {['happy', 'sad', 'angry', 'curious', 'calm'][i % 5]} about memory {i} with cats {i * 3}"
+         for i in range(60)]
+TEXTS += [TEXTS[3], TEXTS[10].upper()]  # duplicates of earlier items
+METADATAS = [{'source': 'archive', 'turn': i % 7} for i in range(len(TEXTS))]
+
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_batch_ingest_matches_sequential(columnar):
+    """Batch ingest yields bit-identical units and topology"""
+    config = UnifiedXPConfig(use_columnar_store=columnar, k_neighbors=5)
+    sequential = UnifiedXPKernel(config)
+    sequential_ids = [sequential.process_memory(text, dict(metadata))
+                      for text, metadata in zip(TEXTS, METADATAS)]
+
+    batched = UnifiedXPKernel(config)
+    batch_ids = batched.process_memory_batch(TEXTS[:25], [dict(m) for m in METADATAS[:25]])
+    batch_ids += batched.process_memory_batch(TEXTS[25:], [dict(m) for m in METADATAS[25:]])
+
+    assert batch_ids == sequential_ids
+    seq_env, batch_env = sequential.environment, batched.environment
+    assert list(batch_env.units) == list(seq_env.units)
+    for content_id, expected in seq_env.units.items():
+        actual = batch_env.units[content_id]
+        assert np.array_equal(expected.semantic_vector, actual.semantic_vector)
+        assert np.array_equal(expected.hrr_shape, actual.hrr_shape)
+        assert np.array_equal(expected.emotion_vector, actual.emotion_vector)
+        assert expected.importance == actual.importance
+        assert expected.access_count == actual.access_count
+        assert expected.topology_neighbors == actual.topology_neighbors
+    assert batch_env.get_relationship_graph() == seq_env.get_relationship_graph()
+    assert batch_env.stats['total_units'] == seq_env.stats['total_units'] == 60
+
+    # One versioned-store commit per batch
+    assert len(batch_env.versioned_store.commits) == 2
+    assert len(seq_env.versioned_store.commits) == 60
+
+
+def test_batch_ingest_rejects_empty_content_without_side_effects():
+    kernel = UnifiedXPKernel(UnifiedXPConfig())
+    with pytest.raises(ValueError):
+        kernel.environment.ingest_experiences_batch(["fine", "   "])
+    assert len(kernel.environment.units) == 0
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for UnifiedXPKernel retrieval paths
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.lumina_memory.xp_core_unified import UnifiedXPKernel, UnifiedXPConfig
+
+
+TEXTS = [f"I felt {['happy', 'sad', 'angry', 'curious', 'calm'][i % 5]} about memory {i} with cats {i * 3}"
+         for i in range(50)]
+QUERIES = ["happy cats", "memory 12", "angry about things", "calm"]
+
+
+def _build_kernel() -> UnifiedXPKernel:
+    kernel = UnifiedXPKernel(UnifiedXPConfig())
+    for text in TEXTS:
+        kernel.process_memory(text)
+    return kernel
+
+
+def _align(source: UnifiedXPKernel, target: UnifiedXPKernel):
+    """Copy time-dependent unit state so both kernels score identically"""
+    for content_id, unit in source.environment.units.items():
+        other = target.environment.units[content_id]
+        other.timestamp = unit.timestamp
+        other.last_access = unit.last_access
+        other.importance = unit.importance
+        other.access_count = unit.access_count
+
+
+def test_batch_retrieval_matches_sequential():
+    """retrieve_memory_batch returns what repeated retrieve_memory calls return"""
+    sequential_kernel = _build_kernel()
+    batch_kernel = _build_kernel()
+    _align(sequential_kernel, batch_kernel)
+
+    sequential = [sequential_kernel.retrieve_memory(q, k=5) for q in QUERIES]
+    batched = batch_kernel.retrieve_memory_batch(QUERIES, k=5)
+
+    assert len(batched) == len(QUERIES)
+    for expected, actual in zip(sequential, batched):
+        assert [r['content_id'] for r in expected] == [r['content_id'] for r in actual]
+        assert [r['access_count'] for r in expected] == [r['access_count'] for r in actual]
+        for a, b in zip(expected, actual):
+            assert abs(a['similarity'] - b['similarity']) < 1e-9
+
+
+def test_batch_retrieval_empty():
+    """An empty query list yields no result lists"""
+    kernel = _build_kernel()
+    assert kernel.retrieve_memory_batch([], k=5) == []